@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import dataclasses
+import json
+import platform
+import random
+import sys
+import time
+from typing import List
+
+from benchmarks import machine, storages
+from benchmarks.measurement import Result, measure_memory, measure_case
+
+
+def parse_names(value: str) -> List[str]:
+    return value.split(",")
+
+
+def parse_numbers(value: str) -> List[int]:
+    return [int(i) for i in value.split(",")]
+
+
+def get_user_ids(users: int, operations: int) -> List[int]:
+    if users >= operations:
+        return random.sample(range(users), operations)
+
+    return [random.randrange(users) for _ in range(operations)]
+
+
+async def run_environment(environment, get_cases, args) -> List[Result]:
+    results = []
+    peak_memory = await measure_memory(environment.populate)
+    # the concurrency levels of an environment never yielding to the loop would run one by one
+    concurrency_levels = args.concurrency if environment.concurrent else [1]
+    for case in get_cases(environment):
+        for concurrency in concurrency_levels:
+            user_ids = get_user_ids(environment.users, args.operations)
+            ops_per_second, p50_latency, p99_latency = await measure_case(case, user_ids,
+                                                                          concurrency)
+            result = Result(case.name, environment.users, environment.depth, concurrency,
+                            len(user_ids), ops_per_second, p50_latency, p99_latency,
+                            peak_memory, peak_memory / environment.users)
+            print(f"{result.case:<36} users={result.users:<8} depth={result.depth:<3} "
+                  f"concurrency={result.concurrency:<4} {result.ops_per_second:>10.0f} ops/s "
+                  f"p50={result.p50_latency * 1e6:>8.1f} us "
+                  f"p99={result.p99_latency * 1e6:>8.1f} us "
+                  f"peak_memory={result.peak_memory / 2 ** 20:>8.1f} MiB "
+                  f"memory_per_user={result.memory_per_user:>8.1f} B", file=sys.stderr)
+            results.append(result)
+
+    return results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Benchmarks the machine and scene storages.")
+    parser.add_argument("--suites", type=parse_names, default=["machine", "storages"])
+    parser.add_argument("--storages", type=parse_names,
+                        default=["memory", "compact", "sqlite", "log"])
+    parser.add_argument("--users", type=parse_numbers, default=[1, 1000, 1000000])
+    parser.add_argument("--depths", type=parse_numbers, default=[2, 16])
+    parser.add_argument("--concurrency", type=parse_numbers, default=[1, 64])
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds every storage call of the machine suite waits for")
+    parser.add_argument("--operations", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="path of the JSON report")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    results = []
+    for users in args.users:
+        for depth in args.depths:
+            if "machine" in args.suites:
+                environment = machine.Environment(users, depth, args.latency)
+                results += await run_environment(environment, machine.get_cases, args)
+            if "storages" in args.suites:
+                for name in args.storages:
+                    environment = storages.Environment(name, users, depth)
+                    try:
+                        results += await run_environment(environment, storages.get_cases, args)
+                    finally:
+                        await environment.close()
+
+    report = {
+        "timestamp": time.time(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "arguments": vars(args),
+        "results": [dataclasses.asdict(i) for i in results]
+    }
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
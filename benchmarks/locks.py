@@ -0,0 +1,120 @@
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Set
+
+from tgbotscenario.common.transitions.locks.storage import LockStorage, StripedLockStorage
+
+
+class NestedLockStorage:
+    # the previous lock storage: a set of user ids per chat id, allocated for every locked chat
+
+    def __init__(self):
+        self._storage: Dict[int, Set[int]] = {}
+
+    def acquire_lock(self, *, chat_id: int, user_id: int) -> bool:
+        try:
+            users = self._storage[chat_id]
+        except KeyError:
+            self._storage[chat_id] = {user_id}
+            return True
+        if user_id in users:
+            return False
+        users.add(user_id)
+
+        return True
+
+    def remove_lock(self, *, chat_id: int, user_id: int) -> None:
+        self._storage[chat_id].remove(user_id)
+        if not self._storage[chat_id]:
+            del self._storage[chat_id]
+
+
+STORAGES: Dict[str, Callable] = {
+    "nested": NestedLockStorage,
+    "flat": LockStorage,
+    "striped": StripedLockStorage
+}
+
+
+def get_keys(chats: str, users: int) -> List[tuple]:
+    # the ids are created in advance so that they aren't counted as allocations of the storages
+    user_ids = [10 ** 9 + i for i in range(users)]
+    if chats == "private":
+        return [(i, i) for i in user_ids]
+
+    return [(-10 ** 12 - i, i) for i in user_ids]
+
+
+def measure_throughput(storage, keys: List[tuple], repeats: int) -> float:
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        for chat_id, user_id in keys:
+            storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+            storage.remove_lock(chat_id=chat_id, user_id=user_id)
+
+    return len(keys) * repeats / (time.perf_counter() - start_time)
+
+
+def measure_allocations(storage, keys: List[tuple]) -> Dict[str, float]:
+    # a transition holds a single lock, so the memory held per lock is allocated and freed by it
+    for chat_id, user_id in keys:  # the storage tables are grown in advance
+        storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    for chat_id, user_id in keys:
+        storage.remove_lock(chat_id=chat_id, user_id=user_id)
+
+    tracemalloc.start()
+    try:
+        start_blocks = sys.getallocatedblocks()
+        start_memory, _ = tracemalloc.get_traced_memory()
+        for chat_id, user_id in keys:
+            storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+        blocks = sys.getallocatedblocks() - start_blocks
+        memory, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    for chat_id, user_id in keys:
+        storage.remove_lock(chat_id=chat_id, user_id=user_id)
+
+    return {
+        "blocks_per_lock": max(blocks, 0) / len(keys),
+        "bytes_per_lock": max(memory - start_memory, 0) / len(keys)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.locks",
+                                     description="Benchmarks the in-process lock storages.")
+    parser.add_argument("--storages", type=lambda i: i.split(","), default=list(STORAGES))
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--repeats", type=int, default=100)
+    parser.add_argument("--output", help="path of the JSON report")
+    args = parser.parse_args()
+
+    results = []
+    for chats in ("private", "group"):
+        keys = get_keys(chats, args.users)
+        for name in args.storages:
+            result = {
+                "storage": name,
+                "chats": chats,
+                "ops_per_second": measure_throughput(STORAGES[name](), keys, args.repeats),
+                **measure_allocations(STORAGES[name](), keys)
+            }
+            print(f"{name:<8} chats={chats:<8} {result['ops_per_second']:>10.0f} ops/s "
+                  f"blocks_per_lock={result['blocks_per_lock']:>5.2f} "
+                  f"bytes_per_lock={result['bytes_per_lock']:>7.1f}", file=sys.stderr)
+            results.append(result)
+
+    report = {"arguments": vars(args), "results": results}
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import asyncio
+from contextvars import ContextVar
+from typing import List
+
+from tgbotscenario.asynchronous import (Machine, ContextMachine, Scene, AbstractDeltaSceneStorage,
+                                        MemorySceneStorage)
+from tgbotscenario.common import Context
+from benchmarks.measurement import Case
+
+
+def trigger(event):
+    pass
+
+
+class LatencySceneStorage(AbstractDeltaSceneStorage):
+    # the memory storage never yields to the loop, so its calls are made to wait as remote ones
+
+    def __init__(self, latency: float):
+        self._storage = MemorySceneStorage()
+        self._latency = latency
+
+    async def load_scenes(self, *, chat_id, user_id):
+        await asyncio.sleep(self._latency)
+        return await self._storage.load_scenes(chat_id=chat_id, user_id=user_id)
+
+    async def save_scenes(self, scenes, *, chat_id, user_id):
+        await asyncio.sleep(self._latency)
+        await self._storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+
+    async def save_many(self, scenes):
+        await self._storage.save_many(scenes)
+
+    async def update_scenes(self, scenes, length, stored_length, *, chat_id, user_id):
+        await asyncio.sleep(self._latency)
+        return await self._storage.update_scenes(scenes, length, stored_length,
+                                                 chat_id=chat_id, user_id=user_id)
+
+
+class Environment:
+    concurrent = True
+
+    def __init__(self, users: int, depth: int, latency: float = 0.0):
+        self.users = users
+        self.depth = depth
+        self.storage = LatencySceneStorage(latency)
+        self.scenes = [Scene(f"Scene{i}") for i in range(depth)]
+        self.next_scene = Scene("NextScene")
+        self.machine = Machine(self.scenes[0], self.storage)
+        for source_scene, destination_scene in zip(self.scenes, self.scenes[1:]):
+            self.machine.add_transition(source_scene, destination_scene, trigger)
+        self.machine.add_transition(self.scenes[-1], self.next_scene, trigger)
+        self.scene_names = [i.name for i in self.scenes]
+        self.context = Context(ContextVar("chat_id"), ContextVar("user_id"),
+                               ContextVar("trigger"), ContextVar("event"))
+        self.context_machine = ContextMachine(self.machine, self.context)
+
+    async def populate(self) -> None:
+        batch_size = 10000
+        for start in range(0, self.users, batch_size):
+            await self.storage.save_many({
+                (i, i): self.scene_names
+                for i in range(start, min(start + batch_size, self.users))
+            })
+
+    async def reset(self, user_id: int) -> None:
+        await self.storage.save_scenes(self.scene_names, chat_id=user_id, user_id=user_id)
+
+    def set_context(self, user_id: int) -> None:
+        self.context.chat_id.set(user_id)
+        self.context.user_id.set(user_id)
+        self.context.trigger.set(trigger)
+        self.context.event.set(None)
+
+
+def get_cases(environment: Environment) -> List[Case]:
+    machine = environment.machine
+
+    async def move_to_next_scene(user_id):
+        await machine.move_to_next_scene(None, trigger, chat_id=user_id, user_id=user_id)
+
+    async def move_to_previous_scene(user_id):
+        await machine.move_to_previous_scene(None, chat_id=user_id, user_id=user_id)
+
+    async def set_current_scene(user_id):
+        await machine.set_current_scene(environment.next_scene, None,
+                                        chat_id=user_id, user_id=user_id)
+
+    async def get_current_scene(user_id):
+        await machine.get_current_scene(chat_id=user_id, user_id=user_id)
+
+    async def context_move_to_next_scene(user_id):
+        # the context is set by the worker task itself, as a middleware would do
+        environment.set_context(user_id)
+        await environment.context_machine.move_to_next_scene()
+
+    cases = [
+        Case("machine.move_to_next_scene", move_to_next_scene, environment.reset),
+        Case("machine.set_current_scene", set_current_scene, environment.reset),
+        Case("machine.get_current_scene", get_current_scene),
+        Case("context_machine.move_to_next_scene", context_move_to_next_scene,
+             environment.reset)
+    ]
+    if environment.depth > 1:
+        cases.append(Case("machine.move_to_previous_scene", move_to_previous_scene,
+                          environment.reset))
+
+    return cases
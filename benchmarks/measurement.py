@@ -0,0 +1,87 @@
+import asyncio
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional, Callable, Awaitable, List, Dict, Tuple
+
+
+Operation = Callable[[int], Awaitable]
+
+
+@dataclass
+class Result:
+    case: str
+    users: int
+    depth: int
+    concurrency: int
+    operations: int
+    ops_per_second: float
+    p50_latency: float
+    p99_latency: float
+    peak_memory: int
+    memory_per_user: float
+
+
+@dataclass
+class Case:
+    name: str
+    operation: Operation
+    prepare: Optional[Operation] = None  # isn't measured, it's run before every operation
+
+
+async def measure_memory(function: Callable[[], Awaitable]) -> int:
+    tracemalloc.start()
+    try:
+        await function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak_memory
+
+
+async def measure_case(case: Case, user_ids: List[int],
+                       concurrency: int) -> Tuple[float, float, float]:
+    latencies = []
+    elapsed_time = 0.0
+
+    async def work(worker_user_ids):
+        for user_id in worker_user_ids:
+            start_time = time.perf_counter()
+            await case.operation(user_id)
+            latencies.append(time.perf_counter() - start_time)
+
+    # the operations are measured in rounds of distinct users prepared before the round,
+    # so the preparation is never run while the workers are timed
+    for round_user_ids in _split_rounds(user_ids):
+        if case.prepare is not None:
+            for user_id in round_user_ids:
+                await case.prepare(user_id)
+        # a user is always handled by the same worker, so the workers never contend for locks
+        workers = [work([i for i in round_user_ids if i % concurrency == worker])
+                   for worker in range(concurrency)]
+        start_time = time.perf_counter()
+        await asyncio.gather(*workers)
+        elapsed_time += time.perf_counter() - start_time
+    latencies.sort()
+
+    return (len(latencies) / elapsed_time,
+            _get_percentile(latencies, 0.5),
+            _get_percentile(latencies, 0.99))
+
+
+def _split_rounds(user_ids: List[int]) -> List[List[int]]:
+    rounds: List[List[int]] = []
+    counts: Dict[int, int] = {}
+    for user_id in user_ids:
+        index = counts.get(user_id, 0)
+        counts[user_id] = index + 1
+        if index == len(rounds):
+            rounds.append([])
+        rounds[index].append(user_id)
+
+    return rounds
+
+
+def _get_percentile(sorted_values: List[float], percentile: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percentile))]
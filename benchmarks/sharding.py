@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import List
+
+from tgbotscenario.asynchronous import ShardedDispatcher, Machine, Scene, MemorySceneStorage
+
+
+def trigger(event):
+    pass
+
+
+def make_handler(shard):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    machine = Machine(initial_scene, MemorySceneStorage())
+    machine.add_transition(initial_scene, foo_scene, trigger)
+    machine.add_transition(foo_scene, initial_scene, trigger)
+
+    async def handle(update):
+        chat_id, user_id = update
+        for _ in range(100):  # a batch of transitions per update, so the routing cost is shared
+            await machine.move_to_next_scene(update, trigger, chat_id=chat_id, user_id=user_id)
+
+    return handle
+
+
+async def measure(shards: int, users: int) -> float:
+    dispatcher = ShardedDispatcher(make_handler, shards)
+    dispatcher.start()
+    try:
+        await dispatcher.dispatch((0, 0), chat_id=0, user_id=0)  # the workers are started
+        start_time = time.perf_counter()
+        await asyncio.gather(*(dispatcher.dispatch((i, i), chat_id=i, user_id=i)
+                               for i in range(users)))
+        elapsed_time = time.perf_counter() - start_time
+    finally:
+        await dispatcher.stop()
+
+    return users * 100 / elapsed_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.sharding",
+                                     description="Benchmarks the machines sharded across "
+                                                 "worker processes.")
+    parser.add_argument("--shards", type=lambda i: [int(j) for j in i.split(",")],
+                        default=[1, 2, 4])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--output", help="path of the JSON report")
+    args = parser.parse_args()
+
+    results: List[dict] = []
+    for shards in args.shards:
+        transitions_per_second = asyncio.run(measure(shards, args.users))
+        print(f"shards={shards:<4} {transitions_per_second:>10.0f} transitions/s",
+              file=sys.stderr)
+        results.append({"shards": shards, "transitions_per_second": transitions_per_second})
+
+    report = {"arguments": vars(args), "results": results}
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
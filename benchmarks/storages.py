@@ -0,0 +1,63 @@
+import os
+import tempfile
+from typing import Optional, List
+
+from tgbotscenario.asynchronous import (AbstractSceneStorage, MemorySceneStorage,
+                                        CompactMemorySceneStorage, SQLiteSceneStorage,
+                                        LogSceneStorage)
+from benchmarks.measurement import Case
+
+
+class Environment:
+
+    def __init__(self, name: str, users: int, depth: int):
+        self.name = name
+        self.users = users
+        self.depth = depth
+        self.scene_names = [f"Scene{i}" for i in range(depth)]
+        self.storage: Optional[AbstractSceneStorage] = None
+        self._directory: Optional[tempfile.TemporaryDirectory] = None
+        # only the SQLite storage awaits its thread, the others never let the operations overlap
+        self.concurrent = name == "sqlite"
+
+    async def populate(self) -> None:
+        if self.name == "sqlite":
+            self._directory = tempfile.TemporaryDirectory()
+            self.storage = SQLiteSceneStorage(os.path.join(self._directory.name,
+                                                           "scenes.sqlite3"))
+        elif self.name == "log":
+            self._directory = tempfile.TemporaryDirectory()
+            self.storage = LogSceneStorage(self._directory.name)
+        elif self.name == "compact":
+            self.storage = CompactMemorySceneStorage()
+        else:
+            self.storage = MemorySceneStorage()
+
+        batch_size = 10000
+        for start in range(0, self.users, batch_size):
+            await self.storage.save_many({
+                (i, i): self.scene_names
+                for i in range(start, min(start + batch_size, self.users))
+            })
+
+    async def close(self) -> None:
+        if isinstance(self.storage, (SQLiteSceneStorage, LogSceneStorage)):
+            await self.storage.close()
+        if self._directory is not None:
+            self._directory.cleanup()
+
+
+def get_cases(environment: Environment) -> List[Case]:
+    storage = environment.storage
+    scene_names = environment.scene_names
+
+    async def load_scenes(user_id):
+        await storage.load_scenes(chat_id=user_id, user_id=user_id)
+
+    async def save_scenes(user_id):
+        await storage.save_scenes(scene_names, chat_id=user_id, user_id=user_id)
+
+    return [
+        Case(f"{environment.name}_storage.load_scenes", load_scenes),
+        Case(f"{environment.name}_storage.save_scenes", save_scenes)
+    ]
@@ -0,0 +1,120 @@
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from tgbotscenario import asynchronous, synchronous
+
+
+def trigger(event):
+    pass
+
+
+def make_machine(package):
+    initial_scene = package.Scene("InitialScene")
+    foo_scene = package.Scene("FooScene")
+    machine = package.Machine(initial_scene, package.MemorySceneStorage())
+    machine.add_transition(initial_scene, foo_scene, trigger)
+
+    return machine
+
+
+def get_variants() -> Dict[str, Callable[[], Callable[[int], None]]]:
+    # every variant makes a function doing a transition to the next scene and back for a user
+
+    def sync():
+        machine = make_machine(synchronous)
+
+        def transit(user_id):
+            machine.move_to_next_scene(None, trigger, chat_id=user_id, user_id=user_id)
+            machine.move_to_previous_scene(None, chat_id=user_id, user_id=user_id)
+
+        return transit
+
+    def async_loop_per_call():
+        machine = make_machine(asynchronous)
+
+        async def transit_async(user_id):
+            await machine.move_to_next_scene(None, trigger, chat_id=user_id, user_id=user_id)
+            await machine.move_to_previous_scene(None, chat_id=user_id, user_id=user_id)
+
+        def transit(user_id):
+            asyncio.run(transit_async(user_id))
+
+        return transit
+
+    def async_loop_per_thread():
+        machine = make_machine(asynchronous)
+        local = threading.local()
+
+        async def transit_async(user_id):
+            await machine.move_to_next_scene(None, trigger, chat_id=user_id, user_id=user_id)
+            await machine.move_to_previous_scene(None, chat_id=user_id, user_id=user_id)
+
+        def transit(user_id):
+            try:
+                loop = local.loop
+            except AttributeError:
+                loop = local.loop = asyncio.new_event_loop()
+            loop.run_until_complete(transit_async(user_id))
+
+        return transit
+
+    return {
+        "sync": sync,
+        "async_loop_per_call": async_loop_per_call,
+        "async_loop_per_thread": async_loop_per_thread
+    }
+
+
+def measure(transit: Callable[[int], None], threads: int, operations: int) -> float:
+    # a user is always handled by the same thread, so the threads never contend for locks
+    def work(thread_number):
+        for user_id in range(thread_number, operations, threads):
+            transit(user_id)
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start_time = time.perf_counter()
+        list(executor.map(work, range(threads)))
+        elapsed_time = time.perf_counter() - start_time
+
+    return operations * 2 / elapsed_time
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.synchronous",
+        description="Benchmarks the synchronous machine against the asynchronous one "
+                    "called from a thread pool."
+    )
+    parser.add_argument("--variants", type=lambda i: i.split(","), default=list(get_variants()))
+    parser.add_argument("--threads", type=lambda i: [int(j) for j in i.split(",")],
+                        default=[1, 4, 16])
+    parser.add_argument("--operations", type=int, default=10000)
+    parser.add_argument("--output", help="path of the JSON report")
+    args = parser.parse_args()
+
+    variants = get_variants()
+    results: List[dict] = []
+    for threads in args.threads:
+        for name in args.variants:
+            transitions_per_second = measure(variants[name](), threads, args.operations)
+            print(f"{name:<24} threads={threads:<4} "
+                  f"{transitions_per_second:>10.0f} transitions/s", file=sys.stderr)
+            results.append({"variant": name, "threads": threads,
+                            "transitions_per_second": transitions_per_second})
+
+    report = {"arguments": vars(args), "results": results}
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+    else:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
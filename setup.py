@@ -4,7 +4,7 @@ import setuptools
 setuptools.setup(
     name="tgbotscenario",
     version="0.10.0",
-    packages=setuptools.find_packages(exclude=("tests",)),
+    packages=setuptools.find_packages(exclude=("tests", "benchmarks")),
     url="https://github.com/Abstract-X/tgbotscenario",
     license="MIT",
     author="Abstract-X",
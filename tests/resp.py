@@ -0,0 +1,111 @@
+import asyncio
+import time
+from typing import Optional, List, Dict, Set, Tuple
+
+
+class RESPServer:
+    # a stand-in of a Redis server supporting the commands used by the scene storage
+
+    def __init__(self, password: Optional[str] = None):
+        self._password = password
+        self._values: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self.connections = 0
+        self.max_pipeline = 0  # the maximum number of commands received at once
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._server.close()
+        await self._server.wait_closed()
+
+    def disconnect(self) -> None:
+        for writer in self._writers:
+            writer.close()
+
+    def get_ttl(self, key: bytes) -> Optional[float]:
+        _, expiration_time = self._values[key]
+
+        return None if expiration_time is None else expiration_time - time.monotonic()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        self._writers.add(writer)
+        authenticated = self._password is None
+        try:
+            while True:
+                commands = [await _read_command(reader)]
+                while _check_buffered_command(reader):
+                    commands.append(await _read_command(reader))
+                self.max_pipeline = max(self.max_pipeline, len(commands))
+                for command in commands:
+                    name = command[0].upper()
+                    if name == b"AUTH":
+                        authenticated = command[1].decode() == self._password
+                        writer.write(b"+OK\r\n" if authenticated else b"-WRONGPASS\r\n")
+                    elif not authenticated:
+                        writer.write(b"-NOAUTH Authentication required.\r\n")
+                    else:
+                        writer.write(self._execute(name, command[1:]))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    def _execute(self, name: bytes, args: List[bytes]) -> bytes:
+        if name == b"SELECT":
+            return b"+OK\r\n"
+        if name == b"GET":
+            return _encode_bulk(self._get(args[0]))
+        if name == b"MGET":
+            return b"*%d\r\n%s" % (len(args), b"".join(_encode_bulk(self._get(i)) for i in args))
+        if name == b"SET":
+            expiration_time = None
+            if len(args) == 4 and args[2].upper() == b"PX":
+                expiration_time = time.monotonic() + int(args[3]) / 1000
+            self._values[args[0]] = args[1], expiration_time
+            return b"+OK\r\n"
+        if name == b"DEL":
+            removed = [self._values.pop(i, None) for i in args]
+            return b":%d\r\n" % sum(i is not None for i in removed)
+
+        return b"-ERR unknown command\r\n"
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        try:
+            value, expiration_time = self._values[key]
+        except KeyError:
+            return None
+        if expiration_time is not None and expiration_time <= time.monotonic():
+            del self._values[key]
+            return None
+
+        return value
+
+
+async def _read_command(reader: asyncio.StreamReader) -> List[bytes]:
+    length = int((await reader.readuntil(b"\r\n"))[1:-2])
+    args = []
+    for _ in range(length):
+        size = int((await reader.readuntil(b"\r\n"))[1:-2])
+        args.append((await reader.readexactly(size + 2))[:-2])
+
+    return args
+
+
+def _check_buffered_command(reader: asyncio.StreamReader) -> bool:
+    # the buffer of the reader isn't public, but it is the only way to see a pipeline
+    return bool(reader._buffer)
+
+
+def _encode_bulk(value: Optional[bytes]) -> bytes:
+    return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
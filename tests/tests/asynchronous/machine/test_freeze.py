@@ -0,0 +1,70 @@
+import pytest
+
+from tgbotscenario.asynchronous import Machine, Scene, MemorySceneStorage
+from tgbotscenario import errors
+
+
+def test_behavior(trigger):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    machine = Machine(initial_scene, MemorySceneStorage())
+    machine.add_transition(initial_scene, foo_scene, trigger)
+
+    machine.freeze()
+
+    assert machine.frozen
+
+
+def test_unreachable_scenes(trigger):
+    foo_scene = Scene("FooScene")
+    bar_scene = Scene("BarScene")
+    machine = Machine(Scene("InitialScene"), MemorySceneStorage())
+    machine.add_transition(foo_scene, bar_scene, trigger)
+
+    with pytest.raises(errors.UnreachableSceneError) as error:
+        machine.freeze()
+    assert error.value.scenes == {foo_scene, bar_scene}
+    assert not machine.frozen
+
+
+def test_adding_transition(trigger):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    machine = Machine(initial_scene, MemorySceneStorage())
+    machine.freeze()
+
+    with pytest.raises(errors.TransitionSchemeFrozenError):
+        machine.add_transition(initial_scene, foo_scene, trigger)
+    assert foo_scene not in machine.scenes
+
+
+def test_removing_transition(trigger):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    machine = Machine(initial_scene, MemorySceneStorage())
+    machine.add_transition(initial_scene, foo_scene, trigger)
+    machine.freeze()
+
+    with pytest.raises(errors.TransitionSchemeFrozenError):
+        machine.remove_transition(initial_scene, trigger)
+    assert machine.check_transition(initial_scene, foo_scene, trigger)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_transition(chat_id, user_id, event, trigger):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    machine = Machine(initial_scene, MemorySceneStorage())
+    machine.add_transition(initial_scene, foo_scene, trigger)
+    machine.freeze()
+
+    await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    assert await machine.get_current_scene(chat_id=chat_id, user_id=user_id) is foo_scene
@@ -1,6 +1,11 @@
+import asyncio
+from unittest.mock import AsyncMock
+
 import pytest
 
-from tgbotscenario.asynchronous import Machine, Scene, MemorySceneStorage
+from tgbotscenario.asynchronous import (Machine, Scene, MemorySceneStorage,
+                                        CompactMemorySceneStorage)
+from tgbotscenario.common import LRUCache
 from tgbotscenario import errors
 
 
@@ -52,3 +57,110 @@ async def test_unknown_scene_in_storage(chat_id, user_id):
 
     with pytest.raises(errors.UnknownSceneError):
         await machine.get_current_scene(chat_id=chat_id, user_id=user_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_cache(chat_id, user_id, trigger, event):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    storage = MemorySceneStorage()
+    storage.load_scenes = AsyncMock(side_effect=storage.load_scenes)
+    cache = LRUCache()
+    machine = Machine(initial_scene, storage, magazine_cache=cache)
+    machine.add_transition(initial_scene, foo_scene, trigger)
+
+    assert await machine.get_current_scene(chat_id=chat_id, user_id=user_id) is initial_scene
+    await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+    assert await machine.get_current_scene(chat_id=chat_id, user_id=user_id) is foo_scene
+    storage.load_scenes.assert_awaited_once_with(chat_id=chat_id, user_id=user_id)
+    assert cache.hits == 2
+    assert cache.misses == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_collapsed_loads(chat_id, user_id, trigger, event):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    storage = MemorySceneStorage()
+    storage.load_scenes = AsyncMock(side_effect=storage.load_scenes)
+    machine = Machine(initial_scene, storage)
+    machine.add_transition(initial_scene, foo_scene, trigger)
+
+    scenes = await asyncio.gather(*(machine.get_current_scene(chat_id=chat_id, user_id=user_id)
+                                    for _ in range(3)))
+
+    assert scenes == [initial_scene] * 3
+    storage.load_scenes.assert_awaited_once_with(chat_id=chat_id, user_id=user_id)
+    assert machine.collapsed_loads == 2
+    await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+    assert await machine.get_current_scene(chat_id=chat_id, user_id=user_id) is foo_scene
+    assert storage.load_scenes.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_collapsed_loads_error():
+    storage = MemorySceneStorage()
+    storage.load_scenes = AsyncMock(side_effect=ConnectionError)
+    machine = Machine(Scene("InitialScene"), storage)
+
+    results = await asyncio.gather(*(machine.get_current_scene(chat_id=1, user_id=1)
+                                     for _ in range(2)), return_exceptions=True)
+
+    assert all(isinstance(i, ConnectionError) for i in results)
+    storage.load_scenes.assert_awaited_once_with(chat_id=1, user_id=1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_collapsed_loads_during_saving(chat_id, user_id, trigger, event):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    storage = CompactMemorySceneStorage()
+    load_scenes, save_scenes = storage.load_scenes, storage.save_scenes
+
+    async def load_slowly(**kwargs):
+        scenes = await load_scenes(**kwargs)
+        await asyncio.sleep(0.05)
+        return scenes
+
+    async def save_slowly(scenes, **kwargs):
+        await asyncio.sleep(0.02)
+        await save_scenes(scenes, **kwargs)
+
+    storage.load_scenes = load_slowly
+    storage.save_scenes = save_slowly
+    machine = Machine(initial_scene, storage)
+    machine.add_transition(initial_scene, foo_scene, trigger)
+
+    transition = asyncio.ensure_future(
+        machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+    )
+    await asyncio.sleep(0.06)
+    # the load is started during the saving and reads the scenes before it
+    concurrent_load = asyncio.ensure_future(
+        machine.get_current_scene(chat_id=chat_id, user_id=user_id)
+    )
+    await transition
+
+    assert await machine.get_current_scene(chat_id=chat_id, user_id=user_id) is foo_scene
+    assert await concurrent_load is initial_scene
@@ -0,0 +1,42 @@
+import pytest
+
+from tgbotscenario.asynchronous import Machine, Scene, MemorySceneStorage
+
+
+@pytest.mark.parametrize(
+    ("direction",),
+    (
+        (None,),
+        ("test_direction",)
+    )
+)
+def test_behavior(direction):
+    async def foo_to_baz_trigger():
+        pass
+
+    async def bar_to_baz_trigger():
+        pass
+
+    foo_scene = Scene("FooScene")
+    bar_scene = Scene("BarScene")
+    baz_scene = Scene("BazScene")
+    machine = Machine(Scene("InitialScene"), MemorySceneStorage())
+    machine.add_transition(foo_scene, baz_scene, foo_to_baz_trigger, direction)
+    machine.add_transition(bar_scene, baz_scene, bar_to_baz_trigger)
+
+    assert machine.get_incoming_transitions(baz_scene) == [
+        (foo_scene, foo_to_baz_trigger, direction),
+        (bar_scene, bar_to_baz_trigger, None)
+    ]
+    assert machine.get_incoming_transitions(foo_scene) == []
+
+
+def test_after_removing(trigger):
+    foo_scene = Scene("FooScene")
+    bar_scene = Scene("BarScene")
+    machine = Machine(Scene("InitialScene"), MemorySceneStorage())
+    machine.add_transition(foo_scene, bar_scene, trigger)
+
+    machine.remove_transition(foo_scene, trigger)
+
+    assert machine.get_incoming_transitions(bar_scene) == []
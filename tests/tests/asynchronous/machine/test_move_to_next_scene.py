@@ -2,7 +2,10 @@ import asyncio
 
 import pytest
 
-from tgbotscenario.asynchronous import Machine, Scene, MemorySceneStorage
+from tgbotscenario.asynchronous import (Machine, Scene, MemorySceneStorage,
+                                        CompactMemorySceneStorage, QueueLockStorage,
+                                        SQLiteLockStorage)
+from tgbotscenario.common import MetricsAggregator, LRUCache
 from tgbotscenario import errors
 
 
@@ -150,3 +153,410 @@ async def test_double_transition(chat_id, user_id, direction, data,
     await task
     source_scene.process_exit.assert_awaited_once_with(event, data)
     destination_scene.process_enter.assert_awaited_once_with(event, data)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("direction",),
+    (
+        (None,),
+        ("test_direction",)
+    )
+)
+@pytest.mark.parametrize(
+    ("data",),
+    (
+        (None,),
+        ({"test_key": "test_value"},)
+    )
+)
+async def test_queued_double_transition(chat_id, user_id, direction, data,
+                                        event, trigger, scene_mock_factory):
+    class SourceScene(Scene):
+        async def process_exit(self, event, data) -> None:
+            await asyncio.sleep(0.05)
+
+    class DestinationScene(Scene):
+        async def process_enter(self, event, data) -> None:
+            await asyncio.sleep(0.05)
+
+    source_scene = scene_mock_factory(SourceScene())
+    destination_scene = scene_mock_factory(DestinationScene())
+    machine = Machine(source_scene, MemorySceneStorage(), QueueLockStorage())
+    machine.add_transition(source_scene, destination_scene, trigger, direction)
+    machine.add_transition(destination_scene, source_scene, trigger, direction)
+    task = asyncio.create_task(machine.move_to_next_scene(event, trigger, direction, data,
+                                                          chat_id=chat_id, user_id=user_id))
+    await asyncio.sleep(0)
+
+    await machine.move_to_next_scene(event, trigger, direction, data,
+                                     chat_id=chat_id, user_id=user_id)
+    await task
+
+    assert await machine.get_current_scene(chat_id=chat_id, user_id=user_id) is source_scene
+    source_scene.process_exit.assert_awaited_once_with(event, data)
+    destination_scene.process_exit.assert_awaited_once_with(event, data)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_max_depth(chat_id, user_id, event, trigger):
+    scenes = [Scene(f"Scene{i}") for i in range(5)]
+    storage = MemorySceneStorage()
+    machine = Machine(scenes[0], storage, max_depth=3)
+    for source_scene, destination_scene in zip(scenes, scenes[1:]):
+        machine.add_transition(source_scene, destination_scene, trigger)
+
+    for _ in range(4):
+        await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id,
+                                     user_id=user_id) == ["Scene0", "Scene3", "Scene4"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_instrumentation(chat_id, user_id, event, trigger):
+    source_scene = Scene("InitialScene")
+    destination_scene = Scene("FooScene")
+    aggregator = MetricsAggregator()
+    machine = Machine(source_scene, MemorySceneStorage(), instrumentation=aggregator)
+    machine.add_transition(source_scene, destination_scene, trigger)
+
+    await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    for phase in ("lock", "load", "exit", "enter", "save"):
+        assert aggregator.get_histogram(phase).count == 1
+    assert aggregator.get_scene_histogram("exit", source_scene).count == 1
+    assert aggregator.get_scene_histogram("enter", destination_scene).count == 1
+    assert aggregator.get_scene_histogram("save", destination_scene).count == 1
+    assert aggregator.get_trigger_histogram("enter", trigger).count == 1
+    assert aggregator.errors == {}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_instrumentation_errors(chat_id, user_id, event, trigger):
+    class SourceScene(Scene):
+        async def process_exit(self, event, data) -> None:
+            await asyncio.sleep(0.05)
+
+    source_scene = SourceScene()
+    aggregator = MetricsAggregator()
+    machine = Machine(source_scene, MemorySceneStorage(), instrumentation=aggregator)
+    machine.add_transition(source_scene, Scene("FooScene"), trigger)
+    task = asyncio.create_task(machine.move_to_next_scene(event, trigger,
+                                                          chat_id=chat_id, user_id=user_id))
+    await asyncio.sleep(0)
+
+    with pytest.raises(errors.DoubleTransitionError):
+        await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+    await task
+    with pytest.raises(errors.TransitionToNextSceneError):
+        await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    assert aggregator.errors == {
+        "LockExistsError": 1,
+        "DoubleTransitionError": 1,
+        "TransitionToNextSceneError": 1
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_concurrent_hooks(chat_id, user_id, event, trigger, scene_mock_factory):
+    class SourceScene(Scene):
+        async def process_exit(self, event, data) -> None:
+            await asyncio.sleep(0.05)
+
+    class DestinationScene(Scene):
+        async def process_enter(self, event, data) -> None:
+            await asyncio.sleep(0.05)
+
+    source_scene = scene_mock_factory(SourceScene())
+    destination_scene = scene_mock_factory(DestinationScene())
+    machine = Machine(source_scene, MemorySceneStorage(), concurrent_hooks=True)
+    machine.add_transition(source_scene, destination_scene, trigger)
+    loop = asyncio.get_running_loop()
+    start_time = loop.time()
+
+    await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    assert loop.time() - start_time < 0.09
+    assert await machine.get_current_scene(chat_id=chat_id, user_id=user_id) is destination_scene
+    source_scene.process_exit.assert_awaited_once_with(event, None)
+    destination_scene.process_enter.assert_awaited_once_with(event, None)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("stored_scenes", "expected_scenes"),
+    (
+        ([], ["InitialScene"]),
+        (["InitialScene", "FooScene", "BarScene"], ["InitialScene", "FooScene", "BarScene"])
+    )
+)
+async def test_concurrent_hooks_rollback(chat_id, user_id, stored_scenes, expected_scenes,
+                                         event, trigger):
+    class FooScene(Scene):
+        async def process_enter(self, event, data) -> None:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("enter failed!")
+
+    initial_scene = Scene("InitialScene")
+    foo_scene = FooScene()
+    bar_scene = Scene("BarScene")
+    storage = MemorySceneStorage()
+    await storage.save_scenes(stored_scenes, chat_id=chat_id, user_id=user_id)
+    machine = Machine(initial_scene, storage, concurrent_hooks=True)
+    machine.add_transition(initial_scene, foo_scene, trigger)
+    machine.add_transition(foo_scene, bar_scene, trigger)
+    machine.add_transition(bar_scene, foo_scene, trigger)
+
+    with pytest.raises(RuntimeError, match="enter failed!"):
+        await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == expected_scenes
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_concurrent_hooks_failed_rollback(chat_id, user_id, event, trigger):
+    class FooScene(Scene):
+        async def process_enter(self, event, data) -> None:
+            await asyncio.sleep(0.01)
+            raise RuntimeError("enter failed!")
+
+    class FailingMemorySceneStorage(MemorySceneStorage):
+        saves = 0
+
+        async def update_scenes(self, scenes, length, stored_length, *, chat_id, user_id):
+            self.saves += 1
+            if self.saves > 1:
+                raise OSError("rollback failed!")
+            return await super().update_scenes(scenes, length, stored_length,
+                                               chat_id=chat_id, user_id=user_id)
+
+    initial_scene = Scene("InitialScene")
+    foo_scene = FooScene()
+    machine = Machine(initial_scene, FailingMemorySceneStorage(), concurrent_hooks=True)
+    machine.add_transition(initial_scene, foo_scene, trigger)
+
+    with pytest.raises(RuntimeError, match="enter failed!") as error_info:
+        await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    assert isinstance(error_info.value.__cause__, OSError)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("caching",),
+    (
+        (False,),
+        (True,)
+    )
+)
+async def test_optimistic_conflict(chat_id, user_id, caching, event, trigger):
+    class SlowScene(Scene):
+        async def process_exit(self, event, data) -> None:
+            await asyncio.sleep(0.05)
+
+    # the machines share the storage only, as if they were run by different processes
+    storage = MemorySceneStorage()
+    machines = []
+    for conflict_retries, initial_scene in ((0, SlowScene("InitialScene")),
+                                            (1, SlowScene("InitialScene")),
+                                            (0, Scene("InitialScene"))):
+        foo_scene = Scene("FooScene")
+        machine = Machine(initial_scene, storage,
+                          magazine_cache=LRUCache() if caching else None,
+                          optimistic=True, conflict_retries=conflict_retries)
+        machine.add_transition(initial_scene, foo_scene, trigger)
+        machine.add_transition(foo_scene, Scene("BarScene"), trigger)
+        machines.append(machine)
+    tasks = [asyncio.create_task(i.move_to_next_scene(event, trigger,
+                                                      chat_id=chat_id, user_id=user_id))
+             for i in machines[:2]]
+    await asyncio.sleep(0.01)
+
+    # the stored scenes are changed, but the transition still starts from the same scene
+    await machines[2].move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+    await machines[2].move_to_previous_scene(event, chat_id=chat_id, user_id=user_id)
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+
+    assert isinstance(results[0], errors.SceneConflictError)
+    assert results[1] is None
+    assert await storage.load_scenes(chat_id=chat_id,
+                                     user_id=user_id) == ["InitialScene", "FooScene"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("concurrent_hooks",),
+    (
+        (False,),
+        (True,)
+    )
+)
+@pytest.mark.parametrize(
+    ("changed_scenes", "expected_error"),
+    (
+        (["InitialScene"], None),
+        (["InitialScene", "FooScene"], errors.SceneConflictError)
+    )
+)
+async def test_optimistic_conflict_hooks(chat_id, user_id, concurrent_hooks, changed_scenes,
+                                         expected_error, event, trigger, scene_mock_factory):
+    class ChangedMemorySceneStorage(MemorySceneStorage):
+        changed = False
+
+        async def compare_and_save_scenes(self, scenes, version, *, chat_id, user_id):
+            # another process changes the scenes right before the first saving
+            if not self.changed:
+                self.changed = True
+                await self.save_scenes(changed_scenes, chat_id=chat_id, user_id=user_id)
+            return await super().compare_and_save_scenes(scenes, version,
+                                                          chat_id=chat_id, user_id=user_id)
+
+    storage = ChangedMemorySceneStorage()
+    source_scene = scene_mock_factory(Scene("InitialScene"))
+    destination_scene = scene_mock_factory(Scene("FooScene"))
+    machine = Machine(source_scene, storage, concurrent_hooks=concurrent_hooks,
+                      optimistic=True, conflict_retries=1)
+    machine.add_transition(source_scene, destination_scene, trigger)
+
+    if expected_error is None:
+        await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+    else:
+        with pytest.raises(expected_error):
+            await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    source_scene.process_exit.assert_awaited_once_with(event, None)
+    destination_scene.process_enter.assert_awaited_once_with(event, None)
+    assert await storage.load_scenes(chat_id=chat_id,
+                                     user_id=user_id) == ["InitialScene", "FooScene"]
+
+
+@pytest.mark.asyncio
+async def test_optimistic_unversioned_storage():
+    with pytest.raises(errors.UnversionedSceneStorageError):
+        Machine(Scene("InitialScene"), CompactMemorySceneStorage(), optimistic=True)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_shared_lock(chat_id, user_id, event, trigger, tmp_path):
+    class SourceScene(Scene):
+        async def process_exit(self, event, data) -> None:
+            await asyncio.sleep(0.05)
+
+    # the machines share the storages only, as if they were run by different processes
+    scene_storage = MemorySceneStorage()
+    lock_storages = [SQLiteLockStorage(str(tmp_path / "locks.sqlite3")) for _ in range(2)]
+    machines = []
+    for lock_storage in lock_storages:
+        source_scene = SourceScene()
+        machine = Machine(source_scene, scene_storage, lock_storage)
+        machine.add_transition(source_scene, Scene("FooScene"), trigger)
+        machines.append(machine)
+    task = asyncio.create_task(machines[0].move_to_next_scene(event, trigger,
+                                                              chat_id=chat_id, user_id=user_id))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(errors.DoubleTransitionError):
+        await machines[1].move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+    await task
+    for lock_storage in lock_storages:
+        await lock_storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_cached_magazine_of_expired_scenes(chat_id, user_id, trigger, event):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    bar_scene = Scene("BarScene")
+    storage = MemorySceneStorage(ttl=0.05)
+    machine = Machine(initial_scene, storage, magazine_cache=LRUCache())
+    machine.add_transition(initial_scene, foo_scene, trigger)
+    machine.add_transition(foo_scene, bar_scene, trigger)
+    await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+    await asyncio.sleep(0.06)
+    await storage.expire_scenes()
+
+    await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    # the delta of the cached magazine doesn't match the stored scenes, so all of them are saved
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == [
+        "InitialScene", "FooScene", "BarScene"
+    ]
@@ -3,6 +3,7 @@ import asyncio
 import pytest
 
 from tgbotscenario.asynchronous import Machine, Scene, MemorySceneStorage
+from tgbotscenario.common import LRUCache
 from tgbotscenario import errors
 
 
@@ -120,3 +121,44 @@ async def test_double_transition(chat_id, user_id, data, event, trigger, scene_m
     await task
     foo_scene.process_exit.assert_awaited_once_with(event, data)
     initial_scene.process_enter.assert_awaited_once_with(event, data)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("caching",),
+    (
+        (False,),
+        (True,)
+    )
+)
+@pytest.mark.parametrize(
+    ("max_depth",),
+    (
+        (None,),
+        (3,)
+    )
+)
+async def test_stored_scenes(chat_id, user_id, caching, max_depth, event, trigger):
+    scenes = [Scene(f"Scene{i}") for i in range(4)]
+    storage = MemorySceneStorage()
+    magazine_cache = LRUCache() if caching else None
+    machine = Machine(scenes[0], storage, magazine_cache=magazine_cache, max_depth=max_depth)
+    for source_scene, destination_scene in zip(scenes, scenes[1:]):
+        machine.add_transition(source_scene, destination_scene, trigger)
+
+    for _ in range(3):
+        await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+    await machine.move_to_previous_scene(event, chat_id=chat_id, user_id=user_id)
+    await machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    expected_scenes = ["Scene0", "Scene1", "Scene2", "Scene3"]
+    if max_depth is not None:
+        expected_scenes = ["Scene0", "Scene2", "Scene3"]
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == expected_scenes
@@ -46,3 +46,23 @@ def test_transition_for_removing_not_exists(direction, trigger):
 
     with pytest.raises(errors.TransitionForRemovingNotFoundError):
         machine.remove_transition(foo_scene, trigger, direction)
+
+
+def test_destination_scene_is_still_referenced():
+    async def foo_to_baz_trigger():
+        pass
+
+    async def bar_to_baz_trigger():
+        pass
+
+    foo_scene = Scene("FooScene")
+    bar_scene = Scene("BarScene")
+    baz_scene = Scene("BazScene")
+    machine = Machine(Scene("InitialScene"), MemorySceneStorage())
+    machine.add_transition(foo_scene, baz_scene, foo_to_baz_trigger)
+    machine.add_transition(bar_scene, baz_scene, bar_to_baz_trigger)
+
+    machine.remove_transition(foo_scene, foo_to_baz_trigger)
+
+    assert foo_scene not in machine.scenes
+    assert baz_scene in machine.scenes
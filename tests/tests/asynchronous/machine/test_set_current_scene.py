@@ -1,4 +1,5 @@
 import asyncio
+from unittest.mock import AsyncMock
 
 import pytest
 
@@ -109,3 +110,28 @@ async def test_unknown_scene_in_storage(chat_id, user_id, trigger, event):
 
     with pytest.raises(errors.UnknownSceneError):
         await machine.set_current_scene(foo_scene, event, chat_id=chat_id, user_id=user_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_current_scene(chat_id, user_id, trigger, event):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    storage = MemorySceneStorage()
+    storage.update_scenes = AsyncMock(side_effect=storage.update_scenes)
+    machine = Machine(initial_scene, storage)
+    machine.add_transition(initial_scene, foo_scene, trigger)
+
+    await machine.set_current_scene(initial_scene, event, chat_id=chat_id, user_id=user_id)
+    await machine.set_current_scene(foo_scene, event, chat_id=chat_id, user_id=user_id)
+    await machine.set_current_scene(foo_scene, event, chat_id=chat_id, user_id=user_id)
+
+    storage.update_scenes.assert_awaited_once_with(["InitialScene", "FooScene"], 0, 0,
+                                                   chat_id=chat_id, user_id=user_id)
+    assert machine.skipped_saves == 2
@@ -0,0 +1,81 @@
+import pytest
+
+from tgbotscenario.asynchronous import CompactMemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_scenes_not_exists(chat_id, user_id):
+    storage = CompactMemorySceneStorage()
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_scenes_exists(chat_id, user_id, scenes):
+    storage = CompactMemorySceneStorage()
+    await storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_immutability(chat_id, user_id, scenes):
+    storage = CompactMemorySceneStorage()
+    saving_scenes = scenes.copy()
+    await storage.save_scenes(saving_scenes, chat_id=chat_id, user_id=user_id)
+
+    loaded_scenes = await storage.load_scenes(chat_id=chat_id, user_id=user_id)
+    saving_scenes.clear()
+
+    assert loaded_scenes == scenes
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_no_insertion(chat_id, user_id):
+    storage = CompactMemorySceneStorage()
+
+    await storage.load_scenes(chat_id=chat_id, user_id=user_id)
+
+    assert len(storage) == 0
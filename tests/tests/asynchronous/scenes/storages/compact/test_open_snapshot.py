@@ -0,0 +1,98 @@
+import pytest
+
+from tgbotscenario.asynchronous import CompactMemorySceneStorage
+from tgbotscenario.common.codecs import IntegerSceneCodec, TextSceneCodec
+from tgbotscenario.common.registry import SceneRegistry
+from tgbotscenario import errors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(tmp_path, chat_id, user_id):
+    path = str(tmp_path / "scenes.snapshot")
+    storage = CompactMemorySceneStorage()
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+    await storage.save_scenes(["InitialScene", "BarScene"], chat_id=1, user_id=1)
+    await storage.save_snapshot(path)
+
+    storage = CompactMemorySceneStorage()
+    storage.open_snapshot(path)
+    assert len(storage) == 2
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == [
+        "InitialScene", "FooScene"
+    ]
+    await storage.save_scenes([], chat_id=1, user_id=1)
+    assert await storage.load_scenes(chat_id=1, user_id=1) == []
+    assert len(storage) == 1
+
+
+@pytest.mark.asyncio
+async def test_other_registry(tmp_path):
+    path = str(tmp_path / "scenes.snapshot")
+    storage = CompactMemorySceneStorage()
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=1, user_id=1)
+    await storage.save_scenes(["InitialScene", "BarScene"], chat_id=2, user_id=2)
+    await storage.save_snapshot(path)
+
+    registry = SceneRegistry()
+    registry.register("FooScene")
+    storage = CompactMemorySceneStorage(IntegerSceneCodec(registry))
+    storage.open_snapshot(path)
+
+    assert registry.names == ["FooScene"]
+    assert await storage.load_scenes(chat_id=1, user_id=1) == ["InitialScene", "FooScene"]
+    assert registry.names == ["FooScene", "InitialScene"]
+    await storage.save_snapshot(path)
+    storage = CompactMemorySceneStorage()
+    storage.open_snapshot(path)
+    assert await storage.load_many([(1, 1), (2, 2)]) == {
+        (1, 1): ["InitialScene", "FooScene"],
+        (2, 2): ["InitialScene", "BarScene"]
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("codec", "other_codec"),
+    (
+        (TextSceneCodec(), IntegerSceneCodec(SceneRegistry())),
+        (IntegerSceneCodec(SceneRegistry()), TextSceneCodec())
+    )
+)
+async def test_other_codec(tmp_path, codec, other_codec):
+    path = str(tmp_path / "scenes.snapshot")
+    storage = CompactMemorySceneStorage(codec)
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=1, user_id=1)
+    await storage.save_snapshot(path)
+
+    storage = CompactMemorySceneStorage(other_codec)
+    with pytest.raises(errors.CorruptedSnapshotError):
+        storage.open_snapshot(path)
+
+
+@pytest.mark.asyncio
+async def test_truncated_file(tmp_path):
+    path = tmp_path / "scenes.snapshot"
+    storage = CompactMemorySceneStorage()
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=1, user_id=1)
+    await storage.save_snapshot(str(path))
+    path.write_bytes(path.read_bytes()[:-10])
+
+    storage = CompactMemorySceneStorage()
+    with pytest.raises(errors.CorruptedSnapshotError):
+        storage.open_snapshot(str(path))
+
+
+def test_unknown_format(tmp_path):
+    path = tmp_path / "scenes.snapshot"
+    path.write_bytes(b"")
+
+    storage = CompactMemorySceneStorage()
+    with pytest.raises(errors.CorruptedSnapshotError):
+        storage.open_snapshot(str(path))
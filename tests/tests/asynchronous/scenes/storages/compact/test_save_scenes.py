@@ -0,0 +1,88 @@
+import pytest
+
+from tgbotscenario.asynchronous import CompactMemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_behavior(chat_id, user_id, scenes):
+    storage = CompactMemorySceneStorage()
+
+    await storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_immutability(chat_id, user_id, scenes):
+    storage = CompactMemorySceneStorage()
+    saving_scenes = scenes.copy()
+
+    await storage.save_scenes(saving_scenes, chat_id=chat_id, user_id=user_id)
+    saving_scenes.clear()
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
+
+
+@pytest.mark.asyncio
+async def test_key_packing():
+    storage = CompactMemorySceneStorage()
+
+    await storage.save_scenes(["InitialScene"], chat_id=123456789, user_id=123456789)
+    await storage.save_scenes(["InitialScene", "FooScene"],
+                              chat_id=-100123456789, user_id=123456789)
+    await storage.save_scenes(["InitialScene", "BarScene"],
+                              chat_id=123456789, user_id=-100123456789)
+
+    assert len(storage) == 3
+    assert await storage.load_many([(123456789, 123456789), (-100123456789, 123456789),
+                                    (123456789, -100123456789)]) == {
+        (123456789, 123456789): ["InitialScene"],
+        (-100123456789, 123456789): ["InitialScene", "FooScene"],
+        (123456789, -100123456789): ["InitialScene", "BarScene"]
+    }
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_empty_scenes(chat_id, user_id):
+    storage = CompactMemorySceneStorage()
+    await storage.save_scenes(["InitialScene"], chat_id=chat_id, user_id=user_id)
+
+    await storage.save_scenes([], chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+    assert len(storage) == 0
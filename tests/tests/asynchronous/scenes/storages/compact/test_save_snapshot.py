@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+
+from tgbotscenario.asynchronous import CompactMemorySceneStorage
+from tgbotscenario.common.snapshot import SceneSnapshot
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(tmp_path, chat_id, user_id):
+    path = str(tmp_path / "scenes.snapshot")
+    storage = CompactMemorySceneStorage()
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+    await storage.save_scenes(["InitialScene"], chat_id=1, user_id=1)
+    await storage.save_snapshot(path)
+
+    snapshot = SceneSnapshot(path)
+    assert len(snapshot) == 2
+    assert snapshot.names == ["InitialScene", "FooScene"]
+    assert snapshot.get(chat_id, user_id) == b"\x01\x00\x01"
+    assert snapshot.get(2, 2) is None
+    snapshot.close()
+
+
+@pytest.mark.asyncio
+async def test_opened_snapshot(tmp_path):
+    path = str(tmp_path / "scenes.snapshot")
+    storage = CompactMemorySceneStorage()
+    await storage.save_scenes(["InitialScene"], chat_id=1, user_id=1)
+    await storage.save_scenes(["InitialScene"], chat_id=2, user_id=2)
+    await storage.save_snapshot(path)
+    storage.open_snapshot(path)
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=1, user_id=1)
+    await storage.save_scenes([], chat_id=2, user_id=2)
+    await storage.save_scenes(["InitialScene"], chat_id=3, user_id=3)
+    await storage.save_snapshot(path)
+
+    storage = CompactMemorySceneStorage()
+    storage.open_snapshot(path)
+    assert len(storage) == 2
+    assert await storage.load_many([(1, 1), (2, 2), (3, 3)]) == {
+        (1, 1): ["InitialScene", "FooScene"],
+        (2, 2): [],
+        (3, 3): ["InitialScene"]
+    }
+
+
+@pytest.mark.asyncio
+async def test_opening_during_saving(tmp_path):
+    path = str(tmp_path / "scenes.snapshot")
+    storage = CompactMemorySceneStorage()
+    for i in range(100000):
+        await storage.save_scenes(["InitialScene"], chat_id=i, user_id=i)
+    await storage.save_snapshot(path)
+    storage.open_snapshot(path)
+
+    saving = asyncio.ensure_future(storage.save_snapshot(str(tmp_path / "other.snapshot")))
+    await asyncio.sleep(0)
+    storage.open_snapshot(path)
+    await saving
+
+    snapshot = SceneSnapshot(str(tmp_path / "other.snapshot"))
+    assert len(snapshot) == 100000
+    snapshot.close()
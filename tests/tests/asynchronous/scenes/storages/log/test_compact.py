@@ -0,0 +1,44 @@
+import pytest
+
+from tgbotscenario.asynchronous import LogSceneStorage
+
+
+@pytest.mark.asyncio
+async def test_behavior(tmp_path):
+    storage = LogSceneStorage(str(tmp_path))
+    for i in range(10):
+        await storage.save_scenes(["InitialScene", f"Scene{i}"], chat_id=1, user_id=1)
+    await storage.save_scenes(["InitialScene"], chat_id=2, user_id=2)
+    await storage.save_scenes([], chat_id=2, user_id=2)
+
+    await storage.compact()
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=3, user_id=3)
+    await storage.close()
+
+    assert storage.generation == 1
+    assert not (tmp_path / "scenes.0.log").exists()
+    storage = LogSceneStorage(str(tmp_path))
+    assert await storage.load_many([(1, 1), (2, 2), (3, 3)]) == {
+        (1, 1): ["InitialScene", "Scene9"],
+        (2, 2): [],
+        (3, 3): ["InitialScene", "FooScene"]
+    }
+    assert len(storage) == 2
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_compaction(tmp_path):
+    storage = LogSceneStorage(str(tmp_path))
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=1, user_id=1)
+    await storage.compact()
+    await storage.save_scenes(["InitialScene", "BarScene"], chat_id=1, user_id=1)
+    await storage.close()
+    # the log of a compacted generation is left as if the compaction has been interrupted
+    (tmp_path / "scenes.0.log").write_bytes(b"")
+
+    storage = LogSceneStorage(str(tmp_path))
+
+    assert await storage.load_scenes(chat_id=1, user_id=1) == ["InitialScene", "BarScene"]
+    assert not (tmp_path / "scenes.0.log").exists()
+    await storage.close()
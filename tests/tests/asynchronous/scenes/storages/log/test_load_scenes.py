@@ -0,0 +1,72 @@
+import pytest
+
+from tgbotscenario.asynchronous import LogSceneStorage
+from tgbotscenario import errors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id, tmp_path):
+    storage = LogSceneStorage(str(tmp_path))
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+    await storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_replay(chat_id, user_id, tmp_path):
+    storage = LogSceneStorage(str(tmp_path))
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+    await storage.save_scenes(["InitialScene", "BarScene"], chat_id=chat_id, user_id=user_id)
+    await storage.save_scenes(["InitialScene"], chat_id=1, user_id=1)
+    await storage.close()
+
+    storage = LogSceneStorage(str(tmp_path))
+
+    assert await storage.load_scenes(chat_id=chat_id,
+                                     user_id=user_id) == ["InitialScene", "BarScene"]
+    assert await storage.load_scenes(chat_id=1, user_id=1) == ["InitialScene"]
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_damaged_tail(tmp_path):
+    storage = LogSceneStorage(str(tmp_path))
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=1, user_id=1)
+    await storage.save_scenes(["InitialScene", "BarScene"], chat_id=2, user_id=2)
+    await storage.close()
+    path = tmp_path / "scenes.0.log"
+    path.write_bytes(path.read_bytes()[:-3])
+
+    storage = LogSceneStorage(str(tmp_path))
+    await storage.save_scenes(["InitialScene"], chat_id=3, user_id=3)
+    await storage.close()
+    storage = LogSceneStorage(str(tmp_path))
+
+    assert await storage.load_many([(1, 1), (2, 2), (3, 3)]) == {
+        (1, 1): ["InitialScene", "FooScene"],
+        (2, 2): [],
+        (3, 3): ["InitialScene"]
+    }
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_damaged_snapshot(tmp_path):
+    (tmp_path / "scenes.snapshot").write_bytes(b"damaged")
+
+    with pytest.raises(errors.CorruptedSnapshotError):
+        LogSceneStorage(str(tmp_path))
@@ -0,0 +1,77 @@
+import asyncio
+import os
+
+import pytest
+
+from tgbotscenario.asynchronous import LogSceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_behavior(chat_id, user_id, scenes, tmp_path):
+    storage = LogSceneStorage(str(tmp_path))
+
+    await storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
+    assert len(storage) == 1
+    await storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_empty_scenes(chat_id, user_id, tmp_path):
+    storage = LogSceneStorage(str(tmp_path))
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+
+    await storage.save_scenes([], chat_id=chat_id, user_id=user_id)
+    await storage.close()
+
+    storage = LogSceneStorage(str(tmp_path))
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+    assert len(storage) == 0
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_group_commit(tmp_path):
+    storage = LogSceneStorage(str(tmp_path), sync_interval=None)
+
+    await storage.save_many({(i, i): ["InitialScene", "FooScene"] for i in range(10)})
+
+    assert os.path.getsize(tmp_path / "scenes.0.log") == 0
+    await storage.sync()
+    assert os.path.getsize(tmp_path / "scenes.0.log") > 0
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_automatic_compaction(tmp_path):
+    storage = LogSceneStorage(str(tmp_path), sync_interval=0.01, compaction_size=1024)
+    for _ in range(10):
+        await storage.save_many({(i, i): ["InitialScene", "FooScene"] for i in range(10)})
+
+    await asyncio.sleep(0.05)
+
+    assert (tmp_path / "scenes.snapshot").exists()
+    assert not (tmp_path / "scenes.0.log").exists()
+    await storage.close()
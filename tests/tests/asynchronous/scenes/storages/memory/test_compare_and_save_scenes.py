@@ -0,0 +1,67 @@
+import pytest
+
+from tgbotscenario.asynchronous import MemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    storage = MemorySceneStorage()
+
+    assert await storage.compare_and_save_scenes(["InitialScene", "FooScene"], 0,
+                                                 chat_id=chat_id, user_id=user_id)
+    assert await storage.compare_and_save_scenes(["InitialScene"], 1,
+                                                 chat_id=chat_id, user_id=user_id)
+    assert await storage.load_versioned_scenes(chat_id=chat_id,
+                                               user_id=user_id) == (["InitialScene"], 2)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("version",),
+    (
+        (0,),
+        (2,)
+    )
+)
+async def test_conflict(chat_id, user_id, version):
+    storage = MemorySceneStorage()
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+
+    assert not await storage.compare_and_save_scenes(["InitialScene"], version,
+                                                     chat_id=chat_id, user_id=user_id)
+    assert await storage.load_scenes(chat_id=chat_id,
+                                     user_id=user_id) == ["InitialScene", "FooScene"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_delta_changes(chat_id, user_id):
+    storage = MemorySceneStorage()
+    await storage.update_scenes(["InitialScene", "FooScene"], 0, 0,
+                                chat_id=chat_id, user_id=user_id)
+    await storage.update_scenes(["BarScene"], 1, 2, chat_id=chat_id, user_id=user_id)
+
+    assert not await storage.compare_and_save_scenes(["InitialScene"], 1,
+                                                     chat_id=chat_id, user_id=user_id)
+    assert await storage.compare_and_save_scenes(["InitialScene", "BarScene"], 2,
+                                                 chat_id=chat_id, user_id=user_id)
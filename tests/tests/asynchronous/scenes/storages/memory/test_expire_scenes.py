@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from tgbotscenario.asynchronous import MemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    storage = MemorySceneStorage(ttl=0.05)
+    await storage.save_scenes(["InitialScene"], chat_id=chat_id, user_id=user_id)
+    await storage.save_scenes(["InitialScene"], chat_id=1, user_id=1)
+    await asyncio.sleep(0.03)
+    await storage.load_scenes(chat_id=1, user_id=1)
+    await asyncio.sleep(0.03)
+
+    assert await storage.expire_scenes() == 1
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+    assert await storage.load_scenes(chat_id=1, user_id=1) == ["InitialScene"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_lazy_expiration(chat_id, user_id):
+    storage = MemorySceneStorage(ttl=0.01)
+    await storage.save_scenes(["InitialScene"], chat_id=chat_id, user_id=user_id)
+    await asyncio.sleep(0.02)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+    assert await storage.expire_scenes() == 0
+
+
+@pytest.mark.asyncio
+async def test_without_ttl():
+    storage = MemorySceneStorage()
+    await storage.save_scenes(["InitialScene"], chat_id=123456789, user_id=123456789)
+
+    assert await storage.expire_scenes() == 0
+    assert await storage.load_scenes(chat_id=123456789, user_id=123456789) == ["InitialScene"]
@@ -0,0 +1,26 @@
+import pytest
+
+from tgbotscenario.asynchronous import MemorySceneStorage
+
+
+@pytest.mark.asyncio
+async def test_behavior():
+    storage = MemorySceneStorage()
+    await storage.save_scenes(["InitialScene", "FooScene"],
+                              chat_id=-100123456789, user_id=123456789)
+
+    scenes = await storage.load_many([(-100123456789, 123456789), (123456789, 123456789)])
+
+    assert scenes == {(-100123456789, 123456789): ["InitialScene", "FooScene"],
+                      (123456789, 123456789): []}
+
+
+@pytest.mark.asyncio
+async def test_immutability():
+    storage = MemorySceneStorage()
+    await storage.save_scenes(["InitialScene"], chat_id=123456789, user_id=123456789)
+
+    scenes = await storage.load_many([(123456789, 123456789)])
+    scenes[123456789, 123456789].clear()
+
+    assert await storage.load_scenes(chat_id=123456789, user_id=123456789) == ["InitialScene"]
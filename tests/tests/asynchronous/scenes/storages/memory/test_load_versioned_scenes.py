@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from tgbotscenario.asynchronous import MemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    storage = MemorySceneStorage()
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_versioned_scenes(
+        chat_id=chat_id, user_id=user_id
+    ) == (["InitialScene", "FooScene"], 1)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_missing_scenes(chat_id, user_id):
+    storage = MemorySceneStorage()
+
+    assert await storage.load_versioned_scenes(chat_id=chat_id, user_id=user_id) == ([], 0)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_expired_scenes(chat_id, user_id):
+    storage = MemorySceneStorage(ttl=0.01)
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+    time.sleep(0.02)
+
+    assert await storage.load_versioned_scenes(chat_id=chat_id, user_id=user_id) == ([], 0)
@@ -0,0 +1,26 @@
+import pytest
+
+from tgbotscenario.asynchronous import MemorySceneStorage
+
+
+@pytest.mark.asyncio
+async def test_behavior():
+    storage = MemorySceneStorage()
+
+    await storage.save_many({(-100123456789, 123456789): ["InitialScene", "FooScene"],
+                             (123456789, 123456789): ["InitialScene"]})
+
+    assert await storage.load_scenes(chat_id=-100123456789,
+                                     user_id=123456789) == ["InitialScene", "FooScene"]
+    assert await storage.load_scenes(chat_id=123456789, user_id=123456789) == ["InitialScene"]
+
+
+@pytest.mark.asyncio
+async def test_immutability():
+    storage = MemorySceneStorage()
+    saving_scenes = ["InitialScene"]
+
+    await storage.save_many({(123456789, 123456789): saving_scenes})
+    saving_scenes.clear()
+
+    assert await storage.load_scenes(chat_id=123456789, user_id=123456789) == ["InitialScene"]
@@ -0,0 +1,80 @@
+import pytest
+
+from tgbotscenario.asynchronous import MemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    storage = MemorySceneStorage()
+    await storage.save_scenes(["InitialScene", "FooScene", "BarScene"],
+                              chat_id=chat_id, user_id=user_id)
+
+    assert await storage.update_scenes(["BazScene"], 1, 3, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id,
+                                     user_id=user_id) == ["InitialScene", "BazScene"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_scenes_not_exists(chat_id, user_id):
+    storage = MemorySceneStorage()
+
+    assert await storage.update_scenes(["InitialScene"], 0, 0, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == ["InitialScene"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("stored_scenes",),
+    (
+        ([],),
+        (["InitialScene"],)
+    )
+)
+async def test_unexpected_length(chat_id, user_id, stored_scenes):
+    storage = MemorySceneStorage()
+    await storage.save_scenes(stored_scenes, chat_id=chat_id, user_id=user_id)
+
+    assert not await storage.update_scenes(["BarScene"], 1, 2, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == stored_scenes
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_immutability(chat_id, user_id):
+    storage = MemorySceneStorage()
+    saving_scenes = ["InitialScene"]
+    await storage.save_scenes(saving_scenes, chat_id=chat_id, user_id=user_id)
+
+    await storage.update_scenes(["FooScene"], 1, 1, chat_id=chat_id, user_id=user_id)
+
+    assert saving_scenes == ["InitialScene"]
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from tgbotscenario.asynchronous import RedisSceneStorage
+from tgbotscenario import errors
+from tests.resp import RESPServer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_empty(chat_id, user_id):
+    async with RESPServer() as server:
+        storage = RedisSceneStorage("127.0.0.1", server.port)
+
+        assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+        await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_authentication():
+    async with RESPServer(password="secret") as server:
+        storage = RedisSceneStorage("127.0.0.1", server.port, password="secret", db=1)
+        await storage.save_scenes(["InitialScene"], chat_id=1, user_id=1)
+
+        assert await storage.load_scenes(chat_id=1, user_id=1) == ["InitialScene"]
+        await storage.close()
+
+        storage = RedisSceneStorage("127.0.0.1", server.port)
+        with pytest.raises(errors.RedisReplyError):
+            await storage.load_scenes(chat_id=1, user_id=1)
+        await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_reconnection():
+    async with RESPServer() as server:
+        storage = RedisSceneStorage("127.0.0.1", server.port)
+        await storage.save_scenes(["InitialScene"], chat_id=1, user_id=1)
+        server.disconnect()
+        await asyncio.sleep(0.01)
+
+        assert await storage.load_scenes(chat_id=1, user_id=1) == ["InitialScene"]
+        assert server.connections == 2
+        await storage.close()
@@ -0,0 +1,75 @@
+import asyncio
+
+import pytest
+
+from tgbotscenario.asynchronous import RedisSceneStorage
+from tests.resp import RESPServer
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_behavior(chat_id, user_id, scenes):
+    async with RESPServer() as server:
+        storage = RedisSceneStorage("127.0.0.1", server.port)
+
+        await storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+
+        assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
+        await storage.save_scenes([], chat_id=chat_id, user_id=user_id)
+        assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+        await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_pipelining():
+    async with RESPServer() as server:
+        storage = RedisSceneStorage("127.0.0.1", server.port, max_connections=1)
+
+        await asyncio.gather(*(storage.save_scenes(["InitialScene", "FooScene"],
+                                                   chat_id=i, user_id=i) for i in range(100)))
+
+        assert server.connections == 1
+        assert server.max_pipeline > 1
+        assert await storage.load_many([(i, i) for i in range(100)]) == {
+            (i, i): ["InitialScene", "FooScene"] for i in range(100)
+        }
+        await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_connection_pool():
+    async with RESPServer() as server:
+        storage = RedisSceneStorage("127.0.0.1", server.port, max_connections=2)
+
+        for _ in range(3):
+            await asyncio.gather(*(storage.save_scenes(["InitialScene"], chat_id=i, user_id=i)
+                                   for i in range(10)))
+
+        assert server.connections == 2
+        await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_ttl():
+    async with RESPServer() as server:
+        storage = RedisSceneStorage("127.0.0.1", server.port, prefix="scenes:", ttl=0.05)
+
+        await storage.save_scenes(["InitialScene"], chat_id=1, user_id=1)
+
+        assert 0 < server.get_ttl(b"scenes:1:1") <= 0.05
+        await asyncio.sleep(0.06)
+        assert await storage.load_scenes(chat_id=1, user_id=1) == []
+        await storage.close()
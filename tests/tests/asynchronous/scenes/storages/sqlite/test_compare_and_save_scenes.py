@@ -0,0 +1,104 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from tgbotscenario.asynchronous import SQLiteSceneStorage
+from tgbotscenario.common.codecs import TextSceneCodec
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id, tmp_path):
+    storage = SQLiteSceneStorage(str(tmp_path / "scenes.sqlite3"))
+
+    assert await storage.compare_and_save_scenes(["InitialScene", "FooScene"], 0,
+                                                 chat_id=chat_id, user_id=user_id)
+    assert await storage.compare_and_save_scenes(["InitialScene"], 1,
+                                                 chat_id=chat_id, user_id=user_id)
+    assert await storage.load_versioned_scenes(chat_id=chat_id,
+                                               user_id=user_id) == (["InitialScene"], 2)
+    await storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("version",),
+    (
+        (0,),
+        (2,)
+    )
+)
+async def test_conflict(chat_id, user_id, version, tmp_path):
+    path = str(tmp_path / "scenes.sqlite3")
+    storage = SQLiteSceneStorage(path)
+    another_storage = SQLiteSceneStorage(path)
+    await another_storage.save_scenes(["InitialScene", "FooScene"],
+                                      chat_id=chat_id, user_id=user_id)
+    await another_storage.close()
+
+    assert not await storage.compare_and_save_scenes(["InitialScene"], version,
+                                                     chat_id=chat_id, user_id=user_id)
+    assert await storage.load_versioned_scenes(
+        chat_id=chat_id, user_id=user_id
+    ) == (["InitialScene", "FooScene"], 1)
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_unversioned_table(tmp_path):
+    path = str(tmp_path / "scenes.sqlite3")
+    connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE scenes (chat_id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+                       "scenes BLOB NOT NULL, PRIMARY KEY (chat_id, user_id)) WITHOUT ROWID")
+    connection.execute("INSERT INTO scenes VALUES (1, 1, ?)", (b"InitialScene\0FooScene",))
+    connection.commit()
+    connection.close()
+    storage = SQLiteSceneStorage(path)
+
+    assert await storage.load_versioned_scenes(chat_id=1, user_id=1) == (
+        ["InitialScene", "FooScene"], 1
+    )
+    assert not await storage.compare_and_save_scenes(["InitialScene"], 0, chat_id=1, user_id=1)
+    assert await storage.compare_and_save_scenes(["InitialScene"], 1, chat_id=1, user_id=1)
+    assert await storage.load_versioned_scenes(chat_id=1, user_id=1) == (["InitialScene"], 2)
+    await storage.close()
+
+
+class SlowSceneCodec(TextSceneCodec):
+
+    def encode(self, scenes):
+        time.sleep(0.05)
+        return super().encode(scenes)
+
+
+@pytest.mark.asyncio
+async def test_immediate_commit(tmp_path):
+    path = str(tmp_path / "scenes.sqlite3")
+    storage = SQLiteSceneStorage(path, codec=SlowSceneCodec())
+    await storage.save_scenes(["InitialScene"], chat_id=1, user_id=1)
+
+    saving = asyncio.ensure_future(storage.save_scenes(["InitialScene"], chat_id=2, user_id=2))
+    assert await storage.compare_and_save_scenes(["InitialScene", "FooScene"], 1,
+                                                 chat_id=1, user_id=1)
+
+    # the plain save is still queued, but the conditional one is visible to other connections
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT version FROM scenes WHERE chat_id = 1").fetchone() == (2,)
+    connection.close()
+    await saving
+    await storage.close()
@@ -0,0 +1,88 @@
+import pytest
+
+from tgbotscenario.asynchronous import SQLiteSceneStorage
+from tgbotscenario.common import SceneRegistry, IntegerSceneCodec
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_scenes_not_exists(chat_id, user_id, tmp_path):
+    storage = SQLiteSceneStorage(str(tmp_path / "scenes.sqlite3"))
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+    await storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        ([],),
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_scenes_exists(chat_id, user_id, scenes, tmp_path):
+    storage = SQLiteSceneStorage(str(tmp_path / "scenes.sqlite3"))
+    await storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
+    await storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_persistence(chat_id, user_id, tmp_path):
+    path = str(tmp_path / "scenes.sqlite3")
+    storage = SQLiteSceneStorage(path)
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+    await storage.close()
+
+    storage = SQLiteSceneStorage(path)
+
+    assert await storage.load_scenes(chat_id=chat_id,
+                                     user_id=user_id) == ["InitialScene", "FooScene"]
+    await storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_integer_codec(chat_id, user_id, tmp_path):
+    storage_path = str(tmp_path / "scenes.sqlite3")
+    registry_path = str(tmp_path / "registry.json")
+    storage = SQLiteSceneStorage(storage_path,
+                                 codec=IntegerSceneCodec(SceneRegistry(registry_path)))
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+    await storage.close()
+
+    storage = SQLiteSceneStorage(storage_path,
+                                 codec=IntegerSceneCodec(SceneRegistry(registry_path)))
+
+    assert await storage.load_scenes(chat_id=chat_id,
+                                     user_id=user_id) == ["InitialScene", "FooScene"]
+    await storage.close()
@@ -0,0 +1,19 @@
+import pytest
+
+from tgbotscenario.asynchronous import SQLiteSceneStorage
+
+
+@pytest.mark.asyncio
+async def test_behavior(tmp_path):
+    storage = SQLiteSceneStorage(str(tmp_path / "scenes.sqlite3"))
+
+    await storage.save_many({(-100123456789, 123456789): ["InitialScene", "FooScene"],
+                             (123456789, 123456789): ["InitialScene"]})
+
+    assert await storage.load_many([(-100123456789, 123456789), (123456789, 123456789),
+                                    (1, 1)]) == {
+        (-100123456789, 123456789): ["InitialScene", "FooScene"],
+        (123456789, 123456789): ["InitialScene"],
+        (1, 1): []
+    }
+    await storage.close()
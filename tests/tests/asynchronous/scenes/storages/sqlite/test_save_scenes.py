@@ -0,0 +1,74 @@
+import asyncio
+import sqlite3
+import time
+
+import pytest
+
+from tgbotscenario.asynchronous import SQLiteSceneStorage
+from tgbotscenario.common.codecs import TextSceneCodec
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_behavior(chat_id, user_id, scenes, tmp_path):
+    storage = SQLiteSceneStorage(str(tmp_path / "scenes.sqlite3"))
+
+    await storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_saving(tmp_path):
+    path = str(tmp_path / "scenes.sqlite3")
+    storage = SQLiteSceneStorage(path, commit_size=10)
+
+    await asyncio.gather(*(storage.save_scenes(["InitialScene", "FooScene"],
+                                               chat_id=i, user_id=i) for i in range(100)))
+    await storage.close()
+
+    storage = SQLiteSceneStorage(path)
+    scenes = await storage.load_many([(i, i) for i in range(100)])
+    assert scenes == {(i, i): ["InitialScene", "FooScene"] for i in range(100)}
+    await storage.close()
+
+
+class SlowSceneCodec(TextSceneCodec):
+
+    def encode(self, scenes):
+        time.sleep(0.05)
+        return super().encode(scenes)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_saving(tmp_path):
+    path = str(tmp_path / "scenes.sqlite3")
+    storage = SQLiteSceneStorage(path, codec=SlowSceneCodec())
+
+    saving = asyncio.ensure_future(storage.save_scenes(["InitialScene"], chat_id=1, user_id=1))
+    cancelled_saving = asyncio.ensure_future(storage.save_scenes(["InitialScene"],
+                                                                 chat_id=2, user_id=2))
+    await asyncio.sleep(0.01)
+    cancelled_saving.cancel()
+    await saving
+    await asyncio.sleep(0.01)
+
+    # the cancelled saving hasn't been run, so the storage is idle and commits the first one
+    connection = sqlite3.connect(path)
+    assert connection.execute("SELECT chat_id FROM scenes").fetchall() == [(1,)]
+    connection.close()
+    await storage.close()
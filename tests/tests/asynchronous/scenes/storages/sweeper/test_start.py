@@ -0,0 +1,43 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tgbotscenario.asynchronous import SceneStorageSweeper, MemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    storage = MemorySceneStorage(ttl=0.01)
+    sweeper = SceneStorageSweeper(storage, 0.02)
+    await storage.save_scenes(["InitialScene"], chat_id=chat_id, user_id=user_id)
+
+    sweeper.start()
+    await asyncio.sleep(0.05)
+
+    assert sweeper.running
+    assert sweeper.expired_scenes == 1
+    await sweeper.stop()
+
+
+@pytest.mark.asyncio
+async def test_failures():
+    storage = MemorySceneStorage(ttl=0.01)
+    storage.expire_scenes = AsyncMock(side_effect=[ConnectionError, 1, 0, 0, 0])
+    sweeper = SceneStorageSweeper(storage, 0.02)
+
+    sweeper.start()
+    await asyncio.sleep(0.05)
+
+    assert sweeper.running
+    assert sweeper.failures == 1
+    assert isinstance(sweeper.last_error, ConnectionError)
+    assert sweeper.expired_scenes == 1
+    await sweeper.stop()
@@ -0,0 +1,13 @@
+import pytest
+
+from tgbotscenario.asynchronous import SceneStorageSweeper, MemorySceneStorage
+
+
+@pytest.mark.asyncio
+async def test_behavior():
+    sweeper = SceneStorageSweeper(MemorySceneStorage(ttl=1), 1)
+    sweeper.start()
+
+    await sweeper.stop()
+
+    assert not sweeper.running
@@ -0,0 +1,39 @@
+import pytest
+
+from tgbotscenario.asynchronous import WriteBehindSceneStorage, MemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    inner_storage = MemorySceneStorage()
+    storage = WriteBehindSceneStorage(inner_storage)
+    await storage.save_scenes(["InitialScene"], chat_id=chat_id, user_id=user_id)
+
+    await storage.close()
+
+    assert await inner_storage.load_scenes(chat_id=chat_id, user_id=user_id) == ["InitialScene"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_saving_after_closing(chat_id, user_id):
+    inner_storage = MemorySceneStorage()
+    storage = WriteBehindSceneStorage(inner_storage)
+    await storage.close()
+
+    await storage.save_scenes(["InitialScene"], chat_id=chat_id, user_id=user_id)
+
+    assert await inner_storage.load_scenes(chat_id=chat_id, user_id=user_id) == ["InitialScene"]
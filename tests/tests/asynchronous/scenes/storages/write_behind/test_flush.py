@@ -0,0 +1,46 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tgbotscenario.asynchronous import WriteBehindSceneStorage, MemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    inner_storage = MemorySceneStorage()
+    storage = WriteBehindSceneStorage(inner_storage, flush_interval=None)
+    await storage.save_scenes(["InitialScene"], chat_id=chat_id, user_id=user_id)
+
+    await storage.flush()
+
+    assert await inner_storage.load_scenes(chat_id=chat_id, user_id=user_id) == ["InitialScene"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_storage_error(chat_id, user_id):
+    inner_storage = MemorySceneStorage()
+    save_many = inner_storage.save_many
+    inner_storage.save_many = AsyncMock(side_effect=RuntimeError)
+    storage = WriteBehindSceneStorage(inner_storage, flush_interval=None)
+    await storage.save_scenes(["InitialScene"], chat_id=chat_id, user_id=user_id)
+
+    with pytest.raises(RuntimeError):
+        await storage.flush()
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == ["InitialScene"]
+    inner_storage.save_many = save_many
+    await storage.flush()
+    assert await inner_storage.load_scenes(chat_id=chat_id, user_id=user_id) == ["InitialScene"]
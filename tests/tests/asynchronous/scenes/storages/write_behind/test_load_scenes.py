@@ -0,0 +1,89 @@
+import pytest
+
+from tgbotscenario.asynchronous import WriteBehindSceneStorage, MemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_scenes_not_exists(chat_id, user_id):
+    storage = WriteBehindSceneStorage(MemorySceneStorage(), flush_interval=None)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_scenes_in_buffer(chat_id, user_id, scenes):
+    inner_storage = MemorySceneStorage()
+    storage = WriteBehindSceneStorage(inner_storage, flush_interval=None)
+    await storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
+    assert await inner_storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_scenes_in_storage(chat_id, user_id, scenes):
+    inner_storage = MemorySceneStorage()
+    await inner_storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+    storage = WriteBehindSceneStorage(inner_storage, flush_interval=None)
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+async def test_immutability(chat_id, user_id, scenes):
+    storage = WriteBehindSceneStorage(MemorySceneStorage(), flush_interval=None)
+    await storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+
+    loaded_scenes = await storage.load_scenes(chat_id=chat_id, user_id=user_id)
+    loaded_scenes.clear()
+
+    assert await storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
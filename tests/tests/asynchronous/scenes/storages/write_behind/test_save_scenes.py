@@ -0,0 +1,97 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tgbotscenario.asynchronous import WriteBehindSceneStorage, MemorySceneStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_coalescing(chat_id, user_id):
+    inner_storage = MemorySceneStorage()
+    inner_storage.save_many = AsyncMock(side_effect=inner_storage.save_many)
+    storage = WriteBehindSceneStorage(inner_storage, flush_interval=None)
+
+    await storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+    await storage.save_scenes(["InitialScene"], chat_id=chat_id, user_id=user_id)
+    await storage.flush()
+
+    inner_storage.save_many.assert_awaited_once_with({(chat_id, user_id): ["InitialScene"]})
+
+
+@pytest.mark.asyncio
+async def test_batch_size():
+    inner_storage = MemorySceneStorage()
+    inner_storage.save_many = AsyncMock(side_effect=inner_storage.save_many)
+    storage = WriteBehindSceneStorage(inner_storage, batch_size=3, flush_interval=None)
+
+    for user_id in range(2):
+        await storage.save_scenes(["InitialScene"], chat_id=user_id, user_id=user_id)
+    assert inner_storage.save_many.await_count == 0
+    await storage.save_scenes(["InitialScene"], chat_id=2, user_id=2)
+
+    inner_storage.save_many.assert_awaited_once_with(
+        {(i, i): ["InitialScene"] for i in range(3)}
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_flush_interval(chat_id, user_id):
+    inner_storage = MemorySceneStorage()
+    storage = WriteBehindSceneStorage(inner_storage, flush_interval=0.01)
+
+    await storage.save_scenes(["InitialScene"], chat_id=chat_id, user_id=user_id)
+    await asyncio.sleep(0.05)
+
+    assert await inner_storage.load_scenes(chat_id=chat_id, user_id=user_id) == ["InitialScene"]
+    await storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_immutability(chat_id, user_id):
+    storage = WriteBehindSceneStorage(MemorySceneStorage(), flush_interval=None)
+    saving_scenes = ["InitialScene", "FooScene"]
+
+    await storage.save_scenes(saving_scenes, chat_id=chat_id, user_id=user_id)
+    saving_scenes.clear()
+
+    assert await storage.load_scenes(chat_id=chat_id,
+                                     user_id=user_id) == ["InitialScene", "FooScene"]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch():
+    inner_storage = MemorySceneStorage()
+    error = OSError("storage failed!")
+    inner_storage.save_many = AsyncMock(side_effect=[error, None])
+    storage = WriteBehindSceneStorage(inner_storage, batch_size=2, flush_interval=None)
+
+    await storage.save_scenes(["InitialScene"], chat_id=1, user_id=1)
+    await storage.save_scenes(["InitialScene"], chat_id=2, user_id=2)
+
+    assert storage.failures == 1
+    assert storage.last_error is error
+    assert await storage.load_scenes(chat_id=1, user_id=1) == ["InitialScene"]
+    await storage.flush()
+    assert inner_storage.save_many.await_count == 2
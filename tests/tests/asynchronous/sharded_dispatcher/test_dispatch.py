@@ -0,0 +1,113 @@
+import asyncio
+import os
+
+import pytest
+
+from tgbotscenario.asynchronous import ShardedDispatcher, Machine, Scene, MemorySceneStorage
+from tgbotscenario import errors
+
+
+def trigger(event):
+    pass
+
+
+def make_handler(shard):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    machine = Machine(initial_scene, MemorySceneStorage())
+    machine.add_transition(initial_scene, foo_scene, trigger)
+    machine.add_transition(foo_scene, initial_scene, trigger)
+
+    async def handle(update):
+        chat_id, user_id, number = update
+        await asyncio.sleep(0.01 * (number % 3))  # the later updates would finish earlier
+        await machine.move_to_next_scene(update, trigger, chat_id=chat_id, user_id=user_id)
+        scene = await machine.get_current_scene(chat_id=chat_id, user_id=user_id)
+        return shard, os.getpid(), number, scene.name
+
+    return handle
+
+
+def make_failing_handler(shard):
+    async def handle(update):
+        if update == "exit":
+            os._exit(1)
+        if update == "unpicklable":
+            return lambda: None
+        raise ValueError(update)
+
+    return handle
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    dispatcher = ShardedDispatcher(make_handler, shards=2)
+    dispatcher.start()
+
+    results = await asyncio.gather(*(dispatcher.dispatch((chat_id, user_id, i),
+                                                         chat_id=chat_id, user_id=user_id)
+                                     for i in range(6)))
+    await dispatcher.stop()
+
+    shard = dispatcher.get_shard(chat_id=chat_id, user_id=user_id)
+    assert [i[0] for i in results] == [shard] * 6
+    assert len({i[1] for i in results}) == 1
+    assert results[0][1] != os.getpid()
+    # the updates of the user are handled in order, so the transitions never overlap
+    assert [i[3] for i in results] == ["FooScene", "InitialScene"] * 3
+    assert not dispatcher.running
+
+
+@pytest.mark.asyncio
+async def test_routing():
+    dispatcher = ShardedDispatcher(make_handler, shards=2)
+    dispatcher.start()
+
+    results = await asyncio.gather(*(dispatcher.dispatch((i, i, 0), chat_id=i, user_id=i)
+                                     for i in range(10)))
+    await dispatcher.stop()
+
+    assert [i[0] for i in results] == [dispatcher.get_shard(chat_id=i, user_id=i)
+                                       for i in range(10)]
+    assert len({i[1] for i in results}) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors():
+    dispatcher = ShardedDispatcher(make_failing_handler, shards=1)
+
+    with pytest.raises(errors.ShardWorkerError):
+        await dispatcher.dispatch("update", chat_id=1, user_id=1)
+    dispatcher.start()
+    with pytest.raises(ValueError):
+        await dispatcher.dispatch("update", chat_id=1, user_id=1)
+    with pytest.raises(RuntimeError, match="isn't picklable"):
+        await dispatcher.dispatch("unpicklable", chat_id=1, user_id=1)
+    with pytest.raises(errors.ShardWorkerError):
+        await dispatcher.dispatch("exit", chat_id=1, user_id=1)
+    await dispatcher.stop()
+
+
+@pytest.mark.asyncio
+async def test_stopped_shard():
+    dispatcher = ShardedDispatcher(make_failing_handler, shards=2)
+    dispatcher.start()
+    user_ids = {dispatcher.get_shard(chat_id=i, user_id=i): i for i in range(10)}
+
+    results = await asyncio.gather(
+        dispatcher.dispatch("exit", chat_id=user_ids[0], user_id=user_ids[0]),
+        *(dispatcher.dispatch("update", chat_id=user_ids[1], user_id=user_ids[1])
+          for _ in range(10)),
+        return_exceptions=True
+    )
+    await dispatcher.stop(timeout=5)
+
+    assert isinstance(results[0], errors.ShardWorkerError)
+    assert all(isinstance(i, ValueError) for i in results[1:])
@@ -0,0 +1,36 @@
+import pytest
+
+from tgbotscenario.asynchronous import MemoryLockStorage
+from tgbotscenario import errors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    storage = MemoryLockStorage()
+
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+
+    assert await storage.check_lock(chat_id=chat_id, user_id=user_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_lock_exists(chat_id, user_id):
+    storage = MemoryLockStorage()
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+
+    with pytest.raises(errors.LockExistsError):
+        await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
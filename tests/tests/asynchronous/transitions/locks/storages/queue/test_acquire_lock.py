@@ -0,0 +1,115 @@
+import asyncio
+
+import pytest
+
+from tgbotscenario.asynchronous import QueueLockStorage
+from tgbotscenario import errors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    storage = QueueLockStorage()
+
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+
+    assert await storage.check_lock(chat_id=chat_id, user_id=user_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_waiting(chat_id, user_id):
+    storage = QueueLockStorage()
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    task = asyncio.create_task(storage.acquire_lock(chat_id=chat_id, user_id=user_id))
+    await asyncio.sleep(0)
+
+    assert not task.done()
+    await storage.release_lock(chat_id=chat_id, user_id=user_id)
+    await task
+    assert await storage.check_lock(chat_id=chat_id, user_id=user_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_waiting_order(chat_id, user_id):
+    storage = QueueLockStorage()
+    order = []
+
+    async def acquire(number):
+        await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+        order.append(number)
+        await asyncio.sleep(0)
+        await storage.release_lock(chat_id=chat_id, user_id=user_id)
+
+    await asyncio.gather(*(acquire(i) for i in range(5)))
+
+    assert order == list(range(5))
+    assert not await storage.check_lock(chat_id=chat_id, user_id=user_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_timeout(chat_id, user_id):
+    storage = QueueLockStorage(timeout=0.01)
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+
+    with pytest.raises(errors.LockWaitingTimeoutError):
+        await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    await storage.release_lock(chat_id=chat_id, user_id=user_id)
+    assert not await storage.check_lock(chat_id=chat_id, user_id=user_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("queue_size",),
+    (
+        (0,),
+        (2,)
+    )
+)
+async def test_queue_overflow(chat_id, user_id, queue_size):
+    storage = QueueLockStorage(queue_size=queue_size)
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    tasks = [asyncio.create_task(storage.acquire_lock(chat_id=chat_id, user_id=user_id))
+             for _ in range(queue_size)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(errors.LockQueueOverflowError):
+        await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    for task in tasks:
+        await storage.release_lock(chat_id=chat_id, user_id=user_id)
+        await task
+    await storage.release_lock(chat_id=chat_id, user_id=user_id)
+    assert not await storage.check_lock(chat_id=chat_id, user_id=user_id)
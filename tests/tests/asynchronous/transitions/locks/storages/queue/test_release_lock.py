@@ -0,0 +1,20 @@
+import pytest
+
+from tgbotscenario.asynchronous import QueueLockStorage
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id):
+    storage = QueueLockStorage()
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+
+    await storage.release_lock(chat_id=chat_id, user_id=user_id)
+
+    assert not await storage.check_lock(chat_id=chat_id, user_id=user_id)
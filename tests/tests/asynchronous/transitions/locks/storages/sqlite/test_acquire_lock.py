@@ -0,0 +1,135 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from tgbotscenario.asynchronous import SQLiteLockStorage
+from tgbotscenario import errors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id, tmp_path):
+    storage = SQLiteLockStorage(str(tmp_path / "locks.sqlite3"))
+
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+
+    assert await storage.check_lock(chat_id=chat_id, user_id=user_id)
+    await storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_lock_exists(chat_id, user_id, tmp_path):
+    # the storages share the file only, as if they were run by different processes
+    path = str(tmp_path / "locks.sqlite3")
+    storage = SQLiteLockStorage(path)
+    another_storage = SQLiteLockStorage(path)
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+
+    with pytest.raises(errors.LockExistsError):
+        await another_storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    assert await another_storage.check_lock(chat_id=chat_id, user_id=user_id)
+    await storage.close()
+    await another_storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_waiting(chat_id, user_id, tmp_path):
+    path = str(tmp_path / "locks.sqlite3")
+    storage = SQLiteLockStorage(path)
+    another_storage = SQLiteLockStorage(path, timeout=None, poll_interval=0.01)
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    task = asyncio.create_task(another_storage.acquire_lock(chat_id=chat_id, user_id=user_id))
+    await asyncio.sleep(0.03)
+
+    assert not task.done()
+    await storage.release_lock(chat_id=chat_id, user_id=user_id)
+    await task
+    await another_storage.release_lock(chat_id=chat_id, user_id=user_id)
+    assert not await storage.check_lock(chat_id=chat_id, user_id=user_id)
+    await storage.close()
+    await another_storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_waiting_timeout(chat_id, user_id, tmp_path):
+    path = str(tmp_path / "locks.sqlite3")
+    storage = SQLiteLockStorage(path)
+    another_storage = SQLiteLockStorage(path, timeout=0.03, poll_interval=0.01)
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+
+    with pytest.raises(errors.LockWaitingTimeoutError):
+        await another_storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    await storage.close()
+    await another_storage.close()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_expired_lease(chat_id, user_id, tmp_path):
+    path = str(tmp_path / "locks.sqlite3")
+    crashed_storage = SQLiteLockStorage(path, lease=0.01)
+    storage = SQLiteLockStorage(path)
+    await crashed_storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    await crashed_storage.close()
+    await asyncio.sleep(0.02)
+
+    assert not await storage.check_lock(chat_id=chat_id, user_id=user_id)
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    assert await storage.check_lock(chat_id=chat_id, user_id=user_id)
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_acquiring(tmp_path):
+    path = str(tmp_path / "locks.sqlite3")
+    storage = SQLiteLockStorage(path)
+    await storage.check_lock(chat_id=1, user_id=1)
+    # the acquiring waits in the storage thread while another process writes
+    connection = sqlite3.connect(path, isolation_level=None)
+    connection.execute("BEGIN IMMEDIATE")
+    acquiring = asyncio.ensure_future(storage.acquire_lock(chat_id=1, user_id=1))
+    await asyncio.sleep(0.05)
+
+    acquiring.cancel()
+    connection.execute("COMMIT")
+    connection.close()
+    with pytest.raises(asyncio.CancelledError):
+        await acquiring
+    await asyncio.sleep(0.05)
+
+    assert not await storage.check_lock(chat_id=1, user_id=1)
+    await storage.close()
@@ -0,0 +1,59 @@
+import asyncio
+import sqlite3
+
+import pytest
+
+from tgbotscenario.asynchronous import SQLiteLockStorage
+from tgbotscenario import errors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+async def test_behavior(chat_id, user_id, tmp_path):
+    storage = SQLiteLockStorage(str(tmp_path / "locks.sqlite3"))
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+
+    await storage.release_lock(chat_id=chat_id, user_id=user_id)
+
+    assert not await storage.check_lock(chat_id=chat_id, user_id=user_id)
+    await storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    await storage.close()
+
+
+@pytest.mark.asyncio
+async def test_renewed_lease(tmp_path):
+    path = str(tmp_path / "locks.sqlite3")
+    storage = SQLiteLockStorage(path, lease=0.1)
+    other_storage = SQLiteLockStorage(path)
+    await storage.acquire_lock(chat_id=1, user_id=1)
+    await asyncio.sleep(0.3)
+
+    with pytest.raises(errors.LockExistsError):
+        await other_storage.acquire_lock(chat_id=1, user_id=1)
+    await storage.release_lock(chat_id=1, user_id=1)
+    await storage.close()
+    await other_storage.close()
+
+
+@pytest.mark.asyncio
+async def test_lost_lock(tmp_path):
+    path = str(tmp_path / "locks.sqlite3")
+    storage = SQLiteLockStorage(path)
+    await storage.acquire_lock(chat_id=1, user_id=1)
+    connection = sqlite3.connect(path)
+    connection.execute("DELETE FROM locks")
+    connection.commit()
+    connection.close()
+
+    await storage.release_lock(chat_id=1, user_id=1)
+
+    assert storage.lost_locks == 1
+    assert isinstance(storage.last_lost_lock, errors.LockLostError)
+    assert isinstance(storage.last_lost_lock, errors.LockExistsError)
+    await storage.close()
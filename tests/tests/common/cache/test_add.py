@@ -0,0 +1,18 @@
+from tgbotscenario.common import LRUCache
+
+
+def test_behavior():
+    cache = LRUCache()
+
+    cache.add("foo", ["FooScene"])
+
+    assert cache.get("foo") == ["FooScene"]
+
+
+def test_key_exists():
+    cache = LRUCache()
+    cache.set("foo", ["FooScene"])
+
+    cache.add("foo", ["BarScene"])
+
+    assert cache.get("foo") == ["FooScene"]
@@ -0,0 +1,30 @@
+import time
+
+from tgbotscenario.common import LRUCache
+
+
+def test_behavior():
+    cache = LRUCache()
+    cache.set("foo", ["FooScene"])
+
+    assert cache.get("foo") == ["FooScene"]
+    assert cache.hits == 1
+    assert cache.misses == 0
+
+
+def test_missing_key():
+    cache = LRUCache()
+
+    assert cache.get("foo") is None
+    assert cache.hits == 0
+    assert cache.misses == 1
+
+
+def test_expiration():
+    cache = LRUCache(ttl=0.01)
+    cache.set("foo", ["FooScene"])
+    time.sleep(0.02)
+
+    assert cache.get("foo") is None
+    assert "foo" not in cache
+    assert cache.misses == 1
@@ -0,0 +1,19 @@
+from tgbotscenario.common import LRUCache
+
+
+def test_behavior():
+    cache = LRUCache()
+    cache.set("foo", ["FooScene"])
+
+    cache.remove("foo")
+
+    assert "foo" not in cache
+    assert cache.bytes == 0
+
+
+def test_missing_key():
+    cache = LRUCache()
+
+    cache.remove("foo")
+
+    assert len(cache) == 0
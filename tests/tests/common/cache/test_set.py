@@ -0,0 +1,59 @@
+import sys
+
+from tgbotscenario.common import LRUCache
+
+
+def test_behavior():
+    cache = LRUCache()
+
+    cache.set("foo", ["FooScene"])
+
+    assert "foo" in cache
+    assert cache.bytes == sys.getsizeof("foo") + sys.getsizeof(["FooScene"])
+
+
+def test_overwriting():
+    cache = LRUCache()
+    cache.set("foo", ["FooScene"])
+
+    cache.set("foo", ["FooScene", "BarScene"])
+
+    assert cache.get("foo") == ["FooScene", "BarScene"]
+    assert len(cache) == 1
+    assert cache.bytes == sys.getsizeof("foo") + sys.getsizeof(["FooScene", "BarScene"])
+
+
+def test_max_size():
+    cache = LRUCache(max_size=2)
+    cache.set("foo", ["FooScene"])
+    cache.set("bar", ["BarScene"])
+    cache.get("foo")
+
+    cache.set("baz", ["BazScene"])
+
+    assert "foo" in cache
+    assert "bar" not in cache
+    assert "baz" in cache
+    assert cache.evictions == 1
+
+
+def test_max_bytes():
+    size = sys.getsizeof("foo") + sys.getsizeof(["FooScene"])
+    cache = LRUCache(max_bytes=size * 2)
+    cache.set("foo", ["FooScene"])
+    cache.set("bar", ["BarScene"])
+
+    cache.set("baz", ["BazScene"])
+
+    assert "foo" not in cache
+    assert len(cache) == 2
+    assert cache.bytes <= size * 2
+
+
+def test_too_large_value():
+    cache = LRUCache(max_bytes=1)
+
+    cache.set("foo", ["FooScene"])
+
+    assert "foo" not in cache
+    assert cache.bytes == 0
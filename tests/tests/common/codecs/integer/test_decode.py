@@ -0,0 +1,42 @@
+import pytest
+
+from tgbotscenario.common import SceneRegistry, IntegerSceneCodec
+from tgbotscenario import errors
+
+
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        ([],),
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],),
+        ([f"Scene{i}" for i in range(300)],)
+    )
+)
+def test_behavior(scenes):
+    codec = IntegerSceneCodec(SceneRegistry())
+
+    assert codec.decode(codec.encode(scenes)) == scenes
+
+
+def test_unknown_id():
+    codec = IntegerSceneCodec(SceneRegistry())
+
+    with pytest.raises(errors.UnknownSceneIdError):
+        codec.decode(b"\x01\x00")
+
+
+@pytest.mark.parametrize(
+    ("data",),
+    (
+        (b"\x03\x00",),
+        (b"I\x00n\x00",),
+        (b"\x02\x00\x00\x01",)
+    )
+)
+def test_corrupted_data(data):
+    codec = IntegerSceneCodec(SceneRegistry())
+    codec.encode(["InitialScene", "FooScene"])
+
+    with pytest.raises(errors.SceneDecodingError):
+        codec.decode(data)
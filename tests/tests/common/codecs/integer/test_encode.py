@@ -0,0 +1,35 @@
+import pytest
+
+from tgbotscenario.common import SceneRegistry, IntegerSceneCodec
+from tgbotscenario import errors
+
+
+@pytest.mark.parametrize(
+    ("scenes", "data"),
+    (
+        ([], b""),
+        (["InitialScene"], b"\x01\x00"),
+        (["InitialScene", "FooScene"], b"\x01\x00\x01")
+    )
+)
+def test_behavior(scenes, data):
+    codec = IntegerSceneCodec(SceneRegistry())
+
+    assert codec.encode(scenes) == data
+
+
+def test_wide_ids():
+    registry = SceneRegistry()
+    registry.register(*(f"Scene{i}" for i in range(300)))
+    codec = IntegerSceneCodec(registry)
+
+    assert codec.encode(["Scene0", "Scene299"]) == b"\x02\x00\x00\x2b\x01"
+
+
+def test_id_overflow():
+    registry = SceneRegistry()
+    registry.register(*(f"Scene{i}" for i in range(IntegerSceneCodec.MAX_SCENE_ID + 2)))
+    codec = IntegerSceneCodec(registry)
+
+    with pytest.raises(errors.SceneIdOverflowError):
+        codec.encode(["Scene0", f"Scene{IntegerSceneCodec.MAX_SCENE_ID + 1}"])
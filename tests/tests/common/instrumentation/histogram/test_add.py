@@ -0,0 +1,30 @@
+from tgbotscenario.common import Histogram
+
+
+def test_behavior():
+    histogram = Histogram()
+    for value in (0.0005, 0.001, 0.0015):
+        histogram.add(value)
+
+    assert histogram.count == 3
+    assert histogram.total == 0.003
+    assert histogram.min == 0.0005
+    assert histogram.max == 0.0015
+    assert histogram.mean == 0.001
+    assert sum(count for _, count in histogram.buckets) == 3
+
+
+def test_empty():
+    histogram = Histogram()
+
+    assert histogram.count == 0
+    assert histogram.min is None
+    assert histogram.max is None
+    assert histogram.mean is None
+
+
+def test_overflow():
+    histogram = Histogram()
+    histogram.add(60.0)
+
+    assert histogram.buckets[-1] == (float("inf"), 1)
@@ -0,0 +1,32 @@
+import pytest
+
+from tgbotscenario.common import Histogram
+
+
+@pytest.mark.parametrize(
+    ("percentile", "expected"),
+    (
+        (50, 0.000128),
+        (99, 0.05),
+        (100, 0.05)
+    )
+)
+def test_behavior(percentile, expected):
+    histogram = Histogram()
+    for _ in range(98):
+        histogram.add(0.0001)
+    for _ in range(2):
+        histogram.add(0.05)
+
+    assert histogram.get_percentile(percentile) == pytest.approx(expected)
+
+
+def test_empty():
+    assert Histogram().get_percentile(50) is None
+
+
+def test_overflow():
+    histogram = Histogram()
+    histogram.add(60.0)
+
+    assert histogram.get_percentile(99) == 60.0
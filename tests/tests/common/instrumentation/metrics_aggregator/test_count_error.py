@@ -0,0 +1,11 @@
+from tgbotscenario.common import MetricsAggregator
+from tgbotscenario import errors
+
+
+def test_behavior():
+    aggregator = MetricsAggregator()
+    aggregator.count_error(errors.LockExistsError("lock exists!", chat_id=1, user_id=1))
+    aggregator.count_error(errors.LockExistsError("lock exists!", chat_id=1, user_id=1))
+    aggregator.count_error(errors.SceneNotFoundError("scene not found!", scene="FooScene"))
+
+    assert aggregator.errors == {"LockExistsError": 2, "SceneNotFoundError": 1}
@@ -0,0 +1,30 @@
+from tgbotscenario.common import MetricsAggregator
+
+
+def test_behavior():
+    def trigger():
+        pass
+
+    aggregator = MetricsAggregator()
+    aggregator.observe_phase("enter", 0.001, scene="FooScene", trigger=trigger)
+    aggregator.observe_phase("enter", 0.003, scene="BarScene")
+    aggregator.observe_phase("lock", 0.002)
+
+    assert aggregator.get_histogram("enter").count == 2
+    assert aggregator.get_histogram("lock").count == 1
+    assert aggregator.get_histogram("save") is None
+    assert aggregator.get_scene_histogram("enter", "FooScene").total == 0.001
+    assert aggregator.get_scene_histogram("enter", "BarScene").total == 0.003
+    assert aggregator.get_trigger_histogram("enter", trigger).count == 1
+    assert aggregator.get_trigger_histogram("lock", trigger) is None
+
+
+def test_reset():
+    aggregator = MetricsAggregator()
+    aggregator.observe_phase("enter", 0.001, scene="FooScene")
+    aggregator.count_error(ValueError())
+    aggregator.reset()
+
+    assert aggregator.get_histogram("enter") is None
+    assert aggregator.get_scene_histogram("enter", "FooScene") is None
+    assert aggregator.errors == {}
@@ -0,0 +1,24 @@
+import pytest
+
+from tgbotscenario.common.keys import pack_key, unpack_key
+
+
+def test_private_chat():
+    assert pack_key(123456789, 123456789) == 123456789
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, -100123456789),
+        (-1, 1),
+        (123456789, 123456789)
+    )
+)
+def test_unpacking(chat_id, user_id):
+    assert unpack_key(pack_key(chat_id, user_id)) == (chat_id, user_id)
+
+
+def test_uniqueness():
+    assert pack_key(-100123456789, 123456789) != pack_key(123456789, -100123456789)
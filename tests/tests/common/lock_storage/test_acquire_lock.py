@@ -0,0 +1,62 @@
+import threading
+
+import pytest
+
+from tgbotscenario.common.transitions.locks.storage import LockStorage, StripedLockStorage
+
+
+@pytest.mark.parametrize(
+    ("storage_factory",),
+    (
+        (LockStorage,),
+        (StripedLockStorage,)
+    )
+)
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+def test_behavior(storage_factory, chat_id, user_id):
+    storage = storage_factory()
+
+    assert storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    assert not storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    assert storage.check_lock(chat_id=chat_id, user_id=user_id)
+    assert len(storage) == 1
+
+
+@pytest.mark.parametrize(
+    ("storage_factory",),
+    (
+        (LockStorage,),
+        (StripedLockStorage,)
+    )
+)
+def test_separate_chats(storage_factory):
+    storage = storage_factory()
+    storage.acquire_lock(chat_id=123456789, user_id=123456789)
+
+    assert not storage.check_lock(chat_id=-100123456789, user_id=123456789)
+    assert storage.acquire_lock(chat_id=-100123456789, user_id=123456789)
+    assert len(storage) == 2
+
+
+def test_threads():
+    storage = StripedLockStorage(stripes=4)
+    acquisitions = []
+
+    def acquire():
+        for user_id in range(1000):
+            if storage.acquire_lock(chat_id=user_id, user_id=user_id):
+                acquisitions.append(user_id)
+
+    threads = [threading.Thread(target=acquire) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(acquisitions) == list(range(1000))
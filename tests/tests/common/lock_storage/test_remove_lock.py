@@ -0,0 +1,41 @@
+import pytest
+
+from tgbotscenario.common.transitions.locks.storage import LockStorage, StripedLockStorage
+
+
+@pytest.mark.parametrize(
+    ("storage_factory",),
+    (
+        (LockStorage,),
+        (StripedLockStorage,)
+    )
+)
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+def test_behavior(storage_factory, chat_id, user_id):
+    storage = storage_factory()
+    storage.add_lock(chat_id=chat_id, user_id=user_id)
+
+    storage.remove_lock(chat_id=chat_id, user_id=user_id)
+
+    assert not storage.check_lock(chat_id=chat_id, user_id=user_id)
+    assert len(storage) == 0
+
+
+@pytest.mark.parametrize(
+    ("storage_factory",),
+    (
+        (LockStorage,),
+        (StripedLockStorage,)
+    )
+)
+def test_missing_lock(storage_factory):
+    storage = storage_factory()
+
+    with pytest.raises(KeyError):
+        storage.remove_lock(chat_id=123456789, user_id=123456789)
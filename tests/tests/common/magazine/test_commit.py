@@ -0,0 +1,36 @@
+from tgbotscenario.common.magazine import Magazine
+
+
+def test_behavior():
+    magazine = Magazine(["InitialScene"])
+    magazine.set("FooScene")
+
+    magazine.commit()
+
+    assert not magazine.changed
+
+
+def test_changes():
+    magazine = Magazine(["InitialScene", "FooScene"])
+
+    assert not magazine.changed
+    magazine.set("FooScene")
+    assert not magazine.changed
+    magazine.set("InitialScene")
+    assert magazine.changed
+    assert magazine.version == 1
+
+
+def test_trimmed_items():
+    magazine = Magazine(["InitialScene", "FooScene", "BarScene"], max_depth=2)
+
+    assert magazine.changed
+
+
+def test_storage_version():
+    magazine = Magazine(["InitialScene"], storage_version=3)
+    magazine.set("FooScene")
+
+    magazine.commit(4)
+
+    assert magazine.storage_version == 4
@@ -0,0 +1,58 @@
+from tgbotscenario.common.magazine import Magazine
+
+
+def test_unchanged_items():
+    magazine = Magazine(["InitialScene", "FooScene"])
+
+    assert magazine.get_delta() == (None, [])
+
+
+def test_appended_items():
+    magazine = Magazine(["InitialScene"])
+
+    magazine.set("FooScene")
+    magazine.set("BarScene")
+
+    assert magazine.get_delta() == (None, ["FooScene", "BarScene"])
+
+
+def test_truncated_items():
+    magazine = Magazine(["InitialScene", "FooScene", "BarScene"])
+
+    magazine.set("FooScene")
+
+    assert magazine.get_delta() == (2, [])
+
+
+def test_truncated_and_appended_items():
+    magazine = Magazine(["InitialScene", "FooScene", "BarScene"])
+
+    magazine.set("InitialScene")
+    magazine.set("BazScene")
+
+    assert magazine.get_delta() == (1, ["BazScene"])
+
+
+def test_evicted_items():
+    magazine = Magazine(["InitialScene", "FooScene", "BarScene"], max_depth=3)
+
+    magazine.set("BazScene")
+
+    assert magazine.get_delta() == (1, ["BarScene", "BazScene"])
+
+
+def test_items_are_not_stored():
+    magazine = Magazine(["InitialScene"], stored_length=0)
+
+    magazine.set("FooScene")
+
+    assert magazine.get_delta() == (None, ["InitialScene", "FooScene"])
+
+
+def test_committed_items():
+    magazine = Magazine(["InitialScene"])
+    magazine.set("FooScene")
+
+    magazine.commit()
+
+    assert magazine.get_delta() == (None, [])
@@ -0,0 +1,43 @@
+import pytest
+
+from tgbotscenario.common.magazine import Magazine
+from tgbotscenario import errors
+
+
+def test_behavior():
+    magazine = Magazine(["InitialScene", "FooScene"])
+
+    assert magazine == ["InitialScene", "FooScene"]
+
+
+def test_empty_items():
+    with pytest.raises(errors.MagazineInitializationError):
+        Magazine([])
+
+
+@pytest.mark.parametrize(
+    ("max_depth",),
+    (
+        (0,),
+        (1,)
+    )
+)
+def test_too_small_max_depth(max_depth):
+    with pytest.raises(errors.MagazineInitializationError):
+        Magazine(["InitialScene"], max_depth)
+
+
+def test_items_over_max_depth():
+    magazine = Magazine(["InitialScene", "FooScene", "BarScene", "BazScene"], max_depth=3)
+
+    assert magazine == ["InitialScene", "BarScene", "BazScene"]
+
+
+def test_duplicate_items():
+    magazine = Magazine(["InitialScene", "FooScene", "BarScene", "BazScene", "BarScene",
+                         "QuxScene"])
+
+    # the repeated item is a return to it
+    assert magazine == ["InitialScene", "FooScene", "BarScene", "QuxScene"]
+    assert magazine.changed
+    assert magazine.get_delta() == (3, ["QuxScene"])
@@ -0,0 +1,45 @@
+import pytest
+
+from tgbotscenario.common.magazine import Magazine
+from tgbotscenario import errors
+
+
+def test_behavior():
+    magazine = Magazine(["InitialScene", "FooScene"])
+    magazine.set("BarScene")
+    magazine.commit()
+
+    magazine.restore(["InitialScene", "FooScene"])
+
+    assert magazine == ["InitialScene", "FooScene"]
+    assert magazine.current == "FooScene"
+    assert magazine.changed
+    assert magazine.get_delta() == (2, [])
+
+
+def test_truncated_items():
+    magazine = Magazine(["InitialScene", "FooScene", "BarScene"])
+    magazine.set("FooScene")
+    magazine.commit()
+
+    magazine.restore(["InitialScene", "FooScene", "BarScene"])
+
+    assert magazine.previous == "FooScene"
+    assert magazine.get_delta() == (None, ["BarScene"])
+    magazine.set("FooScene")
+    assert magazine == ["InitialScene", "FooScene"]
+
+
+def test_same_items():
+    magazine = Magazine(["InitialScene", "FooScene"])
+
+    magazine.restore(["InitialScene", "FooScene"])
+
+    assert not magazine.changed
+
+
+def test_empty_items():
+    magazine = Magazine(["InitialScene"])
+
+    with pytest.raises(errors.MagazineInitializationError):
+        magazine.restore([])
@@ -0,0 +1,67 @@
+from tgbotscenario.common.magazine import Magazine
+
+
+def test_new_item():
+    magazine = Magazine(["InitialScene"])
+
+    magazine.set("FooScene")
+
+    assert magazine == ["InitialScene", "FooScene"]
+    assert magazine.current == "FooScene"
+    assert magazine.previous == "InitialScene"
+
+
+def test_existing_item():
+    magazine = Magazine(["InitialScene", "FooScene", "BarScene"])
+
+    magazine.set("FooScene")
+    magazine.set("BarScene")
+
+    assert magazine == ["InitialScene", "FooScene", "BarScene"]
+
+
+def test_current_item():
+    magazine = Magazine(["InitialScene", "FooScene"])
+
+    magazine.set("FooScene")
+
+    assert magazine == ["InitialScene", "FooScene"]
+
+
+def test_max_depth():
+    magazine = Magazine(["InitialScene", "FooScene", "BarScene"], max_depth=3)
+
+    magazine.set("BazScene")
+    magazine.set("FooScene")
+
+    assert magazine == ["InitialScene", "BazScene", "FooScene"]
+    assert len(magazine) == 3
+
+
+def test_duplicate_items():
+    magazine = Magazine(["InitialScene", "FooScene", "InitialScene", "BarScene"])
+
+    magazine.set("FooScene")
+    magazine.set("InitialScene")
+
+    assert magazine == ["InitialScene"]
+
+
+def test_duplicate_removed_items():
+    magazine = Magazine(["InitialScene", "FooScene", "BarScene", "BazScene", "BarScene"])
+
+    magazine.set("FooScene")
+    magazine.set("BarScene")
+
+    assert magazine == ["InitialScene", "FooScene", "BarScene"]
+
+
+def test_evicted_items():
+    magazine = Magazine(["InitialScene"], max_depth=3)
+
+    for i in range(10):
+        magazine.set(f"Scene{i}")
+    magazine.set("Scene8")
+    magazine.set("Scene7")
+
+    assert magazine == ["InitialScene", "Scene8", "Scene7"]
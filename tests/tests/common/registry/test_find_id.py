@@ -0,0 +1,13 @@
+from tgbotscenario.common import SceneRegistry
+
+
+def test_behavior(tmp_path):
+    path = str(tmp_path / "registry.json")
+    registry = SceneRegistry(path)
+    registry.register("InitialScene")
+    SceneRegistry(path).register("FooScene")
+
+    assert registry.find_id("InitialScene") == 0
+    assert registry.find_id("FooScene") == 1
+    assert registry.find_id("BarScene") is None
+    assert len(registry) == 2
@@ -0,0 +1,55 @@
+import pytest
+
+from tgbotscenario.common import SceneRegistry
+from tgbotscenario import errors
+
+
+def test_behavior():
+    registry = SceneRegistry()
+
+    assert registry.get_id("InitialScene") == 0
+    assert registry.get_id("FooScene") == 1
+    assert registry.get_id("InitialScene") == 0
+    assert registry.revision == 2
+
+
+def test_persistence(tmp_path):
+    path = str(tmp_path / "registry.json")
+    registry = SceneRegistry(path)
+    registry.register("InitialScene", "FooScene")
+
+    registry = SceneRegistry(path)
+
+    assert registry.get_id("FooScene") == 1
+    assert registry.get_id("BarScene") == 2
+    assert registry.revision == 3
+
+
+def test_unsupported_version(tmp_path):
+    path = tmp_path / "registry.json"
+    path.write_text('{"version": 0, "revision": 0, "scenes": []}')
+
+    with pytest.raises(errors.SceneRegistryVersionError):
+        SceneRegistry(str(path))
+
+
+def test_shared_file(tmp_path):
+    path = str(tmp_path / "registry.json")
+    registry = SceneRegistry(path)
+    other_registry = SceneRegistry(path)
+
+    assert registry.get_id("InitialScene") == 0
+    assert other_registry.get_id("FooScene") == 1
+    assert registry.get_id("BarScene") == 2
+    assert other_registry.get_name(2) == "BarScene"
+    assert registry.get_name(1) == "FooScene"
+
+
+def test_conflicting_file(tmp_path):
+    path = tmp_path / "registry.json"
+    registry = SceneRegistry(str(path))
+    registry.register("InitialScene")
+    path.write_text('{"version": 1, "revision": 1, "scenes": ["FooScene"]}')
+
+    with pytest.raises(errors.SceneRegistryConflictError):
+        registry.get_id("BarScene")
@@ -0,0 +1,18 @@
+import pytest
+
+from tgbotscenario.common import SceneRegistry
+from tgbotscenario import errors
+
+
+def test_behavior():
+    registry = SceneRegistry()
+    registry.register("InitialScene", "FooScene")
+
+    assert registry.get_name(1) == "FooScene"
+
+
+def test_unknown_id():
+    registry = SceneRegistry()
+
+    with pytest.raises(errors.UnknownSceneIdError):
+        registry.get_name(0)
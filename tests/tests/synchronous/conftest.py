@@ -0,0 +1,18 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from tgbotscenario.synchronous import Scene
+
+
+@pytest.fixture()
+def scene_mock_factory():
+    def factory(scene: Scene) -> MagicMock:
+        mock = MagicMock(scene)
+        mock.name = scene.name
+        mock.process_enter.side_effect = scene.process_enter
+        mock.process_exit.side_effect = scene.process_exit
+
+        return mock
+
+    return factory
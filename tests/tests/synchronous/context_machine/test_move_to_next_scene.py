@@ -0,0 +1,36 @@
+import pytest
+
+from tgbotscenario.synchronous import Machine, ContextMachine, Scene, MemorySceneStorage
+from tgbotscenario.common import Context
+from tests.context import (ContextVarsContext, chat_id_context, user_id_context,
+                           trigger_context, event_context)
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("direction",),
+    (
+        (None,),
+        ("test_direction",)
+    )
+)
+def test_behavior(chat_id, user_id, direction, event, trigger, scene_mock_factory):
+    source_scene = scene_mock_factory(Scene("InitialScene"))
+    destination_scene = scene_mock_factory(Scene("FooScene"))
+    machine = Machine(source_scene, MemorySceneStorage())
+    machine.add_transition(source_scene, destination_scene, trigger, direction)
+    context = Context(chat_id_context, user_id_context, trigger_context, event_context)
+    context_machine = ContextMachine(machine, context)
+
+    with ContextVarsContext(chat_id, user_id, trigger, event):
+        context_machine.move_to_next_scene(direction)
+
+    assert machine.get_current_scene(chat_id=chat_id, user_id=user_id) is destination_scene
+    source_scene.process_exit.assert_called_once_with(event, None)
+    destination_scene.process_enter.assert_called_once_with(event, None)
@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from tgbotscenario.synchronous import Machine, Scene, MemorySceneStorage
+from tgbotscenario import errors
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("direction",),
+    (
+        (None,),
+        ("test_direction",)
+    )
+)
+@pytest.mark.parametrize(
+    ("data",),
+    (
+        (None,),
+        ({"test_key": "test_value"},)
+    )
+)
+def test_behavior(chat_id, user_id, direction, data, event, trigger, scene_mock_factory):
+    source_scene = scene_mock_factory(Scene("InitialScene"))
+    destination_scene = scene_mock_factory(Scene("FooScene"))
+    machine = Machine(source_scene, MemorySceneStorage())
+    machine.add_transition(source_scene, destination_scene, trigger, direction)
+
+    machine.move_to_next_scene(event, trigger, direction, data, chat_id=chat_id, user_id=user_id)
+
+    assert machine.get_current_scene(chat_id=chat_id, user_id=user_id) is destination_scene
+    source_scene.process_exit.assert_called_once_with(event, data)
+    destination_scene.process_enter.assert_called_once_with(event, data)
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+def test_unknown_scene_in_storage(chat_id, user_id, event, trigger):
+    storage = MemorySceneStorage()
+    storage.save_scenes(["InitialScene", "UnknownScene"], chat_id=chat_id, user_id=user_id)
+    machine = Machine(Scene("InitialScene"), storage)
+
+    with pytest.raises(errors.UnknownSceneError):
+        machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+def test_next_scene_is_not_set(chat_id, user_id, event, trigger):
+    machine = Machine(Scene("InitialScene"), MemorySceneStorage())
+
+    with pytest.raises(errors.TransitionToNextSceneError):
+        machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+def test_double_transition(chat_id, user_id, event, trigger, scene_mock_factory):
+    exit_started = threading.Event()
+    exit_allowed = threading.Event()
+
+    class SourceScene(Scene):
+        def process_exit(self, event, data) -> None:
+            exit_started.set()
+            exit_allowed.wait(1)
+
+    source_scene = scene_mock_factory(SourceScene())
+    destination_scene = scene_mock_factory(Scene("FooScene"))
+    machine = Machine(source_scene, MemorySceneStorage())
+    machine.add_transition(source_scene, destination_scene, trigger)
+    thread = threading.Thread(target=machine.move_to_next_scene, args=(event, trigger),
+                              kwargs={"chat_id": chat_id, "user_id": user_id})
+    thread.start()
+    exit_started.wait(1)
+
+    with pytest.raises(errors.DoubleTransitionError):
+        machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+    exit_allowed.set()
+    thread.join()
+    source_scene.process_exit.assert_called_once_with(event, None)
+    destination_scene.process_enter.assert_called_once_with(event, None)
+
+
+def test_threads(event, trigger):
+    initial_scene = Scene("InitialScene")
+    foo_scene = Scene("FooScene")
+    machine = Machine(initial_scene, MemorySceneStorage())
+    machine.add_transition(initial_scene, foo_scene, trigger)
+
+    def move(first_user_id):
+        for user_id in range(first_user_id, first_user_id + 100):
+            machine.move_to_next_scene(event, trigger, chat_id=user_id, user_id=user_id)
+
+    threads = [threading.Thread(target=move, args=(i * 100,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    scenes = machine.get_current_scenes([(i, i) for i in range(400)])
+    assert set(scenes.values()) == {foo_scene}
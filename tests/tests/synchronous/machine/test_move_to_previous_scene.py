@@ -0,0 +1,47 @@
+import pytest
+
+from tgbotscenario.synchronous import Machine, Scene, MemorySceneStorage
+from tgbotscenario.common import LRUCache
+from tgbotscenario import errors
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("data",),
+    (
+        (None,),
+        ({"test_key": "test_value"},)
+    )
+)
+def test_behavior(chat_id, user_id, data, event, trigger, scene_mock_factory):
+    initial_scene = scene_mock_factory(Scene("InitialScene"))
+    foo_scene = scene_mock_factory(Scene("FooScene"))
+    machine = Machine(initial_scene, MemorySceneStorage(), magazine_cache=LRUCache())
+    machine.add_transition(initial_scene, foo_scene, trigger)
+    machine.move_to_next_scene(event, trigger, chat_id=chat_id, user_id=user_id)
+
+    machine.move_to_previous_scene(event, data, chat_id=chat_id, user_id=user_id)
+
+    assert machine.get_current_scene(chat_id=chat_id, user_id=user_id) is initial_scene
+    foo_scene.process_exit.assert_called_once_with(event, data)
+    initial_scene.process_enter.assert_called_once_with(event, data)
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+def test_initial_scene(chat_id, user_id, event):
+    machine = Machine(Scene("InitialScene"), MemorySceneStorage())
+
+    with pytest.raises(errors.TransitionToPreviousSceneError):
+        machine.move_to_previous_scene(event, chat_id=chat_id, user_id=user_id)
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+from tgbotscenario.synchronous import Machine, Scene, MemorySceneStorage
+from tgbotscenario import errors
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+def test_behavior(chat_id, user_id, event, trigger, scene_mock_factory):
+    initial_scene = Scene("InitialScene")
+    foo_scene = scene_mock_factory(Scene("FooScene"))
+    storage = MemorySceneStorage()
+    machine = Machine(initial_scene, storage)
+    machine.add_transition(initial_scene, foo_scene, trigger)
+
+    machine.set_current_scene(foo_scene, event, chat_id=chat_id, user_id=user_id)
+
+    assert storage.load_scenes(chat_id=chat_id, user_id=user_id) == ["InitialScene", "FooScene"]
+    foo_scene.process_enter.assert_called_once_with(event, None)
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+def test_unknown_scene(chat_id, user_id, event):
+    machine = Machine(Scene("InitialScene"), MemorySceneStorage())
+
+    with pytest.raises(errors.SceneSettingError):
+        machine.set_current_scene(Scene("FooScene"), event, chat_id=chat_id, user_id=user_id)
+
+
+def test_skipped_saves(event, trigger):
+    initial_scene = Scene("InitialScene")
+    machine = Machine(initial_scene, MemorySceneStorage())
+    machine.add_transition(initial_scene, Scene("FooScene"), trigger)
+
+    def set_initial_scene(user_id):
+        for _ in range(1000):
+            machine.set_current_scene(initial_scene, event, chat_id=user_id, user_id=user_id)
+
+    threads = [threading.Thread(target=set_initial_scene, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert machine.skipped_saves == 8000
@@ -0,0 +1,44 @@
+import time
+
+import pytest
+
+from tgbotscenario.synchronous import MemorySceneStorage
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+@pytest.mark.parametrize(
+    ("scenes",),
+    (
+        (["InitialScene"],),
+        (["InitialScene", "FooScene"],)
+    )
+)
+def test_behavior(chat_id, user_id, scenes):
+    storage = MemorySceneStorage()
+
+    storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+
+    assert storage.load_scenes(chat_id=chat_id, user_id=user_id) == scenes
+    assert storage.load_many([(chat_id, user_id)]) == {(chat_id, user_id): scenes}
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+def test_expiration(chat_id, user_id):
+    storage = MemorySceneStorage(ttl=0.01)
+    storage.save_scenes(["InitialScene", "FooScene"], chat_id=chat_id, user_id=user_id)
+    time.sleep(0.02)
+
+    assert storage.expire_scenes() == 1
+    assert storage.load_scenes(chat_id=chat_id, user_id=user_id) == []
@@ -0,0 +1,23 @@
+import pytest
+
+from tgbotscenario.synchronous import MemoryLockStorage
+from tgbotscenario import errors
+
+
+@pytest.mark.parametrize(
+    ("chat_id", "user_id"),
+    (
+        (-100123456789, 123456789),
+        (123456789, 123456789)
+    )
+)
+def test_behavior(chat_id, user_id):
+    storage = MemoryLockStorage()
+
+    storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+
+    assert storage.check_lock(chat_id=chat_id, user_id=user_id)
+    with pytest.raises(errors.LockExistsError):
+        storage.acquire_lock(chat_id=chat_id, user_id=user_id)
+    storage.release_lock(chat_id=chat_id, user_id=user_id)
+    assert not storage.check_lock(chat_id=chat_id, user_id=user_id)
@@ -1,8 +1,20 @@
 from .machine import Machine
 from .context_machine import ContextMachine
 from .scenes.scene import Scene
-from .scenes.storages.base import AbstractSceneStorage
+from .scenes.storages.base import (AbstractSceneStorage, AbstractDeltaSceneStorage,
+                                   AbstractVersionedSceneStorage)
 from .scenes.storages.memory import MemorySceneStorage
+from .scenes.storages.compact import CompactMemorySceneStorage
+from .scenes.storages.write_behind import WriteBehindSceneStorage
+from .scenes.storages.sqlite import SQLiteSceneStorage
+from .scenes.storages.log import LogSceneStorage
+from .scenes.storages.redis import RedisSceneStorage
+from .scenes.storages.sweeper import SceneStorageSweeper
+from .sharding import ShardedDispatcher
+from .transitions.locks.storages.base import AbstractLockStorage
+from .transitions.locks.storages.memory import MemoryLockStorage
+from .transitions.locks.storages.queue import QueueLockStorage
+from .transitions.locks.storages.sqlite import SQLiteLockStorage
 
 
 __all__ = [
@@ -10,5 +22,18 @@ __all__ = [
     "ContextMachine",
     "Scene",
     "AbstractSceneStorage",
-    "MemorySceneStorage"
+    "AbstractDeltaSceneStorage",
+    "AbstractVersionedSceneStorage",
+    "MemorySceneStorage",
+    "CompactMemorySceneStorage",
+    "WriteBehindSceneStorage",
+    "SQLiteSceneStorage",
+    "LogSceneStorage",
+    "RedisSceneStorage",
+    "SceneStorageSweeper",
+    "ShardedDispatcher",
+    "AbstractLockStorage",
+    "MemoryLockStorage",
+    "QueueLockStorage",
+    "SQLiteLockStorage"
 ]
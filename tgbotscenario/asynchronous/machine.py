@@ -1,21 +1,35 @@
-from typing import Optional, Callable, Set, Any
+import asyncio
+import time
+from typing import Optional, Callable, Set, List, Dict, Tuple, Iterable, Awaitable, Any
 
 from tgbotscenario.asynchronous.scenes.scene import Scene
 from tgbotscenario.asynchronous.scenes.storages.base import AbstractSceneStorage
 from tgbotscenario.asynchronous.scenes.manager import SceneManager
+from tgbotscenario.asynchronous.transitions.locks.storages.base import AbstractLockStorage
+from tgbotscenario.asynchronous.transitions.locks.storages.memory import MemoryLockStorage
+from tgbotscenario.asynchronous.transitions.locks.context import LockContext
 from tgbotscenario.common.transitions.scheme import TransitionScheme
-from tgbotscenario.common.transitions.locks.storage import LockStorage
-from tgbotscenario.common.transitions.locks.context import LockContext
+from tgbotscenario.common.cache import LRUCache
 from tgbotscenario.common.magazine import Magazine
+from tgbotscenario.common.instrumentation import AbstractInstrumentation, EXIT_PHASE, ENTER_PHASE
 from tgbotscenario import errors
 
 
 class Machine:
 
-    def __init__(self, initial_scene: Scene, scene_storage: AbstractSceneStorage):
-        self._scene_manager = SceneManager(initial_scene, scene_storage)
+    def __init__(self, initial_scene: Scene, scene_storage: AbstractSceneStorage,
+                 lock_storage: Optional[AbstractLockStorage] = None,
+                 magazine_cache: Optional[LRUCache] = None, max_depth: Optional[int] = None,
+                 instrumentation: Optional[AbstractInstrumentation] = None,
+                 concurrent_hooks: bool = False, optimistic: bool = False,
+                 conflict_retries: int = 0):
+        self._scene_manager = SceneManager(initial_scene, scene_storage, magazine_cache,
+                                           max_depth, instrumentation, optimistic)
         self._transition_scheme = TransitionScheme()
-        self._lock_storage = LockStorage()
+        self._lock_storage = lock_storage or MemoryLockStorage()
+        self._instrumentation = instrumentation
+        self._concurrent_hooks = concurrent_hooks
+        self._conflict_retries = conflict_retries
 
     @property
     def initial_scene(self) -> Scene:
@@ -25,8 +39,49 @@ class Machine:
     def scenes(self) -> Set[Scene]:
         return self._scene_manager.scenes
 
+    @property
+    def skipped_saves(self) -> int:
+        return self._scene_manager.skipped_saves
+
+    @property
+    def collapsed_loads(self) -> int:
+        return self._scene_manager.collapsed_loads
+
+    @property
+    def concurrent_hooks(self) -> bool:
+        return self._concurrent_hooks
+
+    @property
+    def optimistic(self) -> bool:
+        return self._scene_manager.optimistic
+
+    @property
+    def frozen(self) -> bool:
+        return self._transition_scheme.frozen
+
+    def freeze(self) -> None:
+        reachable_scenes = self._transition_scheme.get_reachable_scenes(self.initial_scene)
+        unreachable_scenes = self.scenes - reachable_scenes
+        if unreachable_scenes:
+            raise errors.UnreachableSceneError(
+                "it is not possible to freeze the machine "
+                "because the {scenes!r} scenes are unreachable from the initial scene!",
+                scenes=unreachable_scenes
+            )
+
+        self._transition_scheme.freeze()
+
     def add_transition(self, source_scene: Scene, destination_scene: Scene,
                        trigger: Callable, direction: Optional[str] = None) -> None:
+        if self.frozen:
+            raise errors.TransitionSchemeFrozenError(
+                "it is not possible to add the transition "
+                "(source_scene={source_scene!r}, destination_scene={destination_scene!r}, "
+                "trigger={trigger!r}, direction={direction!r}) "
+                "because the machine is frozen!",
+                source_scene=source_scene, destination_scene=destination_scene,
+                trigger=trigger, direction=direction
+            )
         for scene in {source_scene, destination_scene}:
             self._scene_manager.add_scene(scene)
 
@@ -48,104 +103,268 @@ class Machine:
 
         return destination_scene
 
+    def get_incoming_transitions(self,
+                                 scene: Scene) -> List[Tuple[Scene, Callable, Optional[str]]]:
+        return self._transition_scheme.get_incoming_transitions(scene)
+
     async def get_current_scene(self, *, chat_id: int, user_id: int) -> Scene:
-        magazine = await self._scene_manager.load_magazine(chat_id=chat_id, user_id=user_id)
+        try:
+            magazine = await self._scene_manager.load_magazine(chat_id=chat_id, user_id=user_id)
+        except errors.BaseError as error:
+            self._count_error(error)
+            raise
 
         return magazine.current
 
+    async def get_current_scenes(self,
+                                 keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Scene]:
+        try:
+            magazines = await self._scene_manager.load_magazines(keys)
+        except errors.BaseError as error:
+            self._count_error(error)
+            raise
+
+        return {key: magazine.current for key, magazine in magazines.items()}
+
     async def set_current_scene(self, scene: Scene, event: Any, data: Any = None,
                                 *, chat_id: int, user_id: int) -> None:
         if scene not in self.scenes:
-            raise errors.SceneSettingError(
+            error = errors.SceneSettingError(
                 "it is not possible to set the {scene!r} scene "
                 "(chat_id={chat_id}, user_id={user_id}) "
                 "because it doesn't participate in the transitions!",
                 scene=scene, chat_id=chat_id, user_id=user_id
             )
+            self._count_error(error)
+            raise error
 
         try:
-            with LockContext(self._lock_storage, chat_id=chat_id, user_id=user_id):
-                magazine = await self._scene_manager.load_magazine(chat_id=chat_id,
-                                                                   user_id=user_id)
-                await scene.process_enter(event, data)
-                await self._apply_scene(scene, magazine, chat_id=chat_id, user_id=user_id)
-        except errors.LockExistsError:
-            raise errors.SceneSettingError(
+            async with LockContext(self._lock_storage, chat_id=chat_id, user_id=user_id,
+                                   instrumentation=self._instrumentation):
+                await self._set_current_scene(scene, event, data,
+                                              chat_id=chat_id, user_id=user_id)
+        except errors.LockExistsError as lock_error:
+            error = errors.SceneSettingError(
                 "it is not possible to set the {scene!r} scene "
                 "(chat_id={chat_id}, user_id={user_id}) "
                 "because a transition in progress!",
                 chat_id=chat_id, user_id=user_id, scene=scene
-            ) from None
+            )
+            self._count_error(lock_error)
+            self._count_error(error)
+            raise error from None
+        except errors.BaseError as error:
+            self._count_error(error)
+            raise
 
     async def reset_current_scene(self, event: Any, data: Any = None,
                                   *, chat_id: int, user_id: int) -> None:
-        scene = await self.get_current_scene(chat_id=chat_id, user_id=user_id)
-        await scene.process_enter(event, data)
+        try:
+            magazine = await self._scene_manager.load_magazine(chat_id=chat_id, user_id=user_id)
+        except errors.BaseError as error:
+            self._count_error(error)
+            raise
+
+        scene = magazine.current
+        if self._instrumentation is None:
+            await scene.process_enter(event, data)
+        else:
+            await self._measure_hook(ENTER_PHASE, scene.process_enter(event, data), scene)
 
     async def move_to_next_scene(self, event: Any, trigger: Callable,
                                  direction: Optional[str] = None, data: Any = None,
                                  *, chat_id: int, user_id: int) -> None:
         try:
-            with LockContext(self._lock_storage, chat_id=chat_id, user_id=user_id):
-                magazine = await self._scene_manager.load_magazine(chat_id=chat_id,
-                                                                   user_id=user_id)
-                try:
-                    next_scene = self._transition_scheme.get_destination_scene(
-                        magazine.current, trigger, direction
-                    )
-                except errors.DestinationSceneNotFoundError:
-                    raise errors.TransitionToNextSceneError(
-                        "it is not possible to move to the next scene "
-                        "(chat_id={chat_id}, user_id={user_id}, current_scene={current_scene!r}, "
-                        "trigger={trigger!r}, direction={direction!r}) "
-                        "because it has not been set!",
-                        chat_id=chat_id, user_id=user_id, current_scene=magazine.current,
-                        trigger=trigger, direction=direction
-                    ) from None
-
-                await self._process_transition(event, data, magazine, magazine.current,
-                                               next_scene, chat_id=chat_id,
-                                               user_id=user_id)
-        except errors.LockExistsError:
-            raise errors.DoubleTransitionError(
+            async with LockContext(self._lock_storage, chat_id=chat_id, user_id=user_id,
+                                   instrumentation=self._instrumentation):
+                await self._move_to_next_scene(event, trigger, direction, data,
+                                               chat_id=chat_id, user_id=user_id)
+        except errors.LockExistsError as lock_error:
+            error = errors.DoubleTransitionError(
                 "it is not possible to move to the next scene "
                 "(chat_id={chat_id}, user_id={user_id}) "
                 "because an another transition in progress!",
                 chat_id=chat_id, user_id=user_id
-            ) from None
+            )
+            self._count_error(lock_error)
+            self._count_error(error)
+            raise error from None
+        except errors.BaseError as error:
+            self._count_error(error)
+            raise
 
     async def move_to_previous_scene(self, event: Any, data: Any = None,
                                      *, chat_id: int, user_id: int) -> None:
         try:
-            with LockContext(self._lock_storage, chat_id=chat_id, user_id=user_id):
-                magazine = await self._scene_manager.load_magazine(chat_id=chat_id,
-                                                                   user_id=user_id)
-                if magazine.previous is None:
-                    raise errors.TransitionToPreviousSceneError(
-                        "it is not possible to move to the previous scene "
-                        "(chat_id={chat_id}, user_id={user_id}, current_scene={current_scene!r}) "
-                        "because the current scene is the initial scene!",
-                        chat_id=chat_id, user_id=user_id, current_scene=magazine.current
-                    )
-                await self._process_transition(event, data, magazine, magazine.current,
-                                               magazine.previous, chat_id=chat_id,
-                                               user_id=user_id)
-        except errors.LockExistsError:
-            raise errors.DoubleTransitionError(
+            async with LockContext(self._lock_storage, chat_id=chat_id, user_id=user_id,
+                                   instrumentation=self._instrumentation):
+                await self._move_to_previous_scene(event, data,
+                                                   chat_id=chat_id, user_id=user_id)
+        except errors.LockExistsError as lock_error:
+            error = errors.DoubleTransitionError(
                 "it is not possible to move to the previous scene "
                 "(chat_id={chat_id}, user_id={user_id}) "
                 "because an another transition in progress!",
                 chat_id=chat_id, user_id=user_id
-            ) from None
+            )
+            self._count_error(lock_error)
+            self._count_error(error)
+            raise error from None
+        except errors.BaseError as error:
+            self._count_error(error)
+            raise
+
+    async def _set_current_scene(self, scene: Scene, event: Any, data: Any,
+                                 *, chat_id: int, user_id: int) -> None:
+        magazine = await self._scene_manager.load_magazine(chat_id=chat_id, user_id=user_id)
+        if self._instrumentation is None:
+            enter_hook = scene.process_enter(event, data)
+        else:
+            enter_hook = self._measure_hook(ENTER_PHASE, scene.process_enter(event, data), scene)
+
+        if self._concurrent_hooks:
+            await self._apply_scene_concurrently([enter_hook], scene, magazine, lambda i: scene,
+                                                 chat_id=chat_id, user_id=user_id)
+        else:
+            await enter_hook
+            await self._apply_scene(scene, magazine, lambda i: scene,
+                                    chat_id=chat_id, user_id=user_id)
+
+    async def _move_to_next_scene(self, event: Any, trigger: Callable, direction: Optional[str],
+                                  data: Any, *, chat_id: int, user_id: int) -> None:
+        magazine = await self._scene_manager.load_magazine(chat_id=chat_id, user_id=user_id)
+        source_scene = magazine.current
+        next_scene = self._find_next_scene(source_scene, trigger, direction)
+        if next_scene is None:
+            raise errors.TransitionToNextSceneError(
+                "it is not possible to move to the next scene "
+                "(chat_id={chat_id}, user_id={user_id}, current_scene={current_scene!r}, "
+                "trigger={trigger!r}, direction={direction!r}) "
+                "because it has not been set!",
+                chat_id=chat_id, user_id=user_id, current_scene=magazine.current,
+                trigger=trigger, direction=direction
+            )
+
+        def get_next_scene(reloaded_magazine: Magazine) -> Optional[Scene]:
+            if reloaded_magazine.current is not source_scene:
+                return None
+            return self._find_next_scene(source_scene, trigger, direction)
+
+        await self._process_transition(event, data, magazine, source_scene, next_scene,
+                                       get_next_scene, trigger, chat_id=chat_id, user_id=user_id)
+
+    async def _move_to_previous_scene(self, event: Any, data: Any,
+                                      *, chat_id: int, user_id: int) -> None:
+        magazine = await self._scene_manager.load_magazine(chat_id=chat_id, user_id=user_id)
+        if magazine.previous is None:
+            raise errors.TransitionToPreviousSceneError(
+                "it is not possible to move to the previous scene "
+                "(chat_id={chat_id}, user_id={user_id}, current_scene={current_scene!r}) "
+                "because the current scene is the initial scene!",
+                chat_id=chat_id, user_id=user_id, current_scene=magazine.current
+            )
+
+        source_scene = magazine.current
+
+        def get_previous_scene(reloaded_magazine: Magazine) -> Optional[Scene]:
+            if reloaded_magazine.current is not source_scene:
+                return None
+            return reloaded_magazine.previous
+
+        await self._process_transition(event, data, magazine, source_scene, magazine.previous,
+                                       get_previous_scene, chat_id=chat_id, user_id=user_id)
 
     async def _process_transition(self, event: Any, data: Any, magazine: Magazine,
                                   source_scene: Scene, destination_scene: Scene,
+                                  get_destination_scene: Callable[[Magazine], Optional[Scene]],
+                                  trigger: Optional[Callable] = None,
                                   *, chat_id: int, user_id: int) -> None:
-        await source_scene.process_exit(event, data)
-        await destination_scene.process_enter(event, data)
-        await self._apply_scene(destination_scene, magazine, chat_id=chat_id, user_id=user_id)
+        if self._concurrent_hooks:
+            hooks = [source_scene.process_exit(event, data),
+                     destination_scene.process_enter(event, data)]
+            if self._instrumentation is not None:
+                hooks = [self._measure_hook(EXIT_PHASE, hooks[0], source_scene, trigger),
+                         self._measure_hook(ENTER_PHASE, hooks[1], destination_scene, trigger)]
+            await self._apply_scene_concurrently(hooks, destination_scene, magazine,
+                                                 get_destination_scene,
+                                                 chat_id=chat_id, user_id=user_id)
+            return
+
+        if self._instrumentation is None:
+            await source_scene.process_exit(event, data)
+            await destination_scene.process_enter(event, data)
+        else:
+            await self._measure_hook(EXIT_PHASE, source_scene.process_exit(event, data),
+                                     source_scene, trigger)
+            await self._measure_hook(ENTER_PHASE, destination_scene.process_enter(event, data),
+                                     destination_scene, trigger)
+        await self._apply_scene(destination_scene, magazine, get_destination_scene,
+                                chat_id=chat_id, user_id=user_id)
+
+    def _find_next_scene(self, scene: Scene, trigger: Callable,
+                         direction: Optional[str]) -> Optional[Scene]:
+        try:
+            return self._transition_scheme.get_destination_scene(scene, trigger, direction)
+        except errors.DestinationSceneNotFoundError:
+            return None
 
     async def _apply_scene(self, scene: Scene, magazine: Magazine,
-                           *, chat_id: int, user_id: int) -> None:
-        magazine.set(scene)
-        await self._scene_manager.save_magazine(magazine, chat_id=chat_id, user_id=user_id)
+                           get_scene: Callable[[Magazine], Optional[Scene]],
+                           *, chat_id: int, user_id: int) -> Tuple[Magazine, List[Scene]]:
+        for retry in range(self._conflict_retries + 1):
+            items = list(magazine)
+            magazine.set(scene)
+            try:
+                await self._scene_manager.save_magazine(magazine,
+                                                        chat_id=chat_id, user_id=user_id)
+            except errors.SceneConflictError as error:
+                if retry == self._conflict_retries:
+                    raise
+                # the hooks have already been run, so only the saving is repeated
+                # and only while the changed scenes still lead to the same scene
+                magazine = await self._scene_manager.load_magazine(chat_id=chat_id,
+                                                                   user_id=user_id)
+                if get_scene(magazine) is not scene:
+                    raise
+                self._count_error(error)
+            else:
+                break
+
+        return magazine, items
+
+    async def _apply_scene_concurrently(self, hooks: List[Awaitable], scene: Scene,
+                                        magazine: Magazine,
+                                        get_scene: Callable[[Magazine], Optional[Scene]],
+                                        *, chat_id: int, user_id: int) -> None:
+        save = self._apply_scene(scene, magazine, get_scene, chat_id=chat_id, user_id=user_id)
+
+        results = await asyncio.gather(*hooks, save, return_exceptions=True)
+        failures = [i for i in results if isinstance(i, BaseException)]
+        if not failures:
+            return
+
+        # the transition fails as a whole, so the saved scene is rolled back
+        if not isinstance(results[-1], BaseException):
+            magazine, items = results[-1]
+            magazine.restore(items)
+            try:
+                await self._scene_manager.save_magazine(magazine,
+                                                        chat_id=chat_id, user_id=user_id)
+            except Exception as rollback_error:
+                # the failure of the transition is kept, the rollback one becomes its cause
+                raise failures[0] from rollback_error
+
+        raise failures[0]
+
+    async def _measure_hook(self, phase: str, hook: Awaitable, scene: Scene,
+                            trigger: Optional[Callable] = None) -> None:
+        start_time = time.perf_counter()
+        try:
+            await hook
+        finally:
+            self._instrumentation.observe_phase(phase, time.perf_counter() - start_time,
+                                                scene=scene, trigger=trigger)
+
+    def _count_error(self, error: errors.BaseError) -> None:
+        if self._instrumentation is not None:
+            self._instrumentation.count_error(error)
@@ -1,17 +1,40 @@
-from typing import Set
+import asyncio
+import time
+from typing import Optional, Set, List, Dict, Tuple, Iterable
 
-from tgbotscenario.asynchronous.scenes.storages.base import AbstractSceneStorage
+from tgbotscenario.asynchronous.scenes.storages.base import (AbstractSceneStorage,
+                                                              AbstractDeltaSceneStorage,
+                                                              AbstractVersionedSceneStorage)
 from tgbotscenario.asynchronous.scenes.scene import Scene
 from tgbotscenario.common.mapping import Mapping
+from tgbotscenario.common.cache import LRUCache
 from tgbotscenario.common.magazine import Magazine
+from tgbotscenario.common.instrumentation import AbstractInstrumentation, LOAD_PHASE, SAVE_PHASE
 from tgbotscenario import errors
 
 
 class SceneManager:
 
-    def __init__(self, initial_scene: Scene, storage: AbstractSceneStorage):
+    def __init__(self, initial_scene: Scene, storage: AbstractSceneStorage,
+                 cache: Optional[LRUCache] = None, max_depth: Optional[int] = None,
+                 instrumentation: Optional[AbstractInstrumentation] = None,
+                 optimistic: bool = False):
+        if optimistic and not isinstance(storage, AbstractVersionedSceneStorage):
+            raise errors.UnversionedSceneStorageError(
+                "it is not possible to use the optimistic transitions "
+                "because the {storage!r} storage doesn't support versioning!",
+                storage=storage
+            )
         self._mapping = Mapping()
         self._storage = storage
+        self._cache = cache
+        self._max_depth = max_depth
+        self._instrumentation = instrumentation
+        self._optimistic = optimistic
+        self._skipped_saves = 0
+        self._collapsed_loads = 0
+        # the concurrent loads of a user share a single storage reading
+        self._inflight: Dict[Tuple[int, int], asyncio.Future] = {}
         self._scenes: Set[Scene] = set()
         self._initial_scene = initial_scene
         self.add_scene(initial_scene)
@@ -24,6 +47,18 @@ class SceneManager:
     def scenes(self) -> Set[Scene]:
         return self._scenes.copy()
 
+    @property
+    def optimistic(self) -> bool:
+        return self._optimistic
+
+    @property
+    def skipped_saves(self) -> int:
+        return self._skipped_saves
+
+    @property
+    def collapsed_loads(self) -> int:
+        return self._collapsed_loads
+
     def add_scene(self, scene: Scene) -> None:
         try:
             self._mapping.add(key=scene.name, value=scene)
@@ -47,9 +82,154 @@ class SceneManager:
             ) from None
 
         self._scenes.remove(scene)
+        if self._cache is not None:
+            self._cache.clear()
 
     async def load_magazine(self, *, chat_id: int, user_id: int) -> Magazine:
-        raw_scenes = await self._storage.load_scenes(chat_id=chat_id, user_id=user_id)
+        if self._instrumentation is not None:
+            start_time = time.perf_counter()
+
+        magazine = self._get_cached_magazine((chat_id, user_id))
+        if magazine is None:
+            future = self._inflight.get((chat_id, user_id))
+            if future is None:
+                future = asyncio.ensure_future(self._load_raw_scenes(chat_id=chat_id,
+                                                                     user_id=user_id))
+                self._inflight[chat_id, user_id] = future
+                future.add_done_callback(
+                    lambda i: self._remove_inflight_load((chat_id, user_id), i)
+                )
+            else:
+                self._collapsed_loads += 1
+            # a cancelled caller doesn't cancel the reading of the others
+            raw_scenes, storage_version = await asyncio.shield(future)
+            magazine = self._make_magazine(raw_scenes, storage_version,
+                                           chat_id=chat_id, user_id=user_id)
+            self._add_cached_magazine((chat_id, user_id), magazine, len(raw_scenes))
+
+        if self._instrumentation is not None:
+            self._instrumentation.observe_phase(LOAD_PHASE, time.perf_counter() - start_time,
+                                                scene=magazine.current)
+
+        return magazine
+
+    async def load_magazines(self,
+                             keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Magazine]:
+        magazines = {}
+        missing_keys = []
+        for key in keys:
+            magazine = self._get_cached_magazine(key)
+            if magazine is None:
+                missing_keys.append(key)
+            else:
+                magazines[key] = magazine
+
+        if missing_keys:
+            raw_scenes = await self._storage.load_many(missing_keys)
+            for (chat_id, user_id), user_raw_scenes in raw_scenes.items():
+                magazine = self._make_magazine(user_raw_scenes, chat_id=chat_id, user_id=user_id)
+                magazines[chat_id, user_id] = magazine
+                # the magazines loaded without a version can't be used in the optimistic saving
+                if not self._optimistic:
+                    self._add_cached_magazine((chat_id, user_id), magazine,
+                                              len(user_raw_scenes))
+
+        return magazines
+
+    async def save_magazine(self, magazine: Magazine, *, chat_id: int, user_id: int) -> None:
+        if not magazine.changed:
+            self._skipped_saves += 1
+            return
+
+        if self._instrumentation is not None:
+            start_time = time.perf_counter()
+
+        # the loads started after the saving must not get the scenes read before it,
+        # and a storage may handle a read started during the saving before the saving
+        self._inflight.pop((chat_id, user_id), None)
+        storage_version = None
+        try:
+            if self._optimistic:
+                storage_version = await self._save_versioned(magazine,
+                                                             chat_id=chat_id, user_id=user_id)
+            elif isinstance(self._storage, AbstractDeltaSceneStorage):
+                await self._save_delta(magazine, chat_id=chat_id, user_id=user_id)
+            else:
+                raw_scenes = [self._mapping.get_key(i) for i in magazine]
+                await self._storage.save_scenes(raw_scenes, chat_id=chat_id, user_id=user_id)
+        except BaseException:
+            if self._cache is not None:
+                self._cache.remove((chat_id, user_id))
+            raise
+        finally:
+            self._inflight.pop((chat_id, user_id), None)
+
+        magazine.commit(storage_version)
+        if self._cache is not None:
+            self._cache.set((chat_id, user_id), (list(magazine), len(magazine), storage_version))
+
+        if self._instrumentation is not None:
+            self._instrumentation.observe_phase(SAVE_PHASE, time.perf_counter() - start_time,
+                                                scene=magazine.current)
+
+    async def _load_raw_scenes(self, *, chat_id: int,
+                               user_id: int) -> Tuple[List[str], Optional[int]]:
+        if self._optimistic:
+            return await self._storage.load_versioned_scenes(chat_id=chat_id, user_id=user_id)
+
+        return await self._storage.load_scenes(chat_id=chat_id, user_id=user_id), None
+
+    def _remove_inflight_load(self, key: Tuple[int, int], future: asyncio.Future) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+
+    def _get_cached_magazine(self, key: Tuple[int, int]) -> Optional[Magazine]:
+        if self._cache is None:
+            return None
+
+        cached_magazine = self._cache.get(key)
+        if cached_magazine is None:
+            return None
+
+        scenes, stored_length, storage_version = cached_magazine
+
+        return Magazine(scenes, self._max_depth, stored_length, storage_version)
+
+    def _add_cached_magazine(self, key: Tuple[int, int], magazine: Magazine,
+                             stored_length: int) -> None:
+        # a magazine saved during loading is newer than the loaded one,
+        # and a changed magazine doesn't match the stored scenes
+        if self._cache is not None and not magazine.changed:
+            self._cache.add(key, (list(magazine), stored_length, magazine.storage_version))
+
+    async def _save_versioned(self, magazine: Magazine, *, chat_id: int, user_id: int) -> int:
+        raw_scenes = [self._mapping.get_key(i) for i in magazine]
+        saved = await self._storage.compare_and_save_scenes(raw_scenes, magazine.storage_version,
+                                                            chat_id=chat_id, user_id=user_id)
+        if not saved:
+            raise errors.SceneConflictError(
+                "it is not possible to save the magazine "
+                "(chat_id={chat_id}, user_id={user_id}) "
+                "because the stored scenes have been changed since the {version} version!",
+                chat_id=chat_id, user_id=user_id, version=magazine.storage_version
+            )
+
+        return magazine.storage_version + 1
+
+    async def _save_delta(self, magazine: Magazine, *, chat_id: int, user_id: int) -> None:
+        truncation_length, appended_scenes = magazine.get_delta()
+        if truncation_length is None:
+            truncation_length = magazine.stored_length
+        raw_scenes = [self._mapping.get_key(i) for i in appended_scenes]
+        updated = await self._storage.update_scenes(raw_scenes, truncation_length,
+                                                    magazine.stored_length,
+                                                    chat_id=chat_id, user_id=user_id)
+        if not updated:  # the stored scenes have expired or been changed since the loading
+            raw_scenes = [self._mapping.get_key(i) for i in magazine]
+            await self._storage.save_scenes(raw_scenes, chat_id=chat_id, user_id=user_id)
+
+    def _make_magazine(self, raw_scenes: List[str], storage_version: Optional[int] = None,
+                       *, chat_id: int, user_id: int) -> Magazine:
         if raw_scenes:
             try:
                 scenes = [self._mapping.get_value(i) for i in raw_scenes]
@@ -63,10 +243,4 @@ class SceneManager:
         else:
             scenes = [self._initial_scene]
 
-        magazine = Magazine(scenes)
-
-        return magazine
-
-    async def save_magazine(self, magazine: Magazine, *, chat_id: int, user_id: int) -> None:
-        raw_scenes = [self._mapping.get_key(i) for i in magazine]
-        await self._storage.save_scenes(raw_scenes, chat_id=chat_id, user_id=user_id)
+        return Magazine(scenes, self._max_depth, len(raw_scenes), storage_version)
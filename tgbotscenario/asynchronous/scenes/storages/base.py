@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Dict, Tuple, Iterable
 
 
 class AbstractSceneStorage(ABC):
@@ -11,3 +11,40 @@ class AbstractSceneStorage(ABC):
     @abstractmethod
     async def save_scenes(self, scenes: List[str], *, chat_id: int, user_id: int) -> None:
         pass
+
+    async def load_many(self,
+                        keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], List[str]]:
+        return {
+            (chat_id, user_id): await self.load_scenes(chat_id=chat_id, user_id=user_id)
+            for chat_id, user_id in keys
+        }
+
+    async def save_many(self, scenes: Dict[Tuple[int, int], List[str]]) -> None:
+        for (chat_id, user_id), user_scenes in scenes.items():
+            await self.save_scenes(user_scenes, chat_id=chat_id, user_id=user_id)
+
+    async def expire_scenes(self) -> int:
+        return 0
+
+
+class AbstractDeltaSceneStorage(AbstractSceneStorage):
+    # the first scenes of the given length are kept and the scenes are appended to them
+    # only if the stored scenes have the expected length, otherwise False is returned
+
+    @abstractmethod
+    async def update_scenes(self, scenes: List[str], length: int, stored_length: int,
+                            *, chat_id: int, user_id: int) -> bool:
+        pass
+
+
+class AbstractVersionedSceneStorage(AbstractSceneStorage):
+    # each save of the user scenes increments their version, missing scenes have the version 0
+
+    @abstractmethod
+    async def load_versioned_scenes(self, *, chat_id: int, user_id: int) -> Tuple[List[str], int]:
+        pass
+
+    @abstractmethod
+    async def compare_and_save_scenes(self, scenes: List[str], version: int,
+                                      *, chat_id: int, user_id: int) -> bool:
+        pass
@@ -0,0 +1,167 @@
+import asyncio
+from typing import Optional, List, Dict, Set, Tuple, Iterable, Iterator
+
+from tgbotscenario.asynchronous.scenes.storages.base import AbstractSceneStorage
+from tgbotscenario.common.codecs import AbstractSceneCodec, IntegerSceneCodec
+from tgbotscenario.common.registry import SceneRegistry
+from tgbotscenario.common.keys import Key, pack_key, unpack_key
+from tgbotscenario.common.expiration import ExpirationTracker
+from tgbotscenario.common.snapshot import SceneSnapshot, Record, write_snapshot
+from tgbotscenario import errors
+
+
+class CompactMemorySceneStorage(AbstractSceneStorage):
+    MAX_INTERNED_VALUES = 65536
+
+    def __init__(self, codec: Optional[AbstractSceneCodec] = None, ttl: Optional[float] = None):
+        self._codec = codec or IntegerSceneCodec(SceneRegistry())
+        self._storage: Dict[Key, bytes] = {}
+        self._values: Dict[bytes, bytes] = {}  # users with the same scenes share a value
+        self._expiration_tracker = None if ttl is None else ExpirationTracker(ttl)
+        self._snapshot: Optional[SceneSnapshot] = None
+        # the codec of a snapshot written with other scene ids, its scenes are encoded anew
+        self._snapshot_codec: Optional[AbstractSceneCodec] = None
+        # the keys of the snapshot which are moved to the storage or removed from it
+        self._shadowed_keys: Set[Key] = set()
+
+    def __len__(self):
+        if self._snapshot is None:
+            return len(self._storage)
+
+        return len(self._storage) + len(self._snapshot) - len(self._shadowed_keys)
+
+    async def load_scenes(self, *, chat_id: int, user_id: int) -> List[str]:
+        return self._load(pack_key(chat_id, user_id))
+
+    async def save_scenes(self, scenes: List[str], *, chat_id: int, user_id: int) -> None:
+        self._save(pack_key(chat_id, user_id), scenes)
+
+    async def load_many(self,
+                        keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], List[str]]:
+        return {(chat_id, user_id): self._load(pack_key(chat_id, user_id))
+                for chat_id, user_id in keys}
+
+    async def save_many(self, scenes: Dict[Tuple[int, int], List[str]]) -> None:
+        for (chat_id, user_id), user_scenes in scenes.items():
+            self._save(pack_key(chat_id, user_id), user_scenes)
+
+    async def expire_scenes(self) -> int:
+        if self._expiration_tracker is None:
+            return 0
+
+        expired_keys = self._expiration_tracker.pop_expired()
+        for key in expired_keys:
+            del self._storage[key]
+
+        return len(expired_keys)
+
+    async def save_snapshot(self, path: str) -> None:
+        snapshot = self._snapshot
+        records = _iterate_records(list(self._storage.items()), snapshot,
+                                   set(self._shadowed_keys), self._codec, self._snapshot_codec)
+        # the snapshot is read in the writing thread, so opening another one doesn't close it
+        if snapshot is not None:
+            snapshot.acquire()
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(None, _write_snapshot, path, records, self._codec)
+        finally:
+            if snapshot is not None:
+                snapshot.release()
+
+    def open_snapshot(self, path: str) -> None:
+        # only the header is read, the scenes are read and decoded on the first access
+        snapshot = SceneSnapshot(path)
+        if snapshot.codec_kind != self._codec.KIND:
+            snapshot.close()
+            raise errors.CorruptedSnapshotError(
+                "it is not possible to read the {path!r} snapshot "
+                "because it has been written with another codec!",
+                path=path
+            )
+        snapshot_codec = None
+        if isinstance(self._codec, IntegerSceneCodec):
+            # the names are looked up only, so the registry isn't changed by the opening
+            names = snapshot.names
+            if any(self._codec.registry.find_id(name) != scene_id
+                   for scene_id, name in enumerate(names)):
+                registry = SceneRegistry()
+                registry.register(*names)
+                snapshot_codec = IntegerSceneCodec(registry)
+
+        if self._snapshot is not None:
+            self._snapshot.close()
+        if self._expiration_tracker is not None:
+            for key in self._storage:
+                self._expiration_tracker.discard(key)
+        self._storage.clear()
+        self._values.clear()
+        self._shadowed_keys.clear()
+        self._snapshot = snapshot
+        self._snapshot_codec = snapshot_codec
+
+    def _load(self, key: Key) -> List[str]:
+        data = self._storage.get(key)
+        if data is None and self._snapshot is not None and key not in self._shadowed_keys:
+            data = self._snapshot.get(*unpack_key(key))
+            if data is not None:  # the scenes are moved to the storage on the first access
+                if self._snapshot_codec is not None:
+                    data = self._codec.encode(self._snapshot_codec.decode(data))
+                data = self._intern(data)
+                self._storage[key] = data
+                self._shadowed_keys.add(key)
+                if self._expiration_tracker is not None:
+                    self._expiration_tracker.touch(key)
+        if data is not None and self._expiration_tracker is not None:
+            if self._expiration_tracker.check(key):
+                del self._storage[key]
+                self._expiration_tracker.discard(key)
+                return []
+            self._expiration_tracker.touch(key)
+
+        return [] if data is None else self._codec.decode(data)
+
+    def _save(self, key: Key, scenes: List[str]) -> None:
+        if self._snapshot is not None and key not in self._shadowed_keys:
+            if self._snapshot.get(*unpack_key(key)) is not None:
+                self._shadowed_keys.add(key)
+
+        if not scenes:
+            self._storage.pop(key, None)
+            if self._expiration_tracker is not None:
+                self._expiration_tracker.discard(key)
+            return
+
+        self._storage[key] = self._intern(self._codec.encode(scenes))
+        if self._expiration_tracker is not None:
+            self._expiration_tracker.touch(key)
+
+    def _intern(self, data: bytes) -> bytes:
+        try:
+            return self._values[data]
+        except KeyError:
+            if len(self._values) < self.MAX_INTERNED_VALUES:
+                self._values[data] = data
+
+        return data
+
+
+def _iterate_records(records: List[Tuple[Key, bytes]], snapshot: Optional[SceneSnapshot],
+                     shadowed_keys: Set[Key], codec: AbstractSceneCodec,
+                     snapshot_codec: Optional[AbstractSceneCodec]) -> Iterator[Record]:
+    for key, data in records:
+        yield (*unpack_key(key), data)
+
+    if snapshot is not None:
+        for chat_id, user_id, data in snapshot:
+            if pack_key(chat_id, user_id) not in shadowed_keys:
+                if snapshot_codec is not None:
+                    data = codec.encode(snapshot_codec.decode(data))
+                yield chat_id, user_id, data
+
+
+def _write_snapshot(path: str, records: Iterator[Record], codec: AbstractSceneCodec) -> None:
+    # the records are encoded before the names are taken, as the encoding may register them
+    records = list(records)
+    names = codec.registry.names if isinstance(codec, IntegerSceneCodec) else []
+    write_snapshot(path, records, codec.KIND, names)
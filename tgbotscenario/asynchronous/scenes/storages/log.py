@@ -0,0 +1,261 @@
+import asyncio
+import os
+import re
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, BinaryIO, List, Dict, Tuple, Iterable, Iterator, Any
+
+from tgbotscenario.asynchronous.scenes.storages.base import AbstractSceneStorage
+from tgbotscenario.common.codecs import AbstractSceneCodec, TextSceneCodec
+from tgbotscenario.common.keys import Key, pack_key, unpack_key
+from tgbotscenario import errors
+
+
+# a record is crc32, chat_id, user_id and length of the encoded scenes followed by them,
+# the crc32 covers everything after itself, and empty scenes mean removed ones
+_RECORD_HEADER = struct.Struct("<IqqI")
+# a snapshot contains the records of all logs older than its generation
+_SNAPSHOT_HEADER = struct.Struct("<4sBQ")
+_SNAPSHOT_MAGIC = b"TGSS"
+_SNAPSHOT_VERSION = 1
+_SNAPSHOT_NAME = "scenes.snapshot"
+_LOG_NAME = re.compile(r"^scenes\.(\d+)\.log$")
+
+
+class LogSceneStorage(AbstractSceneStorage):
+
+    def __init__(self, directory: str, *, codec: Optional[AbstractSceneCodec] = None,
+                 sync_interval: Optional[float] = 0.1, compaction_size: int = 64 * 2 ** 20):
+        self._directory = directory
+        self._codec = codec or TextSceneCodec()
+        self._sync_interval = sync_interval
+        self._compaction_size = compaction_size
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._index: Dict[Key, bytes] = {}
+        self._generation = 0
+        self._log_size = 0
+        self._unsynced = False
+        self._sync_lock: Optional[asyncio.Lock] = None
+        self._sync_task: Optional[asyncio.Task] = None
+        os.makedirs(directory, exist_ok=True)
+        self._replay()
+        self._file = self._open_log(self._generation)
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    async def load_scenes(self, *, chat_id: int, user_id: int) -> List[str]:
+        return self._load(pack_key(chat_id, user_id))
+
+    async def save_scenes(self, scenes: List[str], *, chat_id: int, user_id: int) -> None:
+        self._save(chat_id, user_id, scenes)
+        self._start_syncing()
+
+    async def load_many(self,
+                        keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], List[str]]:
+        return {(chat_id, user_id): self._load(pack_key(chat_id, user_id))
+                for chat_id, user_id in keys}
+
+    async def save_many(self, scenes: Dict[Tuple[int, int], List[str]]) -> None:
+        for (chat_id, user_id), user_scenes in scenes.items():
+            self._save(chat_id, user_id, user_scenes)
+        self._start_syncing()
+
+    async def sync(self) -> None:
+        async with self._get_sync_lock():
+            if not self._unsynced:
+                return
+            self._unsynced = False
+            self._file.flush()
+            await self._execute(os.fsync, self._file.fileno())
+
+    async def compact(self) -> None:
+        async with self._get_sync_lock():
+            self._file.flush()
+            old_file = self._file
+            # the next writes go to a new log, so the snapshot is written without blocking them
+            self._generation += 1
+            self._file = self._open_log(self._generation)
+            self._log_size = 0
+            self._unsynced = False
+            records = list(self._index.items())
+            await self._execute(self._write_snapshot, records, self._generation, old_file)
+
+    async def close(self) -> None:
+        if self._sync_task is not None:
+            self._sync_task.cancel()
+            try:
+                await self._sync_task
+            except asyncio.CancelledError:
+                pass
+            self._sync_task = None
+        self._unsynced = True
+        await self.sync()
+        self._file.close()
+        self._executor.shutdown()
+
+    def _load(self, key: Key) -> List[str]:
+        data = self._index.get(key)
+
+        return [] if data is None else self._codec.decode(data)
+
+    def _save(self, chat_id: int, user_id: int, scenes: List[str]) -> None:
+        data = self._codec.encode(scenes)
+        key = pack_key(chat_id, user_id)
+        if data:
+            self._index[key] = data
+        elif self._index.pop(key, None) is None:
+            return
+
+        record = _make_record(chat_id, user_id, data)
+        self._file.write(record)
+        self._log_size += len(record)
+        self._unsynced = True
+
+    def _get_sync_lock(self) -> asyncio.Lock:
+        if self._sync_lock is None:
+            self._sync_lock = asyncio.Lock()
+
+        return self._sync_lock
+
+    def _start_syncing(self) -> None:
+        if self._sync_interval is not None and self._sync_task is None:
+            self._sync_task = asyncio.ensure_future(self._sync_periodically())
+
+    async def _sync_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._sync_interval)
+            try:
+                if self._log_size >= self._compaction_size:
+                    await self.compact()
+                else:
+                    await self.sync()
+            except Exception:  # the scenes stay unsynced, the error is raised by close()
+                self._unsynced = True
+
+    async def _execute(self, function: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self._executor, function, *args)
+
+    def _open_log(self, generation: int) -> BinaryIO:
+        file = open(self._get_log_path(generation), "ab")
+        _sync_directory(self._directory)
+
+        return file
+
+    def _get_log_path(self, generation: int) -> str:
+        return os.path.join(self._directory, f"scenes.{generation}.log")
+
+    def _get_log_generations(self) -> List[int]:
+        generations = []
+        for name in os.listdir(self._directory):
+            match = _LOG_NAME.match(name)
+            if match is not None:
+                generations.append(int(match.group(1)))
+
+        return sorted(generations)
+
+    def _replay(self) -> None:
+        snapshot_path = os.path.join(self._directory, _SNAPSHOT_NAME)
+        if os.path.exists(snapshot_path):
+            with open(snapshot_path, "rb") as file:
+                data = file.read()
+            try:
+                magic, version, self._generation = _SNAPSHOT_HEADER.unpack_from(data)
+            except struct.error:
+                magic = version = None
+            if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+                raise errors.CorruptedSnapshotError(
+                    "it is not possible to read the {path!r} snapshot "
+                    "because it has an unknown format!",
+                    path=snapshot_path
+                )
+            end = self._replay_records(data, _SNAPSHOT_HEADER.size)
+            if end != len(data):
+                raise errors.CorruptedSnapshotError(
+                    "it is not possible to read the {path!r} snapshot "
+                    "because it is damaged at the {offset} offset!",
+                    path=snapshot_path, offset=end
+                )
+
+        for generation in self._get_log_generations():
+            path = self._get_log_path(generation)
+            if generation < self._generation:  # a compaction has been interrupted
+                os.remove(path)
+                continue
+            with open(path, "rb") as file:
+                data = file.read()
+            end = self._replay_records(data, 0)
+            if end != len(data):  # the tail hasn't been written completely
+                with open(path, "r+b") as file:
+                    file.truncate(end)
+            self._generation = generation
+            self._log_size = end
+
+    def _replay_records(self, data: bytes, offset: int) -> int:
+        for chat_id, user_id, scenes, offset in _read_records(data, offset):
+            key = pack_key(chat_id, user_id)
+            if scenes:
+                self._index[key] = scenes
+            else:
+                self._index.pop(key, None)
+
+        return offset
+
+    # the method below is run in the storage thread only
+
+    def _write_snapshot(self, records: List[Tuple[Key, bytes]], generation: int,
+                        old_file: BinaryIO) -> None:
+        old_file.flush()
+        os.fsync(old_file.fileno())
+        old_file.close()
+
+        path = os.path.join(self._directory, _SNAPSHOT_NAME)
+        temporary_path = f"{path}.tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, generation))
+            for key, data in records:
+                file.write(_make_record(*unpack_key(key), data))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, path)
+        _sync_directory(self._directory)
+
+        for old_generation in self._get_log_generations():
+            if old_generation < generation:
+                os.remove(self._get_log_path(old_generation))
+
+
+def _make_record(chat_id: int, user_id: int, data: bytes) -> bytes:
+    body = _RECORD_HEADER.pack(0, chat_id, user_id, len(data))[4:] + data
+
+    return struct.pack("<I", zlib.crc32(body)) + body
+
+
+def _read_records(data: bytes, offset: int) -> Iterator[Tuple[int, int, bytes, int]]:
+    # the records are read until the end or a damaged record
+    while offset + _RECORD_HEADER.size <= len(data):
+        crc, chat_id, user_id, length = _RECORD_HEADER.unpack_from(data, offset)
+        end = offset + _RECORD_HEADER.size + length
+        if end > len(data) or zlib.crc32(data[offset + 4:end]) != crc:
+            return
+        yield chat_id, user_id, data[offset + _RECORD_HEADER.size:end], end
+        offset = end
+
+
+def _sync_directory(directory: str) -> None:
+    # a created or replaced file is durable when its directory entry is synced
+    if os.name != "posix":
+        return
+
+    descriptor = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
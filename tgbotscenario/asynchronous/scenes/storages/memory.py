@@ -1,16 +1,99 @@
-from collections import defaultdict
-from typing import List
+from typing import Optional, List, Dict, Tuple, Iterable
 
-from tgbotscenario.asynchronous.scenes.storages.base import AbstractSceneStorage
+from tgbotscenario.asynchronous.scenes.storages.base import (AbstractDeltaSceneStorage,
+                                                              AbstractVersionedSceneStorage)
+from tgbotscenario.common.expiration import ExpirationTracker
 
 
-class MemorySceneStorage(AbstractSceneStorage):
+class MemorySceneStorage(AbstractDeltaSceneStorage, AbstractVersionedSceneStorage):
 
-    def __init__(self):
-        self._storage = defaultdict(list)
+    def __init__(self, ttl: Optional[float] = None):
+        self._storage: Dict[Tuple[int, int], List[str]] = {}
+        self._versions: Dict[Tuple[int, int], int] = {}
+        self._expiration_tracker = None if ttl is None else ExpirationTracker(ttl)
 
     async def load_scenes(self, *, chat_id: int, user_id: int) -> List[str]:
-        return self._storage[chat_id, user_id][:]
+        return self._load((chat_id, user_id))
 
     async def save_scenes(self, scenes: List[str], *, chat_id: int, user_id: int) -> None:
-        self._storage[chat_id, user_id] = scenes[:]
+        self._save((chat_id, user_id), scenes)
+
+    async def load_many(self,
+                        keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], List[str]]:
+        return {key: self._load(key) for key in keys}
+
+    async def save_many(self, scenes: Dict[Tuple[int, int], List[str]]) -> None:
+        for key, user_scenes in scenes.items():
+            self._save(key, user_scenes)
+
+    async def update_scenes(self, scenes: List[str], length: int, stored_length: int,
+                            *, chat_id: int, user_id: int) -> bool:
+        key = chat_id, user_id
+        self._check_expiration(key)
+        stored_scenes = self._storage.get(key)
+        if (0 if stored_scenes is None else len(stored_scenes)) != stored_length:
+            return False
+
+        if stored_scenes is None:
+            stored_scenes = self._storage[key] = []
+        del stored_scenes[length:]
+        stored_scenes.extend(scenes)
+        self._versions[key] = self._versions.get(key, 0) + 1
+        if self._expiration_tracker is not None:
+            self._expiration_tracker.touch(key)
+
+        return True
+
+    async def load_versioned_scenes(self, *, chat_id: int, user_id: int) -> Tuple[List[str], int]:
+        key = chat_id, user_id
+        scenes = self._load(key)
+
+        return scenes, self._versions.get(key, 0)
+
+    async def compare_and_save_scenes(self, scenes: List[str], version: int,
+                                      *, chat_id: int, user_id: int) -> bool:
+        key = chat_id, user_id
+        self._check_expiration(key)
+        if self._versions.get(key, 0) != version:
+            return False
+
+        self._save(key, scenes)
+
+        return True
+
+    async def expire_scenes(self) -> int:
+        if self._expiration_tracker is None:
+            return 0
+
+        expired_keys = self._expiration_tracker.pop_expired()
+        for key in expired_keys:
+            del self._storage[key]
+            del self._versions[key]
+
+        return len(expired_keys)
+
+    def _load(self, key: Tuple[int, int]) -> List[str]:
+        if self._expiration_tracker is not None and key in self._storage:
+            if self._check_expiration(key):
+                return []
+            self._expiration_tracker.touch(key)
+
+        return self._storage.get(key, [])[:]
+
+    def _save(self, key: Tuple[int, int], scenes: List[str]) -> None:
+        self._storage[key] = scenes[:]
+        self._versions[key] = self._versions.get(key, 0) + 1
+        if self._expiration_tracker is not None:
+            self._expiration_tracker.touch(key)
+
+    def _check_expiration(self, key: Tuple[int, int]) -> bool:
+        if self._expiration_tracker is None or key not in self._storage:
+            return False
+        if not self._expiration_tracker.check(key):
+            return False
+
+        del self._storage[key]
+        del self._versions[key]
+        self._expiration_tracker.discard(key)
+
+        return True
@@ -0,0 +1,225 @@
+import asyncio
+from collections import deque
+from typing import Optional, Union, List, Dict, Tuple, Iterable, Deque, Any
+
+from tgbotscenario.asynchronous.scenes.storages.base import AbstractSceneStorage
+from tgbotscenario.common.codecs import AbstractSceneCodec, TextSceneCodec
+from tgbotscenario import errors
+
+
+Argument = Union[bytes, str, int]
+
+
+class RedisSceneStorage(AbstractSceneStorage):
+
+    def __init__(self, host: str = "localhost", port: int = 6379, *,
+                 password: Optional[str] = None, db: int = 0, prefix: str = "tgbotscenario:",
+                 codec: Optional[AbstractSceneCodec] = None, ttl: Optional[float] = None,
+                 max_connections: int = 4):
+        self._host = host
+        self._port = port
+        self._password = password
+        self._db = db
+        self._prefix = prefix
+        self._codec = codec or TextSceneCodec()
+        self._ttl = ttl
+        self._max_connections = max_connections
+        self._connections: List[_Connection] = []
+        self._connection_lock: Optional[asyncio.Lock] = None
+
+    async def load_scenes(self, *, chat_id: int, user_id: int) -> List[str]:
+        data = await self._execute(b"GET", self._make_key(chat_id, user_id))
+
+        return [] if data is None else self._codec.decode(data)
+
+    async def save_scenes(self, scenes: List[str], *, chat_id: int, user_id: int) -> None:
+        key = self._make_key(chat_id, user_id)
+        data = self._codec.encode(scenes)
+        if not data:
+            await self._execute(b"DEL", key)
+        elif self._ttl is None:
+            await self._execute(b"SET", key, data)
+        else:
+            await self._execute(b"SET", key, data, b"PX", max(int(self._ttl * 1000), 1))
+
+    async def load_many(self,
+                        keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], List[str]]:
+        keys = list(keys)
+        if not keys:
+            return {}
+
+        values = await self._execute(b"MGET", *(self._make_key(*i) for i in keys))
+
+        return {key: [] if data is None else self._codec.decode(data)
+                for key, data in zip(keys, values)}
+
+    async def save_many(self, scenes: Dict[Tuple[int, int], List[str]]) -> None:
+        # the commands are pipelined, so they take a single round trip
+        await asyncio.gather(*(self.save_scenes(user_scenes, chat_id=chat_id, user_id=user_id)
+                               for (chat_id, user_id), user_scenes in scenes.items()))
+
+    async def close(self) -> None:
+        connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        for connection in connections:
+            await connection.wait_closed()
+
+    def _make_key(self, chat_id: int, user_id: int) -> str:
+        return f"{self._prefix}{chat_id}:{user_id}"
+
+    async def _execute(self, *args: Argument) -> Any:
+        connection = await self._get_connection()
+
+        return await connection.execute(*args)
+
+    async def _get_connection(self) -> "_Connection":
+        # a new connection is opened only when all the opened ones are waiting for replies
+        connection = self._get_least_busy_connection()
+        if connection is not None:
+            if not connection or len(self._connections) >= self._max_connections:
+                return connection
+
+        if self._connection_lock is None:
+            self._connection_lock = asyncio.Lock()
+        async with self._connection_lock:
+            connection = self._get_least_busy_connection()
+            if connection is not None:
+                if not connection or len(self._connections) >= self._max_connections:
+                    return connection
+            connection = await self._connect()
+            self._connections.append(connection)
+
+        return connection
+
+    def _get_least_busy_connection(self) -> Optional["_Connection"]:
+        self._connections = [i for i in self._connections if not i.closed]
+
+        return min(self._connections, key=len, default=None)
+
+    async def _connect(self) -> "_Connection":
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        connection = _Connection(reader, writer)
+        try:
+            if self._password is not None:
+                await connection.execute(b"AUTH", self._password)
+            if self._db:
+                await connection.execute(b"SELECT", self._db)
+        except Exception:
+            connection.close()
+            raise
+
+        return connection
+
+
+class _Connection:
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._buffer: List[bytes] = []
+        self._closed = False
+        self._reading_task = asyncio.ensure_future(self._read_replies())
+
+    def __len__(self):
+        return len(self._waiters)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def execute(self, *args: Argument) -> asyncio.Future:
+        if self._closed:
+            raise ConnectionResetError("the connection is closed")
+
+        # the commands of the same loop iteration are written at once
+        loop = asyncio.get_running_loop()
+        if not self._buffer:
+            loop.call_soon(self._flush)
+        self._buffer.append(_encode_command(args))
+        future = loop.create_future()
+        self._waiters.append(future)
+
+        return future
+
+    def close(self) -> None:
+        self._reading_task.cancel()
+        self._fail(ConnectionResetError("the connection is closed"))
+
+    async def wait_closed(self) -> None:
+        await self._reading_task
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    def _flush(self) -> None:
+        if self._buffer and not self._closed:
+            self._writer.write(b"".join(self._buffer))
+        self._buffer.clear()
+
+    async def _read_replies(self) -> None:
+        try:
+            while True:
+                reply = await _read_reply(self._reader)
+                waiter = self._waiters.popleft()
+                if waiter.done():
+                    continue
+                if isinstance(reply, errors.RedisReplyError):
+                    waiter.set_exception(reply)
+                else:
+                    waiter.set_result(reply)
+        except asyncio.CancelledError:
+            pass
+        except Exception as error:
+            self._fail(error)
+
+    def _fail(self, error: Exception) -> None:
+        if self._closed:
+            return
+
+        self._closed = True
+        self._writer.close()
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_exception(error)
+
+
+def _encode_command(args: Tuple[Argument, ...]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, int):
+            arg = str(arg)
+        if isinstance(arg, str):
+            arg = arg.encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload
+    if kind == b"-":
+        return errors.RedisReplyError("the {reply!r} error has been replied!",
+                                      reply=payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await _read_reply(reader) for _ in range(length)]
+
+    raise errors.RedisReplyError("it is not possible to parse the {reply!r} reply!",
+                                 reply=line.decode(errors="replace"))
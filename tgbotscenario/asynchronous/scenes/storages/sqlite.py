@@ -0,0 +1,176 @@
+import asyncio
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional, Callable, List, Dict, Tuple, Iterable, Any
+
+from tgbotscenario.asynchronous.scenes.storages.base import AbstractVersionedSceneStorage
+from tgbotscenario.common.codecs import AbstractSceneCodec, TextSceneCodec
+
+
+_CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS scenes ("
+    "chat_id INTEGER NOT NULL, "
+    "user_id INTEGER NOT NULL, "
+    "scenes BLOB NOT NULL, "
+    "version INTEGER NOT NULL DEFAULT 1, "
+    "PRIMARY KEY (chat_id, user_id)"
+    ") WITHOUT ROWID"
+)
+_SELECT_COLUMNS = "PRAGMA table_info(scenes)"
+_ADD_VERSION_COLUMN = "ALTER TABLE scenes ADD COLUMN version INTEGER NOT NULL DEFAULT 1"
+_SELECT_SCENES = "SELECT scenes, version FROM scenes WHERE chat_id = ? AND user_id = ?"
+_UPSERT_SCENES = (
+    "INSERT INTO scenes (chat_id, user_id, scenes, version) VALUES (?, ?, ?, 1) "
+    "ON CONFLICT (chat_id, user_id) DO UPDATE "
+    "SET scenes = excluded.scenes, version = scenes.version + 1"
+)
+_INSERT_SCENES = (
+    "INSERT OR IGNORE INTO scenes (chat_id, user_id, scenes, version) VALUES (?, ?, ?, 1)"
+)
+_UPDATE_SCENES = (
+    "UPDATE scenes SET scenes = ?, version = version + 1 "
+    "WHERE chat_id = ? AND user_id = ? AND version = ?"
+)
+
+
+class SQLiteSceneStorage(AbstractVersionedSceneStorage):
+
+    def __init__(self, path: str, *, codec: Optional[AbstractSceneCodec] = None,
+                 commit_size: int = 1000):
+        self._path = path
+        self._codec = codec or TextSceneCodec()
+        self._commit_size = commit_size
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._uncommitted = 0
+        self._queued = 0
+        self._queued_lock = threading.Lock()
+
+    async def load_scenes(self, *, chat_id: int, user_id: int) -> List[str]:
+        return await self._execute(self._load_scenes, chat_id, user_id)
+
+    async def save_scenes(self, scenes: List[str], *, chat_id: int, user_id: int) -> None:
+        await self._execute(self._save_many, {(chat_id, user_id): scenes})
+
+    async def load_many(self,
+                        keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], List[str]]:
+        return await self._execute(self._load_many, list(keys))
+
+    async def save_many(self, scenes: Dict[Tuple[int, int], List[str]]) -> None:
+        await self._execute(self._save_many, dict(scenes))
+
+    async def load_versioned_scenes(self, *, chat_id: int, user_id: int) -> Tuple[List[str], int]:
+        return await self._execute(self._load_versioned_scenes, chat_id, user_id)
+
+    async def compare_and_save_scenes(self, scenes: List[str], version: int,
+                                      *, chat_id: int, user_id: int) -> bool:
+        return await self._execute(self._compare_and_save_scenes, scenes, version,
+                                   chat_id, user_id)
+
+    async def close(self) -> None:
+        await self._execute(self._close)
+        self._executor.shutdown()
+
+    async def _execute(self, function: Callable, *args: Any) -> Any:
+        with self._queued_lock:
+            self._queued += 1
+        future = self._executor.submit(self._run, function, *args)
+        future.add_done_callback(self._discard_cancelled)
+
+        return await asyncio.wrap_future(future)
+
+    def _discard_cancelled(self, future: Future) -> None:
+        # a work cancelled before its start isn't run, so it is unqueued here
+        if not future.cancelled():
+            return
+
+        with self._queued_lock:
+            self._queued -= 1
+        try:
+            self._executor.submit(self._commit_idle)
+        except RuntimeError:  # the storage is closed, and it commits on closing
+            pass
+
+    # the methods below are run in the storage thread only
+
+    def _run(self, function: Callable, *args: Any) -> Any:
+        try:
+            return function(*args)
+        finally:
+            with self._queued_lock:
+                self._queued -= 1
+                idle = not self._queued
+            # writes are committed in groups: when nothing else is queued or enough writes are made
+            if self._uncommitted and (idle or self._uncommitted >= self._commit_size):
+                self._connection.commit()
+                self._uncommitted = 0
+
+    def _commit_idle(self) -> None:
+        with self._queued_lock:
+            idle = not self._queued
+        if self._uncommitted and idle:
+            self._connection.commit()
+            self._uncommitted = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._connection = sqlite3.connect(self._path)
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute(_CREATE_TABLE)
+            # the tables created before versioning have no version column,
+            # their rows get the version 1 as any stored scenes
+            columns = {i[1] for i in self._connection.execute(_SELECT_COLUMNS)}
+            if "version" not in columns:
+                self._connection.execute(_ADD_VERSION_COLUMN)
+            self._connection.commit()
+
+        return self._connection
+
+    def _load_scenes(self, chat_id: int, user_id: int) -> List[str]:
+        scenes, _ = self._load_versioned_scenes(chat_id, user_id)
+
+        return scenes
+
+    def _load_versioned_scenes(self, chat_id: int, user_id: int) -> Tuple[List[str], int]:
+        row = self._connect().execute(_SELECT_SCENES, (chat_id, user_id)).fetchone()
+        if row is None:
+            return [], 0
+
+        return self._codec.decode(row[0]), row[1]
+
+    def _load_many(self, keys: List[Tuple[int, int]]) -> Dict[Tuple[int, int], List[str]]:
+        return {key: self._load_scenes(*key) for key in keys}
+
+    def _save_many(self, scenes: Dict[Tuple[int, int], List[str]]) -> None:
+        self._connect().executemany(
+            _UPSERT_SCENES,
+            [(chat_id, user_id, self._codec.encode(i)) for (chat_id, user_id), i in scenes.items()]
+        )
+        self._uncommitted += len(scenes)
+
+    def _compare_and_save_scenes(self, scenes: List[str], version: int,
+                                 chat_id: int, user_id: int) -> bool:
+        raw_scenes = self._codec.encode(scenes)
+        connection = self._connect()
+        try:
+            if version:
+                cursor = connection.execute(_UPDATE_SCENES, (raw_scenes, chat_id, user_id, version))
+            else:
+                cursor = connection.execute(_INSERT_SCENES, (chat_id, user_id, raw_scenes))
+        finally:
+            # a conditional save is committed at once: the other processes wait for the write lock,
+            # and the save must be durable when it is reported as successful
+            connection.commit()
+            self._uncommitted = 0
+
+        return cursor.rowcount == 1
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.commit()
+            self._connection.close()
+            self._connection = None
+            self._uncommitted = 0
+
@@ -0,0 +1,53 @@
+import asyncio
+from typing import Optional
+
+from tgbotscenario.asynchronous.scenes.storages.base import AbstractSceneStorage
+
+
+class SceneStorageSweeper:
+
+    def __init__(self, storage: AbstractSceneStorage, interval: float):
+        self._storage = storage
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+        self._expired_scenes = 0
+        self._failures = 0
+        self._last_error: Optional[Exception] = None
+
+    @property
+    def expired_scenes(self) -> int:
+        return self._expired_scenes
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        return self._last_error
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._sweep_periodically())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                self._expired_scenes += await self._storage.expire_scenes()
+            except Exception as error:  # the scenes are expired on the next sweep
+                self._failures += 1
+                self._last_error = error
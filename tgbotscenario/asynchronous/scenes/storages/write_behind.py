@@ -0,0 +1,124 @@
+import asyncio
+from typing import Optional, Dict, List, Tuple, Iterable
+
+from tgbotscenario.asynchronous.scenes.storages.base import AbstractSceneStorage
+
+
+class WriteBehindSceneStorage(AbstractSceneStorage):
+
+    def __init__(self, storage: AbstractSceneStorage, *, batch_size: int = 100,
+                 flush_interval: Optional[float] = 1.0):
+        self._storage = storage
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._buffer: Dict[Tuple[int, int], List[str]] = {}
+        self._flushing: Dict[Tuple[int, int], List[str]] = {}
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._failures = 0
+        self._last_error: Optional[Exception] = None
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    @property
+    def last_error(self) -> Optional[Exception]:
+        return self._last_error
+
+    async def load_scenes(self, *, chat_id: int, user_id: int) -> List[str]:
+        key = chat_id, user_id
+        try:
+            return self._buffer[key][:]
+        except KeyError:
+            pass
+        try:
+            return self._flushing[key][:]
+        except KeyError:
+            return await self._storage.load_scenes(chat_id=chat_id, user_id=user_id)
+
+    async def save_scenes(self, scenes: List[str], *, chat_id: int, user_id: int) -> None:
+        if self._closed:
+            await self._storage.save_scenes(scenes, chat_id=chat_id, user_id=user_id)
+            return
+
+        self._buffer[chat_id, user_id] = scenes[:]
+        self._start_flushing()
+        if len(self._buffer) >= self._batch_size:
+            await self._try_flushing()
+
+    async def load_many(self,
+                        keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], List[str]]:
+        scenes = {}
+        missing_keys = []
+        for key in keys:
+            try:
+                scenes[key] = self._buffer[key][:]
+            except KeyError:
+                try:
+                    scenes[key] = self._flushing[key][:]
+                except KeyError:
+                    missing_keys.append(key)
+        if missing_keys:
+            scenes.update(await self._storage.load_many(missing_keys))
+
+        return scenes
+
+    async def save_many(self, scenes: Dict[Tuple[int, int], List[str]]) -> None:
+        if self._closed:
+            await self._storage.save_many(scenes)
+            return
+
+        for key, user_scenes in scenes.items():
+            self._buffer[key] = user_scenes[:]
+        self._start_flushing()
+        if len(self._buffer) >= self._batch_size:
+            await self._try_flushing()
+
+    async def expire_scenes(self) -> int:
+        return await self._storage.expire_scenes()
+
+    async def flush(self) -> None:
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        async with self._flush_lock:
+            self._flushing, self._buffer = self._buffer, {}
+            try:
+                await self._storage.save_many(self._flushing)
+            except BaseException:
+                # unsaved scenes are returned unless they have been overwritten during flushing
+                for key, scenes in self._flushing.items():
+                    self._buffer.setdefault(key, scenes)
+                raise
+            finally:
+                self._flushing = {}
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    def _start_flushing(self) -> None:
+        if self._flush_interval is not None and self._flush_task is None:
+            self._flush_task = asyncio.ensure_future(self._flush_periodically())
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            await self._try_flushing()
+
+    async def _try_flushing(self) -> None:
+        # the scenes of the caller are buffered, so they don't fail because of the others
+        try:
+            await self.flush()
+        except Exception as error:  # scenes stay buffered, and they are flushed on the next try
+            self._failures += 1
+            self._last_error = error
@@ -0,0 +1,227 @@
+import asyncio
+import itertools
+import multiprocessing
+import os
+import pickle
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Connection, wait
+from typing import Optional, Callable, Awaitable, List, Dict, Tuple, Iterable, Any
+
+from tgbotscenario import errors
+
+
+# a factory is called in a worker with the shard number and returns the update handler,
+# so every worker owns its machine, scene storage and lock storage
+HandlerFactory = Callable[[int], Callable[[Any], Awaitable[Any]]]
+
+_POLL_INTERVAL = 0.5
+# a response is the request id followed by the pickled error and result
+_REQUEST_ID = struct.Struct("<Q")
+
+
+class ShardedDispatcher:
+
+    def __init__(self, factory: HandlerFactory, shards: Optional[int] = None,
+                 *, context: Optional[multiprocessing.context.BaseContext] = None):
+        self._factory = factory
+        self._shards = shards or os.cpu_count() or 1
+        self._context = context or multiprocessing.get_context("spawn")
+        self._processes: List[multiprocessing.process.BaseProcess] = []
+        self._requests: List[multiprocessing.Queue] = []
+        # every worker has its own response pipe, so a dead worker breaks only its own one
+        self._responses: List[Connection] = []
+        self._wakeup_reader: Optional[Connection] = None
+        self._wakeup_writer: Optional[Connection] = None
+        self._reading_thread: Optional[threading.Thread] = None
+        self._request_ids = itertools.count()
+        self._pending: Dict[int, Tuple[asyncio.AbstractEventLoop, asyncio.Future, int]] = {}
+        self._pending_lock = threading.Lock()
+
+    @property
+    def shards(self) -> int:
+        return self._shards
+
+    @property
+    def running(self) -> bool:
+        return self._reading_thread is not None
+
+    def get_shard(self, *, chat_id: int, user_id: int) -> int:
+        # the hash of integers isn't randomized, so a user has the same shard in every process
+        return hash((chat_id, user_id)) % self._shards
+
+    def start(self) -> None:
+        if self._reading_thread is not None:
+            return
+
+        for shard in range(self._shards):
+            requests = self._context.Queue()
+            response_reader, response_writer = self._context.Pipe(duplex=False)
+            process = self._context.Process(target=_run_worker, daemon=True,
+                                            args=(self._factory, shard, requests, response_writer))
+            process.start()
+            response_writer.close()  # the pipe is closed when the worker exits
+            self._requests.append(requests)
+            self._responses.append(response_reader)
+            self._processes.append(process)
+        self._wakeup_reader, self._wakeup_writer = multiprocessing.Pipe(duplex=False)
+        self._reading_thread = threading.Thread(target=self._read_responses, daemon=True)
+        self._reading_thread.start()
+
+    async def stop(self, timeout: Optional[float] = 10.0) -> None:
+        if self._reading_thread is None:
+            return
+
+        for requests in self._requests:
+            requests.put(None)
+        loop = asyncio.get_running_loop()
+        for process in self._processes:
+            await loop.run_in_executor(None, process.join, timeout)
+            if process.is_alive():
+                process.terminate()
+                await loop.run_in_executor(None, process.join, timeout)
+        self._wakeup_writer.send_bytes(b"")
+        await loop.run_in_executor(None, self._reading_thread.join, timeout)
+        self._fail_pending(range(self._shards))
+        for connection in (*self._responses, self._wakeup_reader, self._wakeup_writer):
+            connection.close()
+        for requests in self._requests:
+            requests.close()
+        self._processes.clear()
+        self._requests.clear()
+        self._responses.clear()
+        self._wakeup_reader = self._wakeup_writer = None
+        self._reading_thread = None
+
+    async def dispatch(self, update: Any, *, chat_id: int, user_id: int) -> Any:
+        shard = self.get_shard(chat_id=chat_id, user_id=user_id)
+        if self._reading_thread is None or not self._processes[shard].is_alive():
+            raise errors.ShardWorkerError(
+                "it is not possible to dispatch the update "
+                "because the worker of the {shard} shard isn't running!",
+                shard=shard
+            )
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        request_id = next(self._request_ids)
+        with self._pending_lock:
+            self._pending[request_id] = loop, future, shard
+        # the updates of a shard are queued in order, and its worker handles them in order per user
+        self._requests[shard].put((request_id, chat_id, user_id, update))
+
+        return await future
+
+    def _read_responses(self) -> None:
+        shards = {connection: shard for shard, connection in enumerate(self._responses)}
+        while True:
+            ready_connections = wait([*shards, self._wakeup_reader], _POLL_INTERVAL)
+            if self._wakeup_reader in ready_connections:
+                return
+            for connection in ready_connections:
+                try:
+                    data = connection.recv_bytes()
+                except Exception:  # the worker has exited, maybe in the middle of a response
+                    del shards[connection]
+                    continue
+                request_id, = _REQUEST_ID.unpack_from(data)
+                try:
+                    error, result = pickle.loads(data[_REQUEST_ID.size:])
+                except Exception as loading_error:
+                    error = RuntimeError(f"the response can't be unpickled: {loading_error!r}")
+                    result = None
+                with self._pending_lock:
+                    pending = self._pending.pop(request_id, None)
+                if pending is None:  # the worker has been considered stopped
+                    continue
+                loop, future, _ = pending
+                loop.call_soon_threadsafe(_set_future_result, future, error, result)
+
+            # a stopped worker fails the updates dispatched to it, even after its pipe is closed
+            stopped_shards = [i for i, process in enumerate(self._processes)
+                              if not process.is_alive()]
+            if stopped_shards:
+                self._fail_pending(stopped_shards)
+
+    def _fail_pending(self, shards: Iterable[int]) -> None:
+        shards = set(shards)
+        with self._pending_lock:
+            request_ids = [i for i, (_, _, shard) in self._pending.items() if shard in shards]
+            for request_id in request_ids:
+                loop, future, shard = self._pending.pop(request_id)
+                error = errors.ShardWorkerError(
+                    "the worker of the {shard} shard has stopped "
+                    "before handling the update!",
+                    shard=shard
+                )
+                loop.call_soon_threadsafe(_set_future_result, future, error, None)
+
+
+def _set_future_result(future: asyncio.Future, error: Optional[BaseException],
+                       result: Any) -> None:
+    if future.done():
+        return
+
+    if error is None:
+        future.set_result(result)
+    else:
+        future.set_exception(error)
+
+
+def _run_worker(factory: HandlerFactory, shard: int, requests: multiprocessing.Queue,
+                responses: Connection) -> None:
+    try:
+        asyncio.run(_serve(factory(shard), requests, responses))
+    finally:
+        responses.close()
+
+
+async def _serve(handler: Callable[[Any], Awaitable[Any]], requests: multiprocessing.Queue,
+                 responses: Connection) -> None:
+    loop = asyncio.get_running_loop()
+    # a pipe writing can block, and a single thread keeps the responses from interleaving
+    sending_executor = ThreadPoolExecutor(max_workers=1)
+    # the last task of a user, the next update of the user is handled after it
+    last_tasks: Dict[Tuple[int, int], asyncio.Task] = {}
+    while True:
+        request = await loop.run_in_executor(None, requests.get)
+        if request is None:
+            break
+        request_id, chat_id, user_id, update = request
+        key = chat_id, user_id
+        task = asyncio.ensure_future(
+            _handle(handler, request_id, update, last_tasks.get(key),
+                    responses, sending_executor)
+        )
+        last_tasks[key] = task
+        task.add_done_callback(lambda i, key=key: _remove_last_task(last_tasks, key, i))
+
+    if last_tasks:
+        await asyncio.wait(list(last_tasks.values()))
+    sending_executor.shutdown()
+
+
+async def _handle(handler: Callable[[Any], Awaitable[Any]], request_id: int, update: Any,
+                  previous_task: Optional[asyncio.Task], responses: Connection,
+                  sending_executor: ThreadPoolExecutor) -> None:
+    if previous_task is not None:
+        await asyncio.wait([previous_task])
+
+    try:
+        response = None, await handler(update)
+    except Exception as error:
+        response = error, None
+    try:
+        data = pickle.dumps(response)
+    except Exception as error:  # the dispatcher would fail to get it
+        data = pickle.dumps((RuntimeError(f"the response isn't picklable: {error!r}"), None))
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(sending_executor, responses.send_bytes,
+                               _REQUEST_ID.pack(request_id) + data)
+
+
+def _remove_last_task(last_tasks: Dict[Tuple[int, int], asyncio.Task], key: Tuple[int, int],
+                      task: asyncio.Task) -> None:
+    if last_tasks.get(key) is task:
+        del last_tasks[key]
@@ -0,0 +1,28 @@
+import time
+from typing import Optional
+
+from tgbotscenario.asynchronous.transitions.locks.storages.base import AbstractLockStorage
+from tgbotscenario.common.instrumentation import AbstractInstrumentation, LOCK_PHASE
+
+
+class LockContext:
+    __slots__ = ("_storage", "_chat_id", "_user_id", "_instrumentation")
+
+    def __init__(self, storage: AbstractLockStorage, *, chat_id: int, user_id: int,
+                 instrumentation: Optional[AbstractInstrumentation] = None):
+        self._storage = storage
+        self._chat_id = chat_id
+        self._user_id = user_id
+        self._instrumentation = instrumentation
+
+    async def __aenter__(self):
+        if self._instrumentation is None:
+            await self._storage.acquire_lock(chat_id=self._chat_id, user_id=self._user_id)
+            return
+
+        start_time = time.perf_counter()
+        await self._storage.acquire_lock(chat_id=self._chat_id, user_id=self._user_id)
+        self._instrumentation.observe_phase(LOCK_PHASE, time.perf_counter() - start_time)
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._storage.release_lock(chat_id=self._chat_id, user_id=self._user_id)
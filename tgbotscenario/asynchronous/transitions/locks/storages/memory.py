@@ -0,0 +1,22 @@
+from tgbotscenario.asynchronous.transitions.locks.storages.base import AbstractLockStorage
+from tgbotscenario.common.transitions.locks.storage import LockStorage
+from tgbotscenario import errors
+
+
+class MemoryLockStorage(AbstractLockStorage):
+
+    def __init__(self):
+        self._storage = LockStorage()
+
+    async def acquire_lock(self, *, chat_id: int, user_id: int) -> None:
+        if not self._storage.acquire_lock(chat_id=chat_id, user_id=user_id):
+            raise errors.LockExistsError(
+                "lock already exists (chat_id={chat_id!r}, user_id={user_id!r})!",
+                chat_id=chat_id, user_id=user_id
+            )
+
+    async def release_lock(self, *, chat_id: int, user_id: int) -> None:
+        self._storage.remove_lock(chat_id=chat_id, user_id=user_id)
+
+    async def check_lock(self, *, chat_id: int, user_id: int) -> bool:
+        return self._storage.check_lock(chat_id=chat_id, user_id=user_id)
@@ -0,0 +1,57 @@
+import asyncio
+from typing import Optional, Dict, Tuple
+
+from tgbotscenario.asynchronous.transitions.locks.storages.base import AbstractLockStorage
+from tgbotscenario import errors
+
+
+class QueueLockStorage(AbstractLockStorage):
+
+    def __init__(self, *, timeout: Optional[float] = None, queue_size: Optional[int] = None):
+        self._timeout = timeout
+        self._queue_size = queue_size
+        self._locks: Dict[Tuple[int, int], asyncio.Lock] = {}
+        self._counters: Dict[Tuple[int, int], int] = {}  # holder and waiters
+
+    async def acquire_lock(self, *, chat_id: int, user_id: int) -> None:
+        key = chat_id, user_id
+        try:
+            lock = self._locks[key]
+        except KeyError:
+            lock = self._locks[key] = asyncio.Lock()
+            self._counters[key] = 0
+
+        if self._queue_size is not None and self._counters[key] > self._queue_size:
+            raise errors.LockQueueOverflowError(
+                "lock already exists and its queue is full "
+                "(chat_id={chat_id!r}, user_id={user_id!r}, queue_size={queue_size!r})!",
+                chat_id=chat_id, user_id=user_id, queue_size=self._queue_size
+            )
+
+        self._counters[key] += 1
+        try:
+            await asyncio.wait_for(lock.acquire(), self._timeout)
+        except asyncio.TimeoutError:
+            self._discard(key)
+            raise errors.LockWaitingTimeoutError(
+                "lock hasn't been released in time "
+                "(chat_id={chat_id!r}, user_id={user_id!r}, timeout={timeout!r})!",
+                chat_id=chat_id, user_id=user_id, timeout=self._timeout
+            ) from None
+        except asyncio.CancelledError:
+            self._discard(key)
+            raise
+
+    async def release_lock(self, *, chat_id: int, user_id: int) -> None:
+        key = chat_id, user_id
+        self._locks[key].release()
+        self._discard(key)
+
+    async def check_lock(self, *, chat_id: int, user_id: int) -> bool:
+        return (chat_id, user_id) in self._locks
+
+    def _discard(self, key: Tuple[int, int]) -> None:
+        self._counters[key] -= 1
+        if not self._counters[key]:
+            del self._counters[key]
+            del self._locks[key]
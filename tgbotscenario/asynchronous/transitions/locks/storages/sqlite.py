@@ -0,0 +1,185 @@
+import asyncio
+import sqlite3
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Callable, Dict, Tuple, Any
+
+from tgbotscenario.asynchronous.transitions.locks.storages.base import AbstractLockStorage
+from tgbotscenario import errors
+
+
+_CREATE_TABLE = (
+    "CREATE TABLE IF NOT EXISTS locks ("
+    "chat_id INTEGER NOT NULL, "
+    "user_id INTEGER NOT NULL, "
+    "owner TEXT NOT NULL, "
+    "expires_at REAL NOT NULL, "
+    "PRIMARY KEY (chat_id, user_id)"
+    ") WITHOUT ROWID"
+)
+# an expired lease is taken over as if the lock didn't exist
+_ACQUIRE_LOCK = (
+    "INSERT INTO locks (chat_id, user_id, owner, expires_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT (chat_id, user_id) DO UPDATE "
+    "SET owner = excluded.owner, expires_at = excluded.expires_at "
+    "WHERE locks.expires_at <= ?"
+)
+_RENEW_LOCK = "UPDATE locks SET expires_at = ? WHERE chat_id = ? AND user_id = ? AND owner = ?"
+_RELEASE_LOCK = "DELETE FROM locks WHERE chat_id = ? AND user_id = ? AND owner = ?"
+_CHECK_LOCK = "SELECT 1 FROM locks WHERE chat_id = ? AND user_id = ? AND expires_at > ?"
+
+
+class SQLiteLockStorage(AbstractLockStorage):
+
+    def __init__(self, path: str, *, lease: float = 60.0, timeout: Optional[float] = 0.0,
+                 poll_interval: float = 0.05):
+        self._path = path
+        self._lease = lease
+        self._timeout = timeout
+        self._poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._owners: Dict[Tuple[int, int], str] = {}
+        # the lease of a held lock is renewed, so a long transition keeps it
+        self._renewal_tasks: Dict[Tuple[int, int], asyncio.Task] = {}
+        self._lost_locks = 0
+        self._last_lost_lock: Optional[errors.LockLostError] = None
+
+    @property
+    def lost_locks(self) -> int:
+        return self._lost_locks
+
+    @property
+    def last_lost_lock(self) -> Optional[errors.LockLostError]:
+        return self._last_lost_lock
+
+    async def acquire_lock(self, *, chat_id: int, user_id: int) -> None:
+        owner = uuid.uuid4().hex
+        loop = asyncio.get_running_loop()
+        deadline = None if self._timeout is None else loop.time() + self._timeout
+        while not await self._try_acquire_lock(chat_id, user_id, owner):
+            if deadline is not None and loop.time() >= deadline:
+                if not self._timeout:
+                    raise errors.LockExistsError(
+                        "lock already exists (chat_id={chat_id!r}, user_id={user_id!r})!",
+                        chat_id=chat_id, user_id=user_id
+                    )
+                raise errors.LockWaitingTimeoutError(
+                    "lock hasn't been released in time "
+                    "(chat_id={chat_id!r}, user_id={user_id!r}, timeout={timeout!r})!",
+                    chat_id=chat_id, user_id=user_id, timeout=self._timeout
+                )
+            await asyncio.sleep(self._poll_interval)
+
+        self._owners[chat_id, user_id] = owner
+        self._renewal_tasks[chat_id, user_id] = asyncio.ensure_future(
+            self._renew_periodically(chat_id, user_id, owner)
+        )
+
+    async def release_lock(self, *, chat_id: int, user_id: int) -> None:
+        owner = self._owners.pop((chat_id, user_id))
+        renewal_task = self._renewal_tasks.pop((chat_id, user_id), None)
+        if renewal_task is not None:
+            renewal_task.cancel()
+            try:
+                await renewal_task
+            except asyncio.CancelledError:
+                pass
+
+        # the transition has already been saved, so a lost lock is only recorded
+        if not await self._execute(self._release_lock, chat_id, user_id, owner):
+            self._lost_locks += 1
+            self._last_lost_lock = errors.LockLostError(
+                "lock has been lost before the releasing, "
+                "so another process could hold it at the same time "
+                "(chat_id={chat_id!r}, user_id={user_id!r})!",
+                chat_id=chat_id, user_id=user_id
+            )
+
+    async def check_lock(self, *, chat_id: int, user_id: int) -> bool:
+        return await self._execute(self._check_lock, chat_id, user_id)
+
+    async def close(self) -> None:
+        # the held locks aren't renewed anymore and expire as the locks of a crashed process
+        for renewal_task in self._renewal_tasks.values():
+            renewal_task.cancel()
+        await asyncio.gather(*self._renewal_tasks.values(), return_exceptions=True)
+        self._renewal_tasks.clear()
+        await self._execute(self._close)
+        self._executor.shutdown()
+
+    async def _renew_periodically(self, chat_id: int, user_id: int, owner: str) -> None:
+        while True:
+            await asyncio.sleep(self._lease / 3)
+            try:
+                if not await self._execute(self._renew_lock, chat_id, user_id, owner):
+                    return  # the lease has expired and been taken, the releasing raises the error
+            except sqlite3.Error:  # the lease is renewed on the next try
+                pass
+
+    async def _try_acquire_lock(self, chat_id: int, user_id: int, owner: str) -> bool:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._executor, self._acquire_lock, chat_id, user_id, owner)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # the storage thread can still acquire the lock, and then it is released at once
+            future.add_done_callback(
+                lambda i: self._release_cancelled_lock(i, chat_id, user_id, owner)
+            )
+            raise
+
+    def _release_cancelled_lock(self, future: asyncio.Future,
+                                chat_id: int, user_id: int, owner: str) -> None:
+        if future.cancelled() or future.exception() is not None or not future.result():
+            return
+
+        try:
+            self._executor.submit(self._release_lock, chat_id, user_id, owner)
+        except RuntimeError:  # the storage is closed, and the lock expires
+            pass
+
+    async def _execute(self, function: Callable, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(self._executor, function, *args)
+
+    # the methods below are run in the storage thread only
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            # every statement is committed at once to be visible to other processes
+            self._connection = sqlite3.connect(self._path, isolation_level=None)
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute(_CREATE_TABLE)
+
+        return self._connection
+
+    def _acquire_lock(self, chat_id: int, user_id: int, owner: str) -> bool:
+        now = time.time()
+        cursor = self._connect().execute(_ACQUIRE_LOCK,
+                                         (chat_id, user_id, owner, now + self._lease, now))
+
+        return cursor.rowcount == 1
+
+    def _renew_lock(self, chat_id: int, user_id: int, owner: str) -> bool:
+        cursor = self._connect().execute(_RENEW_LOCK,
+                                         (time.time() + self._lease, chat_id, user_id, owner))
+
+        return cursor.rowcount == 1
+
+    def _release_lock(self, chat_id: int, user_id: int, owner: str) -> bool:
+        cursor = self._connect().execute(_RELEASE_LOCK, (chat_id, user_id, owner))
+
+        return cursor.rowcount == 1
+
+    def _check_lock(self, chat_id: int, user_id: int) -> bool:
+        row = self._connect().execute(_CHECK_LOCK, (chat_id, user_id, time.time())).fetchone()
+
+        return row is not None
+
+    def _close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -1,8 +1,20 @@
 from .context import Context
 from .scenario import BaseScenario
+from .cache import LRUCache
+from .registry import SceneRegistry
+from .codecs import AbstractSceneCodec, TextSceneCodec, IntegerSceneCodec
+from .instrumentation import AbstractInstrumentation, MetricsAggregator, Histogram
 
 
 __all__ = [
     "Context",
-    "BaseScenario"
+    "BaseScenario",
+    "LRUCache",
+    "SceneRegistry",
+    "AbstractSceneCodec",
+    "TextSceneCodec",
+    "IntegerSceneCodec",
+    "AbstractInstrumentation",
+    "MetricsAggregator",
+    "Histogram"
 ]
@@ -0,0 +1,91 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Optional, Hashable, Tuple, TypeVar
+
+
+Value = TypeVar("Value")
+
+
+class LRUCache:
+
+    def __init__(self, *, max_size: Optional[int] = None, max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None):
+        self._max_size = max_size
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._entries: "OrderedDict[Hashable, Tuple[Value, Optional[float], int]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, item):
+        return item in self._entries
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        return self._evictions
+
+    def get(self, key: Hashable) -> Optional[Value]:
+        try:
+            value, expiration_time, _ = self._entries[key]
+        except KeyError:
+            self._misses += 1
+            return None
+
+        if expiration_time is not None and expiration_time <= time.monotonic():
+            self.remove(key)
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+
+        return value
+
+    def set(self, key: Hashable, value: Value) -> None:
+        self.remove(key)
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+
+        expiration_time = None if self._ttl is None else time.monotonic() + self._ttl
+        self._entries[key] = value, expiration_time, size
+        self._bytes += size
+        while ((self._max_size is not None and len(self._entries) > self._max_size) or
+               (self._max_bytes is not None and self._bytes > self._max_bytes)):
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self._evictions += 1
+
+    def add(self, key: Hashable, value: Value) -> None:
+        if key not in self._entries:
+            self.set(key, value)
+
+    def remove(self, key: Hashable) -> None:
+        try:
+            _, _, size = self._entries.pop(key)
+        except KeyError:
+            pass
+        else:
+            self._bytes -= size
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
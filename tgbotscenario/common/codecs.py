@@ -0,0 +1,78 @@
+import struct
+from abc import ABC, abstractmethod
+from typing import List
+
+from tgbotscenario.common.registry import SceneRegistry
+from tgbotscenario import errors
+
+
+class AbstractSceneCodec(ABC):
+    # the kind is written into snapshots, so they are read with the same codec
+    KIND = 0
+
+    @abstractmethod
+    def encode(self, scenes: List[str]) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> List[str]:
+        pass
+
+
+class TextSceneCodec(AbstractSceneCodec):
+    KIND = 1
+
+    def encode(self, scenes: List[str]) -> bytes:
+        return "\0".join(scenes).encode()
+
+    def decode(self, data: bytes) -> List[str]:
+        return data.decode().split("\0") if data else []
+
+
+class IntegerSceneCodec(AbstractSceneCodec):
+    KIND = 2
+    # the first byte is the width of the following scene ids
+    _BYTE_WIDTH = 1
+    _SHORT_WIDTH = 2
+    MAX_SCENE_ID = 0xFFFF
+
+    def __init__(self, registry: SceneRegistry):
+        self._registry = registry
+
+    @property
+    def registry(self) -> SceneRegistry:
+        return self._registry
+
+    def encode(self, scenes: List[str]) -> bytes:
+        if not scenes:
+            return b""
+
+        ids = [self._registry.get_id(i) for i in scenes]
+        max_id = max(ids)
+        if max_id <= 0xFF:
+            return bytes([self._BYTE_WIDTH, *ids])
+        if max_id > self.MAX_SCENE_ID:
+            raise errors.SceneIdOverflowError(
+                "it is not possible to encode the {scene!r} scene "
+                "because its {scene_id} id doesn't fit into two bytes!",
+                scene=scenes[ids.index(max_id)], scene_id=max_id
+            )
+
+        return struct.pack(f"<B{len(ids)}H", self._SHORT_WIDTH, *ids)
+
+    def decode(self, data: bytes) -> List[str]:
+        if not data:
+            return []
+
+        if data[0] == self._BYTE_WIDTH:
+            ids = data[1:]
+        elif data[0] == self._SHORT_WIDTH and len(data) % 2:
+            ids = struct.unpack_from(f"<{(len(data) - 1) // 2}H", data, 1)
+        else:
+            raise errors.SceneDecodingError(
+                "it is not possible to decode the {data!r} scenes "
+                "because they have an unknown id width or are truncated!",
+                data=data
+            )
+
+        return [self._registry.get_name(i) for i in ids]
@@ -0,0 +1,43 @@
+import time
+from collections import OrderedDict
+from typing import Hashable, List
+
+
+class ExpirationTracker:
+
+    def __init__(self, ttl: float):
+        self._ttl = ttl
+        self._access_times: "OrderedDict[Hashable, float]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._access_times)
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl
+
+    def touch(self, key: Hashable) -> None:
+        self._access_times[key] = time.monotonic()
+        self._access_times.move_to_end(key)
+
+    def check(self, key: Hashable) -> bool:
+        try:
+            return self._access_times[key] + self._ttl <= time.monotonic()
+        except KeyError:
+            return False
+
+    def discard(self, key: Hashable) -> None:
+        self._access_times.pop(key, None)
+
+    def pop_expired(self) -> List[Hashable]:
+        expired_keys = []
+        expiration_time = time.monotonic() - self._ttl
+        # keys are ordered by access time, so the scan stops at the first alive key
+        for key, access_time in self._access_times.items():
+            if access_time > expiration_time:
+                break
+            expired_keys.append(key)
+        for key in expired_keys:
+            del self._access_times[key]
+
+        return expired_keys
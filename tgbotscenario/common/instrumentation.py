@@ -0,0 +1,137 @@
+import bisect
+from abc import ABC, abstractmethod
+from typing import Optional, Callable, Hashable, Dict, Tuple, List
+
+
+LOCK_PHASE = "lock"
+LOAD_PHASE = "load"
+EXIT_PHASE = "exit"
+ENTER_PHASE = "enter"
+SAVE_PHASE = "save"
+PHASES = (LOCK_PHASE, LOAD_PHASE, EXIT_PHASE, ENTER_PHASE, SAVE_PHASE)
+
+
+class AbstractInstrumentation(ABC):
+
+    @abstractmethod
+    def observe_phase(self, phase: str, duration: float, *, scene: Optional[Hashable] = None,
+                      trigger: Optional[Callable] = None) -> None:
+        pass
+
+    @abstractmethod
+    def count_error(self, error: Exception) -> None:
+        pass
+
+
+class Histogram:
+    # upper bounds in seconds: from 1 microsecond to ~16.8 seconds
+    BOUNDS = tuple(0.000001 * 2 ** i for i in range(25))
+
+    def __init__(self):
+        self._buckets = [0] * (len(self.BOUNDS) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._min: Optional[float] = None
+        self._max: Optional[float] = None
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+    @property
+    def min(self) -> Optional[float]:
+        return self._min
+
+    @property
+    def max(self) -> Optional[float]:
+        return self._max
+
+    @property
+    def mean(self) -> Optional[float]:
+        if not self._count:
+            return None
+
+        return self._total / self._count
+
+    @property
+    def buckets(self) -> List[Tuple[float, int]]:
+        bounds = self.BOUNDS + (float("inf"),)
+
+        return list(zip(bounds, self._buckets))
+
+    def add(self, value: float) -> None:
+        self._buckets[bisect.bisect_left(self.BOUNDS, value)] += 1
+        self._count += 1
+        self._total += value
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    def get_percentile(self, percentile: float) -> Optional[float]:
+        if not self._count:
+            return None
+
+        rank = percentile / 100 * self._count
+        accumulated = 0
+        for index, count in enumerate(self._buckets):
+            accumulated += count
+            if accumulated >= rank and count:
+                # the bucket bound is an estimate, the observed extremes are exact
+                if index == len(self.BOUNDS):
+                    return self._max
+                return min(self.BOUNDS[index], self._max)
+
+        return self._max
+
+
+class MetricsAggregator(AbstractInstrumentation):
+
+    def __init__(self):
+        self._phases: Dict[str, Histogram] = {}
+        self._scene_phases: Dict[Tuple[str, Hashable], Histogram] = {}
+        self._trigger_phases: Dict[Tuple[str, Callable], Histogram] = {}
+        self._errors: Dict[str, int] = {}
+
+    @property
+    def errors(self) -> Dict[str, int]:
+        return self._errors.copy()
+
+    def observe_phase(self, phase: str, duration: float, *, scene: Optional[Hashable] = None,
+                      trigger: Optional[Callable] = None) -> None:
+        self._get_histogram(self._phases, phase).add(duration)
+        if scene is not None:
+            self._get_histogram(self._scene_phases, (phase, scene)).add(duration)
+        if trigger is not None:
+            self._get_histogram(self._trigger_phases, (phase, trigger)).add(duration)
+
+    def count_error(self, error: Exception) -> None:
+        name = type(error).__name__
+        self._errors[name] = self._errors.get(name, 0) + 1
+
+    def get_histogram(self, phase: str) -> Optional[Histogram]:
+        return self._phases.get(phase)
+
+    def get_scene_histogram(self, phase: str, scene: Hashable) -> Optional[Histogram]:
+        return self._scene_phases.get((phase, scene))
+
+    def get_trigger_histogram(self, phase: str, trigger: Callable) -> Optional[Histogram]:
+        return self._trigger_phases.get((phase, trigger))
+
+    def reset(self) -> None:
+        self._phases.clear()
+        self._scene_phases.clear()
+        self._trigger_phases.clear()
+        self._errors.clear()
+
+    @staticmethod
+    def _get_histogram(histograms: Dict, key: Hashable) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram()
+
+        return histogram
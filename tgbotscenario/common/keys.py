@@ -0,0 +1,22 @@
+import struct
+from typing import Union, Tuple
+
+
+Key = Union[int, bytes]
+
+_GROUP_KEY = struct.Struct("<qq")
+
+
+def pack_key(chat_id: int, user_id: int) -> Key:
+    # a private chat has the same id as its user, so a single 64-bit id is enough
+    if chat_id == user_id:
+        return user_id
+
+    return _GROUP_KEY.pack(chat_id, user_id)
+
+
+def unpack_key(key: Key) -> Tuple[int, int]:
+    if isinstance(key, int):
+        return key, key
+
+    return _GROUP_KEY.unpack(key)
@@ -1,4 +1,4 @@
-from typing import List, Optional, TypeVar
+from typing import List, Dict, Tuple, Optional, TypeVar
 
 from tgbotscenario import errors
 
@@ -8,12 +8,33 @@ Item = TypeVar("Item")
 
 class Magazine:
 
-    def __init__(self, items: List[Item]):
+    def __init__(self, items: List[Item], max_depth: Optional[int] = None,
+                 stored_length: Optional[int] = None, storage_version: Optional[int] = None):
         if not items:
             raise errors.MagazineInitializationError(
                 "magazine can't be empty!"
             )
+        if max_depth is not None and max_depth < 2:
+            raise errors.MagazineInitializationError(
+                "magazine depth can't be less than 2!"
+            )
         self._items = items[:]
+        self._max_depth = max_depth
+        self._version = 0
+        self._saved_version = 0
+        self._storage_version = storage_version
+        # the stored items and the length of their prefix that is still equal to the items
+        self._stored_length = len(self._items) if stored_length is None else stored_length
+        self._synced_length = min(self._stored_length, len(self._items))
+        # the items after the initial one with their positions increased by the evicted items
+        self._indexes: Dict[Item, int] = {}
+        self._offset = 0
+        self._index_items()
+        if max_depth is not None and len(self._items) > max_depth:
+            del self._items[1:len(self._items) - max_depth + 1]
+            self._version += 1
+            self._synced_length = min(self._synced_length, 1)
+            self._index_items()
 
     def __eq__(self, other):
         return self._items == other
@@ -21,9 +42,32 @@ class Magazine:
     def __iter__(self):
         return iter(self._items)
 
+    def __len__(self):
+        return len(self._items)
+
     def __repr__(self):
         return f"{type(self).__name__}({self._items!r})"
 
+    @property
+    def max_depth(self) -> Optional[int]:
+        return self._max_depth
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def storage_version(self) -> Optional[int]:
+        return self._storage_version
+
+    @property
+    def stored_length(self) -> int:
+        return self._stored_length
+
+    @property
+    def changed(self) -> bool:
+        return self._version != self._saved_version
+
     @property
     def current(self) -> Item:
         return self._items[-1]
@@ -36,9 +80,88 @@ class Magazine:
             return None
 
     def set(self, item: Item) -> None:
-        try:
-            index = self._items.index(item)
-        except ValueError:
+        index = self._find(item)
+        if index is None:
+            self._version += 1
+            self._indexes[item] = len(self._items) + self._offset
             self._items.append(item)
+            if self._max_depth is not None and len(self._items) > self._max_depth:
+                # the oldest item is evicted, but the initial one is kept
+                del self._indexes[self._items[1]]
+                del self._items[1]
+                self._offset += 1
+                self._synced_length = min(self._synced_length, 1)
         else:
+            if index == len(self._items) - 1:
+                return
+            self._version += 1
+            for removed_item in self._items[index+1:]:
+                del self._indexes[removed_item]
             del self._items[index+1:]
+            self._synced_length = min(self._synced_length, index + 1)
+
+    def restore(self, items: List[Item]) -> None:
+        if not items:
+            raise errors.MagazineInitializationError(
+                "magazine can't be empty!"
+            )
+        common_length = _get_common_length(self._items, items)
+        if common_length == len(self._items) == len(items):
+            return
+
+        self._version += 1
+        self._items = items[:]
+        self._synced_length = min(self._synced_length, common_length)
+        self._index_items()
+
+    def get_delta(self) -> Tuple[Optional[int], List[Item]]:
+        # the stored items must be truncated to the length (if it's not None) and extended
+        truncation_length = None
+        if self._stored_length > self._synced_length:
+            truncation_length = self._synced_length
+
+        return truncation_length, self._items[self._synced_length:]
+
+    def commit(self, storage_version: Optional[int] = None) -> None:
+        self._saved_version = self._version
+        self._storage_version = storage_version
+        self._stored_length = self._synced_length = len(self._items)
+
+    def _find(self, item: Item) -> Optional[int]:
+        if item == self._items[0]:
+            return 0
+        index = self._indexes.get(item)
+
+        return None if index is None else index - self._offset
+
+    def _index_items(self) -> None:
+        # a repeated item (in corrupted or old stored items) is a return to it,
+        # so the items after its previous occurrence are dropped as if it was set
+        items = self._items[:1]
+        self._indexes.clear()
+        self._offset = 0
+        for item in self._items[1:]:
+            index = 0 if item == items[0] else self._indexes.get(item)
+            if index is None:
+                self._indexes[item] = len(items)
+                items.append(item)
+                continue
+            for removed_item in items[index+1:]:
+                del self._indexes[removed_item]
+            del items[index+1:]
+
+        if len(items) != len(self._items):
+            self._version += 1
+            self._synced_length = min(self._synced_length,
+                                      _get_common_length(self._items, items))
+            self._items = items
+
+
+def _get_common_length(items: List[Item], other_items: List[Item]) -> int:
+    common_length = 0
+    for item, other_item in zip(items, other_items):
+        if item != other_item:
+            break
+        common_length += 1
+
+    return common_length
@@ -0,0 +1,129 @@
+import contextlib
+import json
+import os
+import threading
+from typing import Optional, Dict, List, Iterator
+
+try:
+    import fcntl
+except ImportError:  # the registry file isn't locked on Windows
+    fcntl = None
+
+from tgbotscenario import errors
+
+
+class SceneRegistry:
+    VERSION = 1
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._revision = 0
+        self._lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    def __len__(self):
+        return len(self._names)
+
+    @property
+    def revision(self) -> int:
+        return self._revision
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._names)
+
+    def register(self, *names: str) -> None:
+        for name in names:
+            self.get_id(name)
+
+    def get_id(self, name: str) -> int:
+        try:
+            return self._ids[name]
+        except KeyError:
+            pass
+
+        # the processes sharing the file register the names one by one with the latest ids
+        with self._lock, self._lock_file():
+            self._reload()
+            if name not in self._ids:
+                self._ids[name] = len(self._names)
+                self._names.append(name)
+                self._revision += 1
+                self._save()
+
+        return self._ids[name]
+
+    def find_id(self, name: str) -> Optional[int]:
+        # unlike get_id, an unknown name isn't registered
+        if name not in self._ids:
+            with self._lock, self._lock_file():
+                self._reload()
+
+        return self._ids.get(name)
+
+    def get_name(self, scene_id: int) -> str:
+        if scene_id >= len(self._names):  # the name may be registered by another process
+            with self._lock, self._lock_file():
+                self._reload()
+
+        try:
+            return self._names[scene_id]
+        except IndexError:
+            raise errors.UnknownSceneIdError(
+                "it is not possible to get the scene name for the {scene_id!r} id "
+                "because it hasn't been registered!",
+                scene_id=scene_id
+            ) from None
+
+    @contextlib.contextmanager
+    def _lock_file(self) -> Iterator[None]:
+        if self._path is None or fcntl is None:
+            yield
+            return
+
+        with open(f"{self._path}.lock", "a") as file:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+    def _reload(self) -> None:
+        if self._path is not None and os.path.exists(self._path):
+            self._load()
+
+    def _load(self) -> None:
+        with open(self._path, encoding="utf-8") as file:
+            data = json.load(file)
+
+        if data["version"] != self.VERSION:
+            raise errors.SceneRegistryVersionError(
+                "it is not possible to load the scene registry {path!r} "
+                "because its version {version!r} is not supported!",
+                path=self._path, version=data["version"]
+            )
+        # the names are only appended, so the known ones must keep their ids
+        if data["scenes"][:len(self._names)] != self._names:
+            raise errors.SceneRegistryConflictError(
+                "it is not possible to load the scene registry {path!r} "
+                "because it assigns other ids to the registered scenes!",
+                path=self._path
+            )
+        self._names = data["scenes"]
+        self._ids = {name: scene_id for scene_id, name in enumerate(self._names)}
+        self._revision = data["revision"]
+
+    def _save(self) -> None:
+        if self._path is None:
+            return
+
+        temporary_path = f"{self._path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump({"version": self.VERSION, "revision": self._revision,
+                       "scenes": self._names}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self._path)
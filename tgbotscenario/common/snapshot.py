@@ -0,0 +1,146 @@
+import mmap
+import os
+import struct
+import threading
+from typing import Optional, Iterable, Iterator, List, Tuple
+
+from tgbotscenario import errors
+
+
+# the layout: a header (with the kind of the codec), the sorted keys, the offsets of their values
+# in the blob (and its end), the NUL-joined scene names of the codec and the blob of the scenes
+_HEADER = struct.Struct("<4sBBxxQQQ")
+_MAGIC = b"TGSN"
+_VERSION = 2
+_KEY = struct.Struct(">qq")
+_OFFSET = struct.Struct("<Q")
+
+Record = Tuple[int, int, bytes]
+
+
+class SceneSnapshot:
+
+    def __init__(self, path: str):
+        self._path = path
+        # the mapping is closed when the last reader releases the closed snapshot
+        self._readers = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size < _HEADER.size:
+                magic = version = None
+            else:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                (magic, version, self._codec_kind, self._count, self._names_offset,
+                 self._blob_offset) = _HEADER.unpack_from(self._map)
+        if magic != _MAGIC or version != _VERSION:
+            if magic is not None:
+                self._map.close()
+            raise errors.CorruptedSnapshotError(
+                "it is not possible to read the {path!r} snapshot "
+                "because it has an unknown format!",
+                path=path
+            )
+        self._offsets_offset = _HEADER.size + self._count * _KEY.size
+        # the offsets are checked when they are read, the sections must fit into the file
+        end = self._offsets_offset + (self._count + 1) * _OFFSET.size
+        if not end <= self._names_offset <= self._blob_offset <= len(self._map):
+            self._map.close()
+            raise errors.CorruptedSnapshotError(
+                "it is not possible to read the {path!r} snapshot "
+                "because it is truncated or damaged!",
+                path=path
+            )
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self) -> Iterator[Record]:
+        for index in range(self._count):
+            chat_id, user_id = _KEY.unpack_from(self._map, _HEADER.size + index * _KEY.size)
+            yield chat_id, user_id, self._get_value(index)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def codec_kind(self) -> int:
+        return self._codec_kind
+
+    @property
+    def names(self) -> List[str]:
+        data = self._map[self._names_offset:self._blob_offset]
+
+        return data.decode().split("\0") if data else []
+
+    def get(self, chat_id: int, user_id: int) -> Optional[bytes]:
+        key = _KEY.pack(chat_id, user_id)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            offset = _HEADER.size + middle * _KEY.size
+            middle_key = self._map[offset:offset + _KEY.size]
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle
+            else:
+                return self._get_value(middle)
+
+        return None
+
+    def acquire(self) -> None:
+        with self._lock:
+            self._readers += 1
+
+    def release(self) -> None:
+        with self._lock:
+            self._readers -= 1
+            if self._closed and not self._readers:
+                self._map.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            if not self._readers:
+                self._map.close()
+
+    def _get_value(self, index: int) -> bytes:
+        offset = self._offsets_offset + index * _OFFSET.size
+        start, = _OFFSET.unpack_from(self._map, offset)
+        end, = _OFFSET.unpack_from(self._map, offset + _OFFSET.size)
+        if not start <= end <= len(self._map) - self._blob_offset:
+            raise errors.CorruptedSnapshotError(
+                "it is not possible to read the {path!r} snapshot "
+                "because it is damaged at the {offset} offset!",
+                path=self._path, offset=offset
+            )
+
+        return self._map[self._blob_offset + start:self._blob_offset + end]
+
+
+def write_snapshot(path: str, records: Iterable[Record], codec_kind: int,
+                   names: Iterable[str] = ()) -> None:
+    sorted_records = sorted((_KEY.pack(chat_id, user_id), data)
+                            for chat_id, user_id, data in records)
+    raw_names = "\0".join(names).encode()
+    names_offset = _HEADER.size + len(sorted_records) * (_KEY.size + _OFFSET.size) + _OFFSET.size
+
+    temporary_path = f"{path}.tmp"
+    with open(temporary_path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, _VERSION, codec_kind, len(sorted_records), names_offset,
+                                names_offset + len(raw_names)))
+        for key, _ in sorted_records:
+            file.write(key)
+        offset = 0
+        for _, data in sorted_records:
+            file.write(_OFFSET.pack(offset))
+            offset += len(data)
+        file.write(_OFFSET.pack(offset))
+        file.write(raw_names)
+        for _, data in sorted_records:
+            file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary_path, path)
@@ -1,24 +1,70 @@
-from typing import Dict, Set
+import threading
+from typing import List, Set
+
+from tgbotscenario.common.keys import Key, pack_key
 
 
 class LockStorage:
+    # the locks are the packed keys, a private chat key is the user id itself and isn't allocated
 
     def __init__(self):
-        self._storage: Dict[int, Set[int]] = {}
+        self._locks: Set[Key] = set()
+
+    def __len__(self):
+        return len(self._locks)
 
     def add_lock(self, *, chat_id: int, user_id: int) -> None:
-        try:
-            self._storage[chat_id].add(user_id)
-        except KeyError:
-            self._storage[chat_id] = {user_id}
+        self._locks.add(pack_key(chat_id, user_id))
+
+    def acquire_lock(self, *, chat_id: int, user_id: int) -> bool:
+        key = pack_key(chat_id, user_id)
+        if key in self._locks:
+            return False
+        self._locks.add(key)
+
+        return True
 
     def remove_lock(self, *, chat_id: int, user_id: int) -> None:
-        self._storage[chat_id].remove(user_id)
-        if not self._storage[chat_id]:
-            del self._storage[chat_id]
+        self._locks.remove(pack_key(chat_id, user_id))
 
     def check_lock(self, *, chat_id: int, user_id: int) -> bool:
-        try:
-            return user_id in self._storage[chat_id]
-        except KeyError:
-            return False
+        return pack_key(chat_id, user_id) in self._locks
+
+
+class StripedLockStorage:
+    # the locks are split into stripes guarded by their own mutexes to be used from threads
+
+    def __init__(self, stripes: int = 16):
+        self._stripes: List[Set[Key]] = [set() for _ in range(stripes)]
+        self._mutexes = [threading.Lock() for _ in range(stripes)]
+
+    def __len__(self):
+        return sum(len(i) for i in self._stripes)
+
+    def add_lock(self, *, chat_id: int, user_id: int) -> None:
+        key = pack_key(chat_id, user_id)
+        index = hash(key) % len(self._stripes)
+        with self._mutexes[index]:
+            self._stripes[index].add(key)
+
+    def acquire_lock(self, *, chat_id: int, user_id: int) -> bool:
+        key = pack_key(chat_id, user_id)
+        index = hash(key) % len(self._stripes)
+        with self._mutexes[index]:
+            if key in self._stripes[index]:
+                return False
+            self._stripes[index].add(key)
+
+        return True
+
+    def remove_lock(self, *, chat_id: int, user_id: int) -> None:
+        key = pack_key(chat_id, user_id)
+        index = hash(key) % len(self._stripes)
+        with self._mutexes[index]:
+            self._stripes[index].remove(key)
+
+    def check_lock(self, *, chat_id: int, user_id: int) -> bool:
+        key = pack_key(chat_id, user_id)
+        index = hash(key) % len(self._stripes)
+        with self._mutexes[index]:
+            return key in self._stripes[index]
@@ -1,4 +1,4 @@
-from typing import Optional, Dict, TypeVar
+from typing import Optional, Dict, List, Set, Tuple, TypeVar
 
 from tgbotscenario import errors
 
@@ -21,9 +21,33 @@ class TransitionScheme:
                 ]
             ]
         ] = {}
+        self._incoming_transitions: Dict[
+            Scene,  # destination scenes
+            Dict[
+                Tuple[Scene, Trigger, Optional[Direction]],  # source scenes, triggers, directions
+                None
+            ]
+        ] = {}
+        self._frozen = False
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    def freeze(self) -> None:
+        self._frozen = True
 
     def add_transition(self, source_scene: Scene, destination_scene: Scene,
                        trigger: Trigger, direction: Optional[Direction] = None) -> None:
+        if self._frozen:
+            raise errors.TransitionSchemeFrozenError(
+                "it is not possible to add the transition "
+                "(source_scene={source_scene!r}, destination_scene={destination_scene!r}, "
+                "trigger={trigger!r}, direction={direction!r}) "
+                "because the transition scheme is frozen!",
+                source_scene=source_scene, destination_scene=destination_scene,
+                trigger=trigger, direction=direction
+            )
         existing_destination_scene = self._get_destination_scene(source_scene, trigger, direction)
         if existing_destination_scene is destination_scene:
             raise errors.TransitionExistsError(
@@ -48,24 +72,26 @@ class TransitionScheme:
         self._scheme \
             .setdefault(source_scene, {}) \
             .setdefault(trigger, {})[direction] = destination_scene
+        self._incoming_transitions \
+            .setdefault(destination_scene, {})[source_scene, trigger, direction] = None
 
     def check_transition(self, source_scene: Scene, destination_scene: Scene,
                          trigger: Trigger, direction: Optional[Direction] = None) -> bool:
         return self._get_destination_scene(source_scene, trigger, direction) is destination_scene
 
     def check_scene(self, scene: Scene) -> bool:
-        for source_scene in self._scheme:
-            if source_scene is scene:
-                return True
-            for trigger in self._scheme[source_scene]:
-                for destination_scene in self._scheme[source_scene][trigger].values():
-                    if destination_scene is scene:
-                        return True
-
-        return False
+        return scene in self._scheme or scene in self._incoming_transitions
 
     def remove_transition(self, source_scene: Scene, trigger: Trigger,
                           direction: Optional[Direction] = None) -> Scene:
+        if self._frozen:
+            raise errors.TransitionSchemeFrozenError(
+                "it is not possible to remove the transition "
+                "(source_scene={source_scene!r}, "
+                "trigger={trigger!r}, direction={direction!r}) "
+                "because the transition scheme is frozen!",
+                source_scene=source_scene, trigger=trigger, direction=direction
+            )
         try:
             destination_scene = self._scheme[source_scene][trigger].pop(direction)
         except KeyError:
@@ -82,8 +108,29 @@ class TransitionScheme:
             if not self._scheme[source_scene]:
                 del self._scheme[source_scene]
 
+        incoming_transitions = self._incoming_transitions[destination_scene]
+        del incoming_transitions[source_scene, trigger, direction]
+        if not incoming_transitions:
+            del self._incoming_transitions[destination_scene]
+
         return destination_scene
 
+    def get_incoming_transitions(self,
+                                 scene: Scene) -> List[Tuple[Scene, Trigger, Optional[Direction]]]:
+        return list(self._incoming_transitions.get(scene, ()))
+
+    def get_reachable_scenes(self, scene: Scene) -> Set[Scene]:
+        reachable_scenes = {scene}
+        unvisited_scenes = [scene]
+        while unvisited_scenes:
+            for destination_scenes in self._scheme.get(unvisited_scenes.pop(), {}).values():
+                for destination_scene in destination_scenes.values():
+                    if destination_scene not in reachable_scenes:
+                        reachable_scenes.add(destination_scene)
+                        unvisited_scenes.append(destination_scene)
+
+        return reachable_scenes
+
     def get_destination_scene(self, source_scene: Scene, trigger: Trigger,
                               direction: Optional[Direction] = None) -> Scene:
         try:
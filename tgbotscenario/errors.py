@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Any, Optional, Callable
+from typing import Any, Optional, Callable, Set
 
 from xcept import Exception_
 
@@ -56,6 +56,21 @@ class LockExistsError(BaseError):
     user_id: int
 
 
+@dataclass
+class LockQueueOverflowError(LockExistsError):
+    queue_size: int
+
+
+@dataclass
+class LockWaitingTimeoutError(LockExistsError):
+    timeout: float
+
+
+@dataclass
+class LockLostError(LockExistsError):
+    pass
+
+
 @dataclass
 class MagazineInitializationError(BaseError):
     pass
@@ -68,6 +83,33 @@ class UnknownSceneError(BaseError):
     scene: str
 
 
+@dataclass
+class UnknownSceneIdError(BaseError):
+    scene_id: int
+
+
+@dataclass
+class SceneRegistryVersionError(BaseError):
+    path: str
+    version: int
+
+
+@dataclass
+class SceneRegistryConflictError(BaseError):
+    path: str
+
+
+@dataclass
+class SceneIdOverflowError(BaseError):
+    scene: str
+    scene_id: int
+
+
+@dataclass
+class SceneDecodingError(BaseError):
+    data: bytes
+
+
 @dataclass
 class MappingKeyBusyError(BaseError):
     key: str
@@ -132,3 +174,44 @@ class SceneSettingError(BaseError):
 @dataclass
 class SceneNotFoundError(BaseError):
     scene: BaseScene
+
+
+@dataclass
+class TransitionSchemeFrozenError(BaseError):
+    source_scene: BaseScene
+    trigger: Callable
+    direction: Optional[str]
+    destination_scene: Optional[BaseScene] = None
+
+
+@dataclass
+class UnreachableSceneError(BaseError):
+    scenes: Set[BaseScene]
+
+
+@dataclass
+class UnversionedSceneStorageError(BaseError):
+    storage: Any
+
+
+@dataclass
+class SceneConflictError(BaseError):
+    chat_id: int
+    user_id: int
+    version: int
+
+
+@dataclass
+class CorruptedSnapshotError(BaseError):
+    path: str
+    offset: Optional[int] = None
+
+
+@dataclass
+class RedisReplyError(BaseError):
+    reply: str
+
+
+@dataclass
+class ShardWorkerError(BaseError):
+    shard: int
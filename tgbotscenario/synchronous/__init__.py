@@ -0,0 +1,18 @@
+from .machine import Machine
+from .context_machine import ContextMachine
+from .scenes.scene import Scene
+from .scenes.storages.base import AbstractSceneStorage
+from .scenes.storages.memory import MemorySceneStorage
+from .transitions.locks.storages.base import AbstractLockStorage
+from .transitions.locks.storages.memory import MemoryLockStorage
+
+
+__all__ = [
+    "Machine",
+    "ContextMachine",
+    "Scene",
+    "AbstractSceneStorage",
+    "MemorySceneStorage",
+    "AbstractLockStorage",
+    "MemoryLockStorage"
+]
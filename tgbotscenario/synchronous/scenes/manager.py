@@ -0,0 +1,148 @@
+import threading
+from typing import Optional, Set, List, Dict, Tuple, Iterable
+
+from tgbotscenario.synchronous.scenes.storages.base import AbstractSceneStorage
+from tgbotscenario.synchronous.scenes.scene import Scene
+from tgbotscenario.common.mapping import Mapping
+from tgbotscenario.common.cache import LRUCache
+from tgbotscenario.common.magazine import Magazine
+from tgbotscenario import errors
+
+
+class SceneManager:
+
+    def __init__(self, initial_scene: Scene, storage: AbstractSceneStorage,
+                 cache: Optional[LRUCache] = None, max_depth: Optional[int] = None):
+        self._mapping = Mapping()
+        self._storage = storage
+        self._cache = cache
+        # the cache and the counter are shared by the threads
+        self._lock = threading.Lock()
+        self._max_depth = max_depth
+        self._skipped_saves = 0
+        self._scenes: Set[Scene] = set()
+        self._initial_scene = initial_scene
+        self.add_scene(initial_scene)
+
+    @property
+    def initial_scene(self) -> Scene:
+        return self._initial_scene
+
+    @property
+    def scenes(self) -> Set[Scene]:
+        return self._scenes.copy()
+
+    @property
+    def skipped_saves(self) -> int:
+        return self._skipped_saves
+
+    def add_scene(self, scene: Scene) -> None:
+        try:
+            self._mapping.add(key=scene.name, value=scene)
+        except errors.MappingKeyBusyError as error:
+            raise errors.DuplicateSceneNameError(
+                "it is not possible to add the scene named {name!r}, "
+                "because a scene with the same name has already been added!",
+                name=error.key
+            ) from None
+
+        self._scenes.add(scene)
+
+    def remove_scene(self, scene: Scene) -> None:
+        try:
+            self._mapping.remove(key=scene.name, value=scene)
+        except errors.MappingDataNotFoundError:
+            raise errors.SceneNotFoundError(
+                "it is not possible to remove the {scene!r} scene "
+                "because it has not been added!",
+                scene=scene
+            ) from None
+
+        self._scenes.remove(scene)
+        if self._cache is not None:
+            with self._lock:
+                self._cache.clear()
+
+    def load_magazine(self, *, chat_id: int, user_id: int) -> Magazine:
+        magazine = self._get_cached_magazine((chat_id, user_id))
+        if magazine is not None:
+            return magazine
+
+        raw_scenes = self._storage.load_scenes(chat_id=chat_id, user_id=user_id)
+        magazine = self._make_magazine(raw_scenes, chat_id=chat_id, user_id=user_id)
+        self._add_cached_magazine((chat_id, user_id), magazine)
+
+        return magazine
+
+    def load_magazines(self, keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], Magazine]:
+        magazines = {}
+        missing_keys = []
+        for key in keys:
+            magazine = self._get_cached_magazine(key)
+            if magazine is None:
+                missing_keys.append(key)
+            else:
+                magazines[key] = magazine
+
+        if missing_keys:
+            raw_scenes = self._storage.load_many(missing_keys)
+            for (chat_id, user_id), user_raw_scenes in raw_scenes.items():
+                magazine = self._make_magazine(user_raw_scenes, chat_id=chat_id, user_id=user_id)
+                magazines[chat_id, user_id] = magazine
+                self._add_cached_magazine((chat_id, user_id), magazine)
+
+        return magazines
+
+    def save_magazine(self, magazine: Magazine, *, chat_id: int, user_id: int) -> None:
+        if not magazine.changed:
+            with self._lock:
+                self._skipped_saves += 1
+            return
+
+        raw_scenes = [self._mapping.get_key(i) for i in magazine]
+        try:
+            self._storage.save_scenes(raw_scenes, chat_id=chat_id, user_id=user_id)
+        except BaseException:
+            if self._cache is not None:
+                with self._lock:
+                    self._cache.remove((chat_id, user_id))
+            raise
+
+        magazine.commit()
+        if self._cache is not None:
+            with self._lock:
+                self._cache.set((chat_id, user_id), list(magazine))
+
+    def _get_cached_magazine(self, key: Tuple[int, int]) -> Optional[Magazine]:
+        if self._cache is None:
+            return None
+
+        with self._lock:
+            scenes = self._cache.get(key)
+        if scenes is None:
+            return None
+
+        return Magazine(scenes, self._max_depth)
+
+    def _add_cached_magazine(self, key: Tuple[int, int], magazine: Magazine) -> None:
+        # a magazine saved during loading is newer than the loaded one,
+        # and a changed magazine doesn't match the stored scenes
+        if self._cache is not None and not magazine.changed:
+            with self._lock:
+                self._cache.add(key, list(magazine))
+
+    def _make_magazine(self, raw_scenes: List[str], *, chat_id: int, user_id: int) -> Magazine:
+        if raw_scenes:
+            try:
+                scenes = [self._mapping.get_value(i) for i in raw_scenes]
+            except errors.MappingKeyNotFoundError as error:
+                raise errors.UnknownSceneError(
+                    "it is not possible to load the magazine "
+                    "(chat_id={chat_id}, user_id={user_id}) "
+                    "because the storage contains an unknown {scene!r} scene!",
+                    chat_id=chat_id, user_id=user_id, scene=error.key
+                ) from None
+        else:
+            scenes = [self._initial_scene]
+
+        return Magazine(scenes, self._max_depth)
@@ -0,0 +1,10 @@
+from tgbotscenario.common import scene
+
+
+class Scene(scene.BaseScene):
+
+    def process_enter(self, event, data) -> None:
+        pass
+
+    def process_exit(self, event, data) -> None:
+        pass
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import List, Dict, Tuple, Iterable
+
+
+class AbstractSceneStorage(ABC):
+
+    @abstractmethod
+    def load_scenes(self, *, chat_id: int, user_id: int) -> List[str]:
+        pass
+
+    @abstractmethod
+    def save_scenes(self, scenes: List[str], *, chat_id: int, user_id: int) -> None:
+        pass
+
+    def load_many(self, keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], List[str]]:
+        return {
+            (chat_id, user_id): self.load_scenes(chat_id=chat_id, user_id=user_id)
+            for chat_id, user_id in keys
+        }
+
+    def save_many(self, scenes: Dict[Tuple[int, int], List[str]]) -> None:
+        for (chat_id, user_id), user_scenes in scenes.items():
+            self.save_scenes(user_scenes, chat_id=chat_id, user_id=user_id)
+
+    def expire_scenes(self) -> int:
+        return 0
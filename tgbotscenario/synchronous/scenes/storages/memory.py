@@ -0,0 +1,56 @@
+import threading
+from typing import Optional, List, Dict, Tuple, Iterable
+
+from tgbotscenario.synchronous.scenes.storages.base import AbstractSceneStorage
+from tgbotscenario.common.expiration import ExpirationTracker
+
+
+class MemorySceneStorage(AbstractSceneStorage):
+
+    def __init__(self, ttl: Optional[float] = None):
+        self._storage: Dict[Tuple[int, int], List[str]] = {}
+        self._expiration_tracker = None if ttl is None else ExpirationTracker(ttl)
+        self._lock = threading.Lock()
+
+    def load_scenes(self, *, chat_id: int, user_id: int) -> List[str]:
+        with self._lock:
+            return self._load((chat_id, user_id))
+
+    def save_scenes(self, scenes: List[str], *, chat_id: int, user_id: int) -> None:
+        with self._lock:
+            self._save((chat_id, user_id), scenes)
+
+    def load_many(self, keys: Iterable[Tuple[int, int]]) -> Dict[Tuple[int, int], List[str]]:
+        with self._lock:
+            return {key: self._load(key) for key in keys}
+
+    def save_many(self, scenes: Dict[Tuple[int, int], List[str]]) -> None:
+        with self._lock:
+            for key, user_scenes in scenes.items():
+                self._save(key, user_scenes)
+
+    def expire_scenes(self) -> int:
+        if self._expiration_tracker is None:
+            return 0
+
+        with self._lock:
+            expired_keys = self._expiration_tracker.pop_expired()
+            for key in expired_keys:
+                del self._storage[key]
+
+        return len(expired_keys)
+
+    def _load(self, key: Tuple[int, int]) -> List[str]:
+        if self._expiration_tracker is not None and key in self._storage:
+            if self._expiration_tracker.check(key):
+                del self._storage[key]
+                self._expiration_tracker.discard(key)
+                return []
+            self._expiration_tracker.touch(key)
+
+        return self._storage.get(key, [])[:]
+
+    def _save(self, key: Tuple[int, int], scenes: List[str]) -> None:
+        self._storage[key] = scenes[:]
+        if self._expiration_tracker is not None:
+            self._expiration_tracker.touch(key)
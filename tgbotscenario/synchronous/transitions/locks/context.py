@@ -0,0 +1,16 @@
+from tgbotscenario.synchronous.transitions.locks.storages.base import AbstractLockStorage
+
+
+class LockContext:
+    __slots__ = ("_storage", "_chat_id", "_user_id")
+
+    def __init__(self, storage: AbstractLockStorage, *, chat_id: int, user_id: int):
+        self._storage = storage
+        self._chat_id = chat_id
+        self._user_id = user_id
+
+    def __enter__(self):
+        self._storage.acquire_lock(chat_id=self._chat_id, user_id=self._user_id)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._storage.release_lock(chat_id=self._chat_id, user_id=self._user_id)
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+
+
+class AbstractLockStorage(ABC):
+
+    @abstractmethod
+    def acquire_lock(self, *, chat_id: int, user_id: int) -> None:
+        pass
+
+    @abstractmethod
+    def release_lock(self, *, chat_id: int, user_id: int) -> None:
+        pass
+
+    @abstractmethod
+    def check_lock(self, *, chat_id: int, user_id: int) -> bool:
+        pass
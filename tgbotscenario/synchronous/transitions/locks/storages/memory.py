@@ -0,0 +1,22 @@
+from tgbotscenario.synchronous.transitions.locks.storages.base import AbstractLockStorage
+from tgbotscenario.common.transitions.locks.storage import StripedLockStorage
+from tgbotscenario import errors
+
+
+class MemoryLockStorage(AbstractLockStorage):
+
+    def __init__(self, stripes: int = 16):
+        self._storage = StripedLockStorage(stripes)
+
+    def acquire_lock(self, *, chat_id: int, user_id: int) -> None:
+        if not self._storage.acquire_lock(chat_id=chat_id, user_id=user_id):
+            raise errors.LockExistsError(
+                "lock already exists (chat_id={chat_id!r}, user_id={user_id!r})!",
+                chat_id=chat_id, user_id=user_id
+            )
+
+    def release_lock(self, *, chat_id: int, user_id: int) -> None:
+        self._storage.remove_lock(chat_id=chat_id, user_id=user_id)
+
+    def check_lock(self, *, chat_id: int, user_id: int) -> bool:
+        return self._storage.check_lock(chat_id=chat_id, user_id=user_id)